@@ -0,0 +1,45 @@
+"""Lazy loading of subpackage attributes (PEP 562).
+
+Service subpackages re-export their main classes for convenience, but
+importing all of them eagerly pulls in every third-party dependency
+(e.g., Airflow for the hooks and ``synapseclient`` for the Synapse
+ops), even if only one class is needed. Instead, subpackages map each
+attribute to the submodule defining it, and the submodule is only
+imported when the attribute is first accessed.
+"""
+
+from __future__ import annotations
+
+import sys
+from importlib import import_module
+from typing import Any, Callable
+
+
+def lazy_attributes(
+    package: str, attributes: dict[str, str]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Create module-level ``__getattr__`` and ``__dir__`` functions.
+
+    Args:
+        package: Name of the package (i.e., ``__name__``).
+        attributes: Mapping from attribute names to the name of the
+            submodule (relative to the package) defining them.
+
+    Returns:
+        Functions to be assigned to ``__getattr__`` and ``__dir__``.
+    """
+
+    def __getattr__(name: str) -> Any:
+        if name not in attributes:
+            message = f"module {package!r} has no attribute {name!r}"
+            raise AttributeError(message)
+        module = import_module(f"{package}.{attributes[name]}")
+        value = getattr(module, name)
+        # Cache the attribute so that `__getattr__` isn't called again
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(vars(sys.modules[package])) | set(attributes))
+
+    return __getattr__, __dir__
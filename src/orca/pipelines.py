@@ -0,0 +1,213 @@
+"""Pipelines that combine operations from multiple services.
+
+Example:
+    Launch a Nextflow Tower run for each new submission in a Synapse
+    evaluation queue and write their final statuses back to Synapse::
+
+        pipeline = SubmissionPipeline(
+            synapse=SynapseOps(),
+            tower=NextflowTowerOps(),
+            make_launch_info=lambda submission_id: LaunchInfo(
+                pipeline="Sage-Bionetworks-Workflows/nf-synapse-challenge",
+                run_name=f"submission-{submission_id}",
+                params={"submission_id": submission_id},
+            ),
+        )
+        statuses = asyncio.run(pipeline.run("syn123", evaluation_id="9614112"))
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Callable, Optional, Union
+
+from orca.services.nextflowtower import LaunchInfo, NextflowTowerOps
+from orca.services.synapse import SynapseOps
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SubmissionPipeline:
+    """Streaming pipeline for processing Synapse submissions in Tower.
+
+    The RECEIVED submissions are read from a Synapse submission view in
+    snapshots of up to ``batch_size`` IDs and a Tower workflow run is
+    launched for each one. The view is queried again from the start
+    (after writing the buffered status updates) once a snapshot is used
+    up, since paging through the results while statuses change would
+    skip submissions. At most ``max_in_flight`` runs are ongoing at
+    once; new runs are only launched as others finish, which applies
+    backpressure on the submission stream. The statuses of all ongoing runs are checked
+    together (with bounded concurrency) once per poll. Submission
+    status updates are buffered and written to Synapse in batches,
+    either once ``batch_size`` updates are pending or before waiting for
+    the next poll, so statuses are written shortly after runs finish.
+
+    Attributes:
+        synapse: Synapse operations.
+        tower: Nextflow Tower operations.
+        make_launch_info: Function that generates the launch info for
+            the workflow run processing a given submission ID.
+        max_in_flight: Maximum number of ongoing workflow runs.
+        batch_size: Maximum number of pending submission status updates
+            and of submissions read from the view at once.
+        wait_time: Number of seconds to wait between status checks.
+        in_progress_status: Submission status while its run is ongoing.
+        succeeded_status: Submission status after its run succeeds.
+        failed_status: Submission status after its run fails or
+            cannot be launched.
+        updates: Buffered submission status updates.
+    """
+
+    synapse: SynapseOps
+    tower: NextflowTowerOps
+    make_launch_info: Callable[[str], LaunchInfo]
+    max_in_flight: int = 10
+    batch_size: int = 100
+    wait_time: int = 60 * 5
+    in_progress_status: str = "EVALUATION_IN_PROGRESS"
+    succeeded_status: str = "ACCEPTED"
+    failed_status: str = "INVALID"
+    updates: dict[Union[int, str], str] = field(default_factory=dict, init=False)
+
+    async def run(self, submission_view: str, evaluation_id: str) -> dict[str, str]:
+        """Process the RECEIVED submissions in a Synapse submission view.
+
+        Args:
+            submission_view: Synapse ID of the submission view.
+            evaluation_id: Synapse ID of the evaluation queue for all
+                submissions.
+
+        Returns:
+            The final status written for each submission.
+        """
+        # Submissions are read in snapshots since writing their statuses
+        # changes which rows match the query (and thus later pages)
+        pending: deque[str] = deque()
+        seen: set[str] = set()
+        in_flight: dict[str, str] = dict()  # Keyed by workflow run ID
+        final_statuses: dict[str, str] = dict()
+        is_exhausted = False
+
+        try:
+            while True:
+                # Launch new runs until the in-flight limit is reached
+                while not is_exhausted and len(in_flight) < self.max_in_flight:
+                    if not pending:
+                        await self.flush(evaluation_id)
+                        pending.extend(await self.snapshot(submission_view, seen))
+                    if not pending:
+                        is_exhausted = True
+                        break
+                    submission_id = pending.popleft()
+                    seen.add(submission_id)
+                    run_id = await self.launch(submission_id)
+                    if run_id is None:
+                        final_statuses[submission_id] = self.failed_status
+                        new_status = self.failed_status
+                    else:
+                        in_flight[run_id] = submission_id
+                        new_status = self.in_progress_status
+                    await self.update(submission_id, new_status, evaluation_id)
+
+                if not in_flight:
+                    break
+
+                # Check the status of all in-flight runs at once
+                statuses = await asyncio.to_thread(
+                    self.tower.get_workflow_statuses, list(in_flight)
+                )
+                finished_ids = [
+                    run_id for run_id, status in statuses.items() if status.is_done
+                ]
+                for run_id in finished_ids:
+                    submission_id = in_flight.pop(run_id)
+                    status = statuses[run_id]
+                    if status.is_successful:
+                        new_status = self.succeeded_status
+                    else:
+                        new_status = self.failed_status
+                    final_statuses[submission_id] = new_status
+                    logger.info(f"Run {run_id} for submission {submission_id} is done.")
+                    await self.update(submission_id, new_status, evaluation_id)
+
+                # Only wait if no slots were freed for new runs
+                if not finished_ids or is_exhausted:
+                    await self.flush(evaluation_id)
+                    if in_flight:
+                        await asyncio.sleep(self.wait_time)
+        finally:
+            # Buffered updates are written even if processing failed
+            await self.flush(evaluation_id)
+        return final_statuses
+
+    async def snapshot(self, submission_view: str, seen: set[str]) -> list[str]:
+        """Read the next batch of unprocessed submissions.
+
+        The query results are read from the start and no statuses are
+        written until the batch is complete, so no submission is skipped.
+
+        Args:
+            submission_view: Synapse ID of the submission view.
+            seen: IDs of the submissions that were already processed,
+                which can still be listed until the view is indexed.
+
+        Returns:
+            Up to ``batch_size`` submission IDs.
+        """
+
+        def read_batch() -> list[str]:
+            """Read the unseen submissions from the view (blocking)."""
+            submissions = self.synapse.iter_submissions_with_status(submission_view)
+            unseen = (sub_id for sub_id in submissions if sub_id not in seen)
+            return list(islice(unseen, self.batch_size))
+
+        return await asyncio.to_thread(read_batch)
+
+    async def launch(self, submission_id: str) -> Optional[str]:
+        """Launch the workflow run for a submission.
+
+        Args:
+            submission_id: Synapse submission ID.
+
+        Returns:
+            The workflow run ID, or None if the launch failed.
+        """
+        try:
+            launch_info = self.make_launch_info(submission_id)
+            return await asyncio.to_thread(self.tower.launch_workflow, launch_info)
+        except Exception:
+            logger.exception(f"Failed to launch a run for submission {submission_id}.")
+            return None
+
+    async def update(self, submission_id: str, status: str, evaluation_id: str) -> None:
+        """Buffer a submission status update.
+
+        The buffered updates are written once the batch is full.
+
+        Args:
+            submission_id: Synapse submission ID.
+            status: New submission status.
+            evaluation_id: Synapse ID of the evaluation queue.
+        """
+        self.updates[submission_id] = status
+        if len(self.updates) >= self.batch_size:
+            await self.flush(evaluation_id)
+
+    async def flush(self, evaluation_id: str) -> None:
+        """Write all buffered submission status updates to Synapse.
+
+        Args:
+            evaluation_id: Synapse ID of the evaluation queue.
+        """
+        if not self.updates:
+            return
+        updates, self.updates = self.updates, dict()
+        await asyncio.to_thread(
+            self.synapse.update_submission_statuses, updates, evaluation_id
+        )
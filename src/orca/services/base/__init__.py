@@ -1,8 +1,32 @@
 """Submodule for base classes containing shared functionality."""
 
-from orca.services.base.client_factory import BaseClientFactory
-from orca.services.base.config import BaseConfig
-from orca.services.base.hook import BaseOrcaHook
-from orca.services.base.ops import BaseOps
+from typing import TYPE_CHECKING
 
-__all__ = ["BaseConfig", "BaseClientFactory", "BaseOps", "BaseOrcaHook"]
+from orca.lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from orca.services.base.client_factory import BaseClientFactory, ValidationPolicy
+    from orca.services.base.config import BaseConfig
+    from orca.services.base.hook import BaseOrcaHook
+    from orca.services.base.ops import BaseOps
+
+# Attributes are imported from their submodule on first access to
+# avoid loading the dependencies of unused classes (see `orca.lazy`)
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "BaseClientFactory": "client_factory",
+        "ValidationPolicy": "client_factory",
+        "BaseConfig": "config",
+        "BaseOrcaHook": "hook",
+        "BaseOps": "ops",
+    },
+)
+
+__all__ = [
+    "BaseConfig",
+    "BaseClientFactory",
+    "BaseOps",
+    "BaseOrcaHook",
+    "ValidationPolicy",
+]
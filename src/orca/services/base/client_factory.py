@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import time
 from abc import ABC, abstractmethod
+from enum import Enum
 from functools import cached_property
+from threading import Lock
 from typing import Any, ClassVar, Generic, Type, TypeVar
 
 from pydantic.dataclasses import dataclass
 
-from orca.errors import ClientRequestError
+from orca.errors import ClientRequestError, ConfigError
 from orca.services.base.config import BaseConfig
 
 ClientClass = TypeVar("ClientClass", bound=Any)
@@ -14,6 +20,29 @@ ClientClass = TypeVar("ClientClass", bound=Any)
 ConfigClass = TypeVar("ConfigClass", bound=BaseConfig)
 
 
+class ValidationPolicy(str, Enum):
+    """When to test clients with an authenticated request.
+
+    Attributes:
+        ALWAYS: Test every client before returning it.
+        TTL: Test clients at most once per TTL for each auth token,
+            caching successful verdicts for the process.
+        LAZY: Never test clients upfront. Invalid credentials are only
+            reported by the first ops method whose request fails with
+            a 401 error (see ``BaseOps``), which raises the same error
+            as a failed test.
+    """
+
+    ALWAYS = "always"
+    TTL = "ttl"
+    LAZY = "lazy"
+
+
+# Time at which clients were last successfully tested (keyed by token hash)
+VALIDATED_TOKENS: dict[str, float] = dict()
+VALIDATED_TOKENS_LOCK = Lock()
+
+
 @dataclass(kw_only=False)
 class BaseClientFactory(ABC, Generic[ClientClass, ConfigClass]):
     """Base factory for constructing clients.
@@ -30,12 +59,24 @@ class BaseClientFactory(ABC, Generic[ClientClass, ConfigClass]):
 
     Class Variables:
         client_class: The client class for this service.
+        validation_policy_env_var: The name of the environment variable
+            whose value sets the client validation policy (i.e.,
+            ``always``, ``ttl`` or ``lazy``). Defaults to ``always``.
+        validation_ttl_env_var: The name of the environment variable
+            whose value sets the number of seconds for which successful
+            client tests are cached under the ``ttl`` policy.
+        default_validation_ttl: Default number of seconds for which
+            successful client tests are cached.
     """
 
     config: ConfigClass
 
     client_class: ClassVar[Type]
 
+    validation_policy_env_var: ClassVar[str] = "ORCA_CLIENT_VALIDATION_POLICY"
+    validation_ttl_env_var: ClassVar[str] = "ORCA_CLIENT_VALIDATION_TTL"
+    default_validation_ttl: ClassVar[float] = 15 * 60
+
     @abstractmethod
     def create_client(self) -> ClientClass:
         """Create an authenticated client.
@@ -86,9 +127,94 @@ class BaseClientFactory(ABC, Generic[ClientClass, ConfigClass]):
         """An authenticated client."""
         return self.create_client()
 
+    @classmethod
+    def get_validation_policy(cls) -> ValidationPolicy:
+        """Retrieve the client validation policy.
+
+        Raises:
+            ConfigError: If the policy isn't valid.
+
+        Returns:
+            The validation policy set in the environment (if any),
+            otherwise the ``always`` policy.
+        """
+        value = os.environ.get(cls.validation_policy_env_var, "always")
+        try:
+            return ValidationPolicy(value.lower())
+        except ValueError:
+            options = [policy.value for policy in ValidationPolicy]
+            message = f"Validation policy ({value}) is not among {options}."
+            raise ConfigError(message)
+
+    @classmethod
+    def get_validation_ttl(cls) -> float:
+        """Retrieve the TTL for successful client tests.
+
+        Returns:
+            Number of seconds for which successful tests are cached.
+        """
+        value = os.environ.get(cls.validation_ttl_env_var)
+        return cls.default_validation_ttl if value is None else float(value)
+
+    @property
+    def token_hash(self) -> str:
+        """Hash of the endpoint and auth token used as a key for cached tests.
+
+        The endpoint is included because the same token isn't
+        necessarily valid for every platform of a service.
+        """
+        endpoint = getattr(self.config, "api_endpoint", None) or ""
+        token = getattr(self.config, "auth_token", None) or ""
+        values = [type(self).__qualname__, endpoint, token]
+        data = json.dumps(values).encode()
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def is_auth_error(error: Exception) -> bool:
+        """Check whether an error was caused by invalid credentials.
+
+        Errors from the clients of all services are covered, whether
+        they expose the HTTP response (e.g., ``requests`` errors) or
+        only its status code (e.g., SevenBridges errors).
+
+        Args:
+            error: Error raised while using a client.
+
+        Returns:
+            Whether the error corresponds to a 401 response.
+        """
+        response = getattr(error, "response", None)
+        status = getattr(response, "status_code", getattr(error, "status", None))
+        return status == 401
+
+    def invalidate(self) -> None:
+        """Forget any successful test of the client credentials."""
+        with VALIDATED_TOKENS_LOCK:
+            VALIDATED_TOKENS.pop(self.token_hash, None)
+
+    def is_test_needed(self) -> bool:
+        """Check whether the client should be tested given the policy.
+
+        Returns:
+            Whether the client should be tested.
+        """
+        policy = self.get_validation_policy()
+        if policy == ValidationPolicy.ALWAYS:
+            return True
+        if policy == ValidationPolicy.LAZY:
+            return False
+        with VALIDATED_TOKENS_LOCK:
+            validated_at = VALIDATED_TOKENS.get(self.token_hash)
+        if validated_at is None:
+            return True
+        return time.monotonic() - validated_at >= self.get_validation_ttl()
+
     def get_client(self, test=False) -> ClientClass:
         """Retrieve (and optionally, test) an authenticated client.
 
+        Whether the client is actually tested depends on the client
+        validation policy (see ``ValidationPolicy``).
+
         Args:
             test: Whether to test the client before returning it.
 
@@ -96,6 +222,8 @@ class BaseClientFactory(ABC, Generic[ClientClass, ConfigClass]):
             An authenticated client.
         """
         client = self.client
-        if test:
+        if test and self.is_test_needed():
             self.test_client(client)
+            with VALIDATED_TOKENS_LOCK:
+                VALIDATED_TOKENS[self.token_hash] = time.monotonic()
         return client
@@ -1,16 +1,21 @@
 from __future__ import annotations
 
 import os
+import sys
 from abc import ABC, abstractmethod
 from dataclasses import fields
-from typing import TYPE_CHECKING, Any, ClassVar
+from typing import TYPE_CHECKING, Any, ClassVar, Union
 
 from pydantic.dataclasses import dataclass
 from typing_extensions import Self
 
+from orca.services.base.connection import ConnectionInfo
+
 if TYPE_CHECKING:
     from airflow.models.connection import Connection
 
+AnyConnection = Union["Connection", ConnectionInfo]
+
 
 @dataclass(kw_only=False)
 class BaseConfig(ABC):
@@ -38,22 +43,22 @@ class BaseConfig(ABC):
 
     @classmethod
     @abstractmethod
-    def parse_connection(cls, connection: Connection) -> dict[str, Any]:
+    def parse_connection(cls, connection: AnyConnection) -> dict[str, Any]:
         """Parse Airflow connection as arguments for this configuration.
 
         Args:
-            connection: An Airflow connection object.
+            connection: An Airflow (or lightweight) connection object.
 
         Returns:
             Keyword arguments for this configuration.
         """
 
     @classmethod
-    def from_connection(cls, connection: Connection) -> Self:
+    def from_connection(cls, connection: AnyConnection) -> Self:
         """Parse Airflow connection as a service configuration.
 
         Args:
-            connection: An Airflow connection object.
+            connection: An Airflow (or lightweight) connection object.
 
         Returns:
             Configuration relevant to this service.
@@ -92,18 +97,25 @@ class BaseConfig(ABC):
                 setattr(self, name, other_value)
 
     @classmethod
-    def get_connection_from_env(cls) -> Connection:
+    def get_connection_from_env(cls) -> AnyConnection:
         """Generate Airflow connection from environment variable.
 
+        The Airflow connection model is only used if it's already
+        loaded (e.g., in an Airflow worker). Otherwise, the URI is
+        parsed with a dependency-free equivalent to avoid the cost of
+        importing Airflow in other contexts (e.g., Metaflow flows).
+
         Returns:
-            An Airflow connection
+            An Airflow (or lightweight) connection
         """
-        # Following Airflow's lead on this non-standard practice
-        # because this import does introduce a bit of overhead
-        from airflow.models.connection import Connection
-
         env_connection_uri = os.environ.get(cls.connection_env_var)
-        return Connection(uri=env_connection_uri)
+        if "airflow.models.connection" in sys.modules:
+            from airflow.models.connection import Connection
+
+            return Connection(uri=env_connection_uri)
+        if env_connection_uri is None:
+            return ConnectionInfo()
+        return ConnectionInfo.from_uri(env_connection_uri)
 
     @classmethod
     def is_env_available(cls) -> bool:
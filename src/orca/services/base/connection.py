@@ -0,0 +1,141 @@
+"""Lightweight parsing of Airflow-style connection URIs."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from json import JSONDecodeError
+from typing import Any, Optional
+from urllib.parse import SplitResult, parse_qsl, unquote, urlsplit
+
+from orca.errors import ConfigError
+
+EXTRA_KEY = "__extra__"
+
+
+def normalize_conn_type(conn_type: str) -> str:
+    """Normalize a connection type the same way as Airflow.
+
+    Args:
+        conn_type: Connection type (i.e., the URI scheme).
+
+    Returns:
+        Normalized connection type.
+    """
+    if conn_type == "postgresql":
+        conn_type = "postgres"
+    elif "-" in conn_type:
+        conn_type = conn_type.replace("-", "_")
+    return conn_type
+
+
+def parse_netloc_to_hostname(uri_parts: SplitResult) -> str:
+    """Extract the hostname from a split URI the same way as Airflow.
+
+    Unlike ``SplitResult.hostname``, this function preserves paths
+    that are encoded in the hostname (e.g., for local sockets).
+
+    Args:
+        uri_parts: Split URI.
+
+    Returns:
+        Unquoted hostname.
+    """
+    hostname = unquote(uri_parts.hostname or "")
+    if "/" in hostname:
+        hostname = uri_parts.netloc
+        if "@" in hostname:
+            hostname = hostname.rsplit("@", 1)[1]
+        if ":" in hostname:
+            hostname = hostname.split(":", 1)[0]
+        hostname = unquote(hostname)
+    return hostname
+
+
+@dataclass
+class ConnectionInfo:
+    """Dependency-free stand-in for Airflow connections.
+
+    Importing ``airflow.models.connection`` is slow and memory-hungry,
+    which is wasteful outside of Airflow (e.g., in Metaflow flows) when
+    all that is needed is parsing a connection URI from the environment.
+    This class implements the same URI parsing logic as Airflow and
+    exposes the subset of attributes used by service configurations.
+
+    Attributes:
+        conn_type: Connection type (i.e., the URI scheme).
+        host: Connection host (with protocol if one was given).
+        schema: Connection schema (i.e., the URI path).
+        login: Connection login (i.e., the URI username).
+        password: Connection password.
+        port: Connection port.
+        extra: JSON-serialized extra parameters.
+    """
+
+    conn_type: Optional[str] = None
+    host: Optional[str] = None
+    schema: Optional[str] = None
+    login: Optional[str] = None
+    password: Optional[str] = field(default=None, repr=False)
+    port: Optional[int] = None
+    extra: Optional[str] = field(default=None, repr=False)
+
+    @classmethod
+    def from_uri(cls, uri: str) -> ConnectionInfo:
+        """Parse a connection URI like ``Connection(uri=...)`` would.
+
+        Args:
+            uri: Airflow connection URI.
+
+        Raises:
+            ConfigError: If the connection URI is invalid.
+
+        Returns:
+            Parsed connection.
+        """
+        schemes_count_in_uri = uri.count("://")
+        if schemes_count_in_uri > 2:
+            raise ConfigError(f"Invalid connection string: {uri}.")
+        host_with_protocol = schemes_count_in_uri == 2
+        uri_parts = urlsplit(uri)
+        conn_type = uri_parts.scheme
+        prefix = "" if host_with_protocol else "//"
+        rest_of_the_url = uri.replace(f"{conn_type}://", prefix)
+        if host_with_protocol:
+            uri_splits = rest_of_the_url.split("://", 1)
+            if "@" in uri_splits[0] or ":" in uri_splits[0]:
+                raise ConfigError(f"Invalid connection string: {uri}.")
+        uri_parts = urlsplit(rest_of_the_url)
+
+        host: Optional[str] = parse_netloc_to_hostname(uri_parts)
+        if host and host_with_protocol:
+            host = f"{uri_parts.scheme}://{host}"
+
+        quoted_schema = uri_parts.path[1:]
+        username = uri_parts.username
+        password = uri_parts.password
+
+        extra = None
+        if uri_parts.query:
+            query = dict(parse_qsl(uri_parts.query, keep_blank_values=True))
+            extra = query[EXTRA_KEY] if EXTRA_KEY in query else json.dumps(query)
+
+        return cls(
+            conn_type=normalize_conn_type(conn_type),
+            host=host,
+            schema=unquote(quoted_schema) if quoted_schema else quoted_schema,
+            login=unquote(username) if username else username,
+            password=unquote(password) if password else password,
+            port=uri_parts.port,
+            extra=extra,
+        )
+
+    @property
+    def extra_dejson(self) -> dict[str, Any]:
+        """Deserialized extra parameters (empty if invalid JSON)."""
+        if not self.extra:
+            return {}
+        try:
+            return json.loads(self.extra)
+        except JSONDecodeError:
+            return {}
@@ -7,6 +7,7 @@ from airflow.exceptions import AirflowNotFoundException
 from airflow.hooks.base import BaseHook
 
 from orca.services.base.ops import BaseOps
+from orca.services.base.registry import OPS_REGISTRY, OpsRegistry
 
 if TYPE_CHECKING:
     from airflow.models.connection import Connection
@@ -36,6 +37,8 @@ class BaseOrcaHook(BaseHook, Generic[OpsClass, ClientClass]):
         hook_name: Inherited Airflow attribute (e.g., "SevenBridges").
         ops_class: The Ops class for this service.
         config_class: The configuration class for this service.
+        ops_registry: Process-wide registry for reusing ops objects
+            (and their authenticated clients) across hooks.
     """
 
     conn_name_attr: ClassVar[str]
@@ -46,6 +49,8 @@ class BaseOrcaHook(BaseHook, Generic[OpsClass, ClientClass]):
     ops_class: ClassVar[Type]
     config_class: ClassVar[Type]
 
+    ops_registry: ClassVar[OpsRegistry] = OPS_REGISTRY
+
     def __init__(self, conn_id: Optional[str] = None, *args, **kwargs):
         """Construct hook using an Airflow connection.
 
@@ -54,8 +59,8 @@ class BaseOrcaHook(BaseHook, Generic[OpsClass, ClientClass]):
                 Defaults to ``default_conn_name``.
         """
         super().__init__(*args, **kwargs)
-        conn_id = conn_id or self.default_conn_name
-        self.connection = self.get_connection(conn_id)
+        self.conn_id = conn_id or self.default_conn_name
+        self.connection = self.get_connection(self.conn_id)
 
     @classmethod
     def get_connection(cls, conn_id: str) -> Connection:
@@ -91,6 +96,10 @@ class BaseOrcaHook(BaseHook, Generic[OpsClass, ClientClass]):
 
     @cached_property
     def ops(self) -> OpsClass:
-        """An authenticated Ops object."""
+        """An authenticated Ops object.
+
+        Ops objects are shared by all hooks in the same process that
+        use the same connection ID and configuration values.
+        """
         config = self.config_class.from_connection(self.connection)
-        return self.ops_class(config)
+        return self.ops_registry.get_ops(self.ops_class, config, self.conn_id)
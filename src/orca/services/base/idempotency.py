@@ -0,0 +1,446 @@
+"""Idempotency keys for ops methods with pluggable result stores.
+
+Ops methods strive to be idempotent, which normally involves listing
+remote resources (e.g., all workflow runs in a workspace) to check for
+a previous call with the same inputs. With an idempotency store, the
+result of the first call is stored under a canonical hash of the inputs
+and repeat calls (e.g., Airflow task retries) return the stored result
+without any remote listing. Stored results can optionally be verified
+with a cheaper remote request (e.g., retrieving a single workflow run).
+
+Example:
+    Enable a persistent store for all ops using an environment variable::
+
+        export ORCA_IDEMPOTENCY_STORE="sqlite:///path/to/orca.db"
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+from abc import ABC, abstractmethod
+from contextlib import closing
+from dataclasses import asdict, is_dataclass
+from datetime import date, datetime
+from enum import Enum
+from functools import lru_cache, wraps
+from inspect import signature
+from threading import Lock
+from typing import Any, Callable, Optional, TypeVar
+from urllib.parse import urlsplit
+
+from orca.errors import ConfigError
+
+logger = logging.getLogger(__name__)
+
+Function = TypeVar("Function", bound=Callable[..., Any])
+
+# Configuration fields that don't affect where operations take place
+# (i.e., credentials and client settings, which can include callables)
+UNSCOPED_CONFIG_FIELDS = {"auth_token", "client_kwargs"}
+
+STORE_SCHEMES = ["memory://", "sqlite://", "file://"]
+
+
+def encode_value(value: Any) -> Any:
+    """Convert a value into a JSON-serializable equivalent.
+
+    Args:
+        value: Value that isn't natively JSON-serializable.
+
+    Raises:
+        TypeError: If the value cannot be encoded.
+
+    Returns:
+        JSON-serializable value.
+    """
+    # Prefer content hashes when available (e.g., `LaunchInfo`)
+    fingerprint = getattr(value, "fingerprint", None)
+    if isinstance(fingerprint, str):
+        return fingerprint
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=canonical_json)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    message = f"Cannot compute an idempotency key for {type(value)} ({value!r})."
+    raise TypeError(message)
+
+
+def canonical_json(value: Any) -> str:
+    """Serialize a value into JSON with a stable key order.
+
+    Args:
+        value: Value to serialize.
+
+    Returns:
+        Canonical JSON string.
+    """
+    return json.dumps(
+        value, sort_keys=True, separators=(",", ":"), default=encode_value
+    )
+
+
+def get_idempotency_key(ops: Any, func: Callable, *args: Any, **kwargs: Any) -> str:
+    """Compute the idempotency key for an ops method call.
+
+    The key depends on the method, the configuration of the ops object
+    (except for credentials and client settings) and the bound arguments
+    (including default values), so equivalent calls share the same key.
+
+    Args:
+        ops: Ops object.
+        func: Ops method (unbound).
+        *args: Positional arguments for the method.
+        **kwargs: Keyword arguments for the method.
+
+    Returns:
+        Hexadecimal digest of the method call.
+    """
+    bound = signature(func).bind(ops, *args, **kwargs)
+    bound.apply_defaults()
+    # Skip the first argument (i.e., the ops object)
+    arguments = dict(list(bound.arguments.items())[1:])
+    config = {
+        name: value
+        for name, value in asdict(ops.config).items()
+        if name not in UNSCOPED_CONFIG_FIELDS
+    }
+    payload = [func.__qualname__, config, arguments]
+    return hashlib.sha256(canonical_json(payload).encode()).hexdigest()
+
+
+class IdempotencyStore(ABC):
+    """Store for the results of idempotent operations.
+
+    Results must be JSON-serializable (e.g., resource IDs).
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Retrieve the result stored for a key.
+
+        Args:
+            key: Idempotency key.
+
+        Returns:
+            Stored result or None if the key is unknown.
+        """
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        """Store the result for a key.
+
+        Args:
+            key: Idempotency key.
+            value: JSON-serializable result.
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove the result stored for a key (if any).
+
+        Args:
+            key: Idempotency key.
+        """
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all stored results."""
+
+
+class MemoryStore(IdempotencyStore):
+    """Store results in memory (i.e., for the process lifetime)."""
+
+    def __init__(self) -> None:
+        """Construct an empty store."""
+        self._values: dict[str, str] = dict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        """Number of stored results."""
+        return len(self._values)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Retrieve the result stored for a key.
+
+        Args:
+            key: Idempotency key.
+
+        Returns:
+            Stored result or None if the key is unknown.
+        """
+        with self._lock:
+            value = self._values.get(key)
+        return None if value is None else json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        """Store the result for a key.
+
+        Args:
+            key: Idempotency key.
+            value: JSON-serializable result.
+        """
+        with self._lock:
+            self._values[key] = json.dumps(value)
+
+    def delete(self, key: str) -> None:
+        """Remove the result stored for a key (if any).
+
+        Args:
+            key: Idempotency key.
+        """
+        with self._lock:
+            self._values.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all stored results."""
+        with self._lock:
+            self._values.clear()
+
+
+class SqliteStore(IdempotencyStore):
+    """Store results in an SQLite database shared across processes.
+
+    Attributes:
+        path: Path to the SQLite database file.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Construct a store (creating the database if needed).
+
+        Args:
+            path: Path to the SQLite database file.
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+
+    def _connect(self) -> closing[sqlite3.Connection]:
+        """Open a connection to the database in autocommit mode.
+
+        Returns:
+            Connection that is closed when exiting its context.
+        """
+        return closing(sqlite3.connect(self.path, timeout=30, isolation_level=None))
+
+    def get(self, key: str) -> Optional[Any]:
+        """Retrieve the result stored for a key.
+
+        Args:
+            key: Idempotency key.
+
+        Returns:
+            Stored result or None if the key is unknown.
+        """
+        query = "SELECT value FROM results WHERE key = ?"
+        with self._connect() as connection:
+            row = connection.execute(query, (key,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        """Store the result for a key.
+
+        Args:
+            key: Idempotency key.
+            value: JSON-serializable result.
+        """
+        query = "INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)"
+        with self._connect() as connection:
+            connection.execute(query, (key, json.dumps(value)))
+
+    def delete(self, key: str) -> None:
+        """Remove the result stored for a key (if any).
+
+        Args:
+            key: Idempotency key.
+        """
+        with self._connect() as connection:
+            connection.execute("DELETE FROM results WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """Remove all stored results."""
+        with self._connect() as connection:
+            connection.execute("DELETE FROM results")
+
+
+class FileStore(IdempotencyStore):
+    """Store results as JSON files in a (possibly shared) directory.
+
+    Attributes:
+        directory: Directory containing one JSON file per key.
+    """
+
+    def __init__(self, directory: str) -> None:
+        """Construct a store (creating the directory if needed).
+
+        Args:
+            directory: Directory containing one JSON file per key.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def get_path(self, key: str) -> str:
+        """Get the path of the JSON file for a key.
+
+        Args:
+            key: Idempotency key.
+
+        Returns:
+            Path to the JSON file for the key.
+        """
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Retrieve the result stored for a key.
+
+        Args:
+            key: Idempotency key.
+
+        Returns:
+            Stored result or None if the key is unknown.
+        """
+        try:
+            with open(self.get_path(key)) as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            logger.warning(f"Ignoring corrupted idempotency record ({key}).")
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store the result for a key.
+
+        The file is written atomically to avoid partial reads from
+        concurrent processes.
+
+        Args:
+            key: Idempotency key.
+            value: JSON-serializable result.
+        """
+        descriptor, temp_path = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(descriptor, "w") as file:
+                json.dump(value, file)
+            os.replace(temp_path, self.get_path(key))
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def delete(self, key: str) -> None:
+        """Remove the result stored for a key (if any).
+
+        Args:
+            key: Idempotency key.
+        """
+        try:
+            os.remove(self.get_path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        """Remove all stored results."""
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                self.delete(name.removesuffix(".json"))
+
+
+@lru_cache
+def open_store(uri: str) -> IdempotencyStore:
+    """Open an idempotency store from a URI.
+
+    Stores are reused for the same URI within a process.
+
+    Args:
+        uri: Store URI, such as ``memory://``, ``sqlite:///path/to.db``
+            or ``file:///path/to/directory``.
+
+    Raises:
+        ConfigError: If the URI scheme isn't supported.
+
+    Returns:
+        Idempotency store.
+    """
+    parts = urlsplit(uri)
+    if parts.scheme == "memory":
+        return MemoryStore()
+    elif parts.scheme == "sqlite":
+        return SqliteStore(parts.path)
+    elif parts.scheme == "file":
+        return FileStore(parts.path)
+    message = f"Idempotency store URI ({uri}) should start with {STORE_SCHEMES}."
+    raise ConfigError(message)
+
+
+def idempotent(
+    verify: Optional[str] = None, skip_lookup: Optional[str] = None
+) -> Callable[[Function], Function]:
+    """Store the results of an ops method under idempotency keys.
+
+    The decorated method is called normally if the ops object doesn't
+    have an idempotency store (see ``BaseOps.idempotency_store``).
+    Otherwise, the result of a previous call with the same idempotency
+    key is returned without calling the method.
+
+    Args:
+        verify: Name of an ops method that checks whether a stored
+            result is still valid (e.g., that a workflow run still
+            exists). It receives the stored result and returns a
+            boolean. Invalid results are discarded and the decorated
+            method is called again. Verification can be disabled
+            with ``BaseOps.verify_idempotency``. Defaults to None.
+        skip_lookup: Name of a boolean argument of the decorated method
+            that forces it to be called (e.g., to create a new resource
+            on purpose) when true. The new result is still stored.
+            Defaults to None.
+
+    Returns:
+        Decorator for ops methods.
+    """
+
+    def decorator(func: Function) -> Function:
+        def get_argument(name: str, args: tuple, kwargs: dict) -> Any:
+            bound = signature(func).bind(None, *args, **kwargs)
+            bound.apply_defaults()
+            return bound.arguments[name]
+
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            store = self.idempotency_store
+            if store is None:
+                return func(self, *args, **kwargs)
+
+            key = get_idempotency_key(self, func, *args, **kwargs)
+            result = None
+            if skip_lookup is None or not get_argument(skip_lookup, args, kwargs):
+                result = store.get(key)
+            if result is not None:
+                if verify is None or not self.verify_idempotency:
+                    return result
+                if getattr(self, verify)(result):
+                    return result
+                logger.info(f"Discarding invalid stored result ({result}).")
+                store.delete(key)
+
+            result = func(self, *args, **kwargs)
+            if result is not None:
+                store.set(key, result)
+            return result
+
+        return wrapper  # type: ignore
+
+    return decorator
@@ -1,14 +1,96 @@
-from functools import cached_property
-from typing import Any, ClassVar, Generic, Type, TypeVar
+import os
+from contextlib import contextmanager
+from functools import cached_property, wraps
+from inspect import iscoroutinefunction, isfunction, isgeneratorfunction
+from typing import Any, Callable, ClassVar, Generic, Iterator, Optional, Type, TypeVar
 
 from pydantic.dataclasses import dataclass
 
+from orca.errors import ClientRequestError
+from orca.services.base.client_factory import ValidationPolicy
 from orca.services.base.config import BaseConfig
+from orca.services.base.idempotency import IdempotencyStore, open_store
+from orca.tracing import traced
 
 ClientClass = TypeVar("ClientClass", bound=Any)
 
 ConfigClass = TypeVar("ConfigClass", bound=BaseConfig)
 
+Function = TypeVar("Function", bound=Callable[..., Any])
+
+
+@contextmanager
+def reporting_auth_errors(ops: Any) -> Iterator[None]:
+    """Report errors caused by invalid credentials in an ops method.
+
+    Clients aren't tested upfront with the ``lazy`` validation policy,
+    so the first request that fails with a 401 error serves as the
+    client test. The client is then discarded (so it's created again
+    on next use) along with any cached test result. Errors are left
+    untouched with the other policies.
+
+    Args:
+        ops: Ops object.
+
+    Raises:
+        ClientRequestError: If a request failed with a 401 error
+            while using the ``lazy`` validation policy.
+
+    Yields:
+        Nothing.
+    """
+    try:
+        yield
+    except Exception as error:
+        factory_class = ops.client_factory_class
+        if not factory_class.is_auth_error(error):
+            raise
+        if factory_class.get_validation_policy() != ValidationPolicy.LAZY:
+            raise
+        factory_class(ops.config).invalidate()
+        vars(ops).pop("client", None)
+        message = "Authenticated request failed using the client."
+        raise ClientRequestError(message) from error
+
+
+def report_auth_errors(func: Function) -> Function:
+    """Report errors caused by invalid credentials in an ops method.
+
+    Args:
+        func: Ops method (i.e., function, coroutine function or
+            generator function).
+
+    Returns:
+        Wrapped ops method.
+    """
+    if iscoroutinefunction(func):
+
+        @wraps(func)
+        async def async_wrapper(self, *args, **kwargs):
+            """Await the ops method while reporting auth errors."""
+            with reporting_auth_errors(self):
+                return await func(self, *args, **kwargs)
+
+        return async_wrapper  # type: ignore
+
+    if isgeneratorfunction(func):
+
+        @wraps(func)
+        def generator_wrapper(self, *args, **kwargs):
+            """Iterate over the ops method while reporting auth errors."""
+            with reporting_auth_errors(self):
+                return (yield from func(self, *args, **kwargs))
+
+        return generator_wrapper  # type: ignore
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        """Call the ops method while reporting auth errors."""
+        with reporting_auth_errors(self):
+            return func(self, *args, **kwargs)
+
+    return wrapper  # type: ignore
+
 
 @dataclass(kw_only=False)
 class BaseOps(Generic[ConfigClass, ClientClass]):
@@ -23,19 +105,50 @@ class BaseOps(Generic[ConfigClass, ClientClass]):
         6) Update the config attribute to have a default factory set to
            the config class using the `dataclasses.field()` function.
 
+    Public methods defined in subclasses are automatically traced
+    (see ``orca.tracing``), which has negligible overhead unless a
+    tracer is activated. With the ``lazy`` client validation policy,
+    they also report requests that fail because of invalid credentials
+    with a ``ClientRequestError`` (see ``ValidationPolicy``).
+
     Attributes:
         config: A configuration object for this service.
 
     Class Variables:
         client_factory_class: The class for constructing clients.
+        idempotency_store_env_var: The name of the environment variable
+            whose value is the URI for the idempotency store (if any).
+        verify_idempotency: Whether to verify stored results of
+            idempotent methods (see ``orca.services.base.idempotency``).
     """
 
     config: ConfigClass
 
     client_factory_class: ClassVar[Type]
 
+    idempotency_store_env_var: ClassVar[str] = "ORCA_IDEMPOTENCY_STORE"
+
+    verify_idempotency: ClassVar[bool] = True
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Wrap the public methods defined in subclasses.
+
+        Args:
+            **kwargs: Keyword arguments passed to parent classes.
+        """
+        super().__init_subclass__(**kwargs)
+        for name, value in list(vars(cls).items()):
+            if not name.startswith("_") and isfunction(value):
+                setattr(cls, name, traced(report_auth_errors(value)))
+
     @cached_property
     def client(self) -> ClientClass:
         """An authenticated client for this service"""
         factory = self.client_factory_class(self.config)
         return factory.get_client(test=True)
+
+    @cached_property
+    def idempotency_store(self) -> Optional[IdempotencyStore]:
+        """The store for the results of idempotent methods (if any)."""
+        uri = os.environ.get(self.idempotency_store_env_var)
+        return open_store(uri) if uri else None
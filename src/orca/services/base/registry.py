@@ -0,0 +1,182 @@
+"""Process-wide registry of ops objects and their authenticated clients."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from threading import Lock
+from typing import Any, Hashable, Optional, Type
+
+from orca.errors import ClientRequestError
+from orca.services.base.config import BaseConfig
+from orca.services.base.ops import BaseOps
+
+logger = logging.getLogger(__name__)
+
+
+def get_config_fingerprint(config: BaseConfig) -> str:
+    """Compute a fingerprint for a configuration.
+
+    The fingerprint changes whenever any configuration value changes
+    (e.g., after rotating credentials) without exposing these values.
+
+    Args:
+        config: Configuration object.
+
+    Returns:
+        Hexadecimal digest of the configuration values.
+    """
+    values = {"class": type(config).__qualname__, **asdict(config)}
+    data = json.dumps(values, sort_keys=True, default=str).encode()
+    return hashlib.sha256(data).hexdigest()
+
+
+class OpsRegistry:
+    """Registry of ops objects that are reused within a process.
+
+    Reusing ops objects also reuses their authenticated clients, which
+    are only tested again (with an authenticated request) once the
+    TTL has elapsed since they were last tested. If the test fails,
+    a new ops object is created instead. Tests happen outside of the
+    registry lock, so a slow test doesn't block other connections, and
+    the least recently used ops objects are evicted once the registry
+    is full.
+
+    Attributes:
+        ttl: Number of seconds before clients are tested again (if set).
+        max_size: Maximum number of registered ops objects.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_size: int = 128) -> None:
+        """Construct an empty registry.
+
+        Args:
+            ttl: Number of seconds before clients are tested again.
+                Defaults to None, in which case the TTL for client
+                validation is used (see ``BaseClientFactory``), which
+                can be set with ``ORCA_CLIENT_VALIDATION_TTL``.
+            max_size: Maximum number of registered ops objects.
+                Defaults to 128.
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[Hashable, tuple[BaseOps, float]] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        """Number of registered ops objects."""
+        return len(self._entries)
+
+    def get_ttl(self, ops_class: Type[BaseOps]) -> float:
+        """Determine the TTL for the clients of an ops class.
+
+        Args:
+            ops_class: Ops class for the service.
+
+        Returns:
+            Number of seconds before clients are tested again.
+        """
+        if self.ttl is not None:
+            return self.ttl
+        return ops_class.client_factory_class.get_validation_ttl()
+
+    def get_ops(
+        self, ops_class: Type[BaseOps], config: BaseConfig, conn_id: Optional[str]
+    ) -> Any:
+        """Retrieve (or create) the ops object for a connection.
+
+        Args:
+            ops_class: Ops class for the service.
+            config: Configuration parsed from the connection.
+            conn_id: Connection ID.
+
+        Returns:
+            An ops object whose client is created lazily on first use.
+        """
+        key = (ops_class, conn_id, get_config_fingerprint(config))
+        ttl = self.get_ttl(ops_class)
+        with self._lock:
+            entry = self._entries.get(key)
+            now = time.monotonic()
+            if entry is None:
+                return self._register(key, ops_class(config), now)
+            ops, tested_at = entry
+            self._entries.move_to_end(key)
+            if now - tested_at < ttl or not self.is_tested(ops):
+                return ops
+            # Claim the test so that concurrent callers keep using the
+            # ops object in the meantime instead of testing it as well
+            self._entries[key] = (ops, now)
+
+        if self.retest(ops):
+            return ops
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not ops:
+                return entry[0]
+            return self._register(key, ops_class(config), time.monotonic())
+
+    def _register(self, key: Hashable, ops: BaseOps, now: float) -> BaseOps:
+        """Register an ops object (while holding the lock).
+
+        The least recently used ops objects are evicted if needed.
+
+        Args:
+            key: Registry key.
+            ops: Ops object.
+            now: Time at which the ops object was registered.
+
+        Returns:
+            The registered ops object.
+        """
+        self._entries[key] = (ops, now)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return ops
+
+    @staticmethod
+    def is_tested(ops: BaseOps) -> bool:
+        """Check whether the client of an ops object has been created.
+
+        Clients are tested when they are created, so the TTL only
+        applies to clients that exist.
+
+        Args:
+            ops: Ops object.
+
+        Returns:
+            Whether the client exists.
+        """
+        return "client" in vars(ops)
+
+    @staticmethod
+    def retest(ops: BaseOps) -> bool:
+        """Test the client of an ops object again.
+
+        Args:
+            ops: Ops object.
+
+        Returns:
+            Whether the client is still valid.
+        """
+        try:
+            ops.client_factory_class.test_client(ops.client)
+        except ClientRequestError:
+            logger.info(f"Discarding invalid client for {type(ops).__name__}.")
+            return False
+        return True
+
+    def clear(self) -> None:
+        """Remove all registered ops objects."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Registry shared by all hooks (and operators) in the current process
+OPS_REGISTRY = OpsRegistry()
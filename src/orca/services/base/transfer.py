@@ -0,0 +1,88 @@
+"""Helpers shared by the file transfers of different services.
+
+Files are compared by size first and by MD5 checksum only if the sizes
+match. A remote file without a known checksum is never considered the
+same as a local file, since identical sizes alone don't guarantee
+identical contents, so it's transferred again rather than skipped.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from enum import Enum
+from typing import Optional
+
+from pydantic.dataclasses import dataclass
+
+# Number of bytes held in memory at once while streaming file contents
+CHUNK_SIZE = 1024**2
+
+
+class TransferOutcome(str, Enum):
+    """Outcome of transferring a file as part of a batch."""
+
+    TRANSFERRED = "TRANSFERRED"
+    CACHED = "CACHED"
+    SKIPPED = "SKIPPED"
+    FAILED = "FAILED"
+
+
+@dataclass(kw_only=False)
+class TransferResult:
+    """Result of transferring a file as part of a batch.
+
+    Attributes:
+        name: File name (or relative path).
+        outcome: Whether the file was transferred, copied from a local
+            cache, skipped because an identical copy already exists, or
+            failed to be transferred.
+        error: Error message (if the outcome is a failure).
+    """
+
+    name: str
+    outcome: TransferOutcome
+    error: Optional[str] = None
+
+
+def compute_md5(path: str, chunk_size: int = CHUNK_SIZE) -> str:
+    """Compute the MD5 checksum of a local file.
+
+    Args:
+        path: Local file path.
+        chunk_size: Number of bytes read at once.
+
+    Returns:
+        Hexadecimal MD5 checksum.
+    """
+    md5 = hashlib.md5()
+    with open(path, "rb") as file:
+        while chunk := file.read(chunk_size):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def is_same_file(
+    path: str, size: int, md5: Optional[str], require_md5: bool = True
+) -> bool:
+    """Check whether a local file matches a remote file.
+
+    The sizes are compared first and the checksums are only compared
+    if the sizes match.
+
+    Args:
+        path: Local file path.
+        size: Size of the remote file in bytes.
+        md5: Hexadecimal MD5 checksum of the remote file (if known).
+        require_md5: Whether files without a known remote checksum are
+            considered different. Defaults to True, since identical
+            sizes alone don't guarantee identical contents.
+
+    Returns:
+        Whether the local file exists and matches the remote file.
+    """
+    if not os.path.isfile(path) or os.path.getsize(path) != size:
+        return False
+    if md5 is None:
+        return not require_md5
+    return compute_md5(path) == md5
@@ -1,11 +1,30 @@
 """Submodule for NextflowTower platforms (like Tower.nf)."""
 
-from orca.services.nextflowtower.client import NextflowTowerClient
-from orca.services.nextflowtower.client_factory import NextflowTowerClientFactory
-from orca.services.nextflowtower.config import NextflowTowerConfig
-from orca.services.nextflowtower.hook import NextflowTowerHook
-from orca.services.nextflowtower.models import LaunchInfo
-from orca.services.nextflowtower.ops import NextflowTowerOps
+from typing import TYPE_CHECKING
+
+from orca.lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from orca.services.nextflowtower.client import NextflowTowerClient
+    from orca.services.nextflowtower.client_factory import NextflowTowerClientFactory
+    from orca.services.nextflowtower.config import NextflowTowerConfig
+    from orca.services.nextflowtower.hook import NextflowTowerHook
+    from orca.services.nextflowtower.models import LaunchInfo
+    from orca.services.nextflowtower.ops import NextflowTowerOps
+
+# Attributes are imported from their submodule on first access to
+# avoid loading the dependencies of unused classes (see `orca.lazy`)
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "NextflowTowerClient": "client",
+        "NextflowTowerClientFactory": "client_factory",
+        "NextflowTowerConfig": "config",
+        "NextflowTowerHook": "hook",
+        "LaunchInfo": "models",
+        "NextflowTowerOps": "ops",
+    },
+)
 
 __all__ = [
     "LaunchInfo",
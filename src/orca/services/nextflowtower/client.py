@@ -1,10 +1,20 @@
-from typing import Any, Optional
+import time
+from dataclasses import field
+from threading import local
+from typing import Any, ClassVar, Optional
 
 import requests
 from pydantic.dataclasses import dataclass
 from requests.exceptions import HTTPError
 
 from orca.services.nextflowtower import models
+from orca.services.nextflowtower.instrumentation import RequestEvent, RequestListener
+from orca.services.nextflowtower.transport import RequestsTransport
+from orca.services.nextflowtower.utils import template_path
+from orca.tracing import get_tracer, traced
+
+# Per-thread collection of request events for the ongoing paged request
+_paging = local()
 
 
 @dataclass(kw_only=False)
@@ -15,10 +25,32 @@ class NextflowTowerClient:
         api_endpoint: API endpoint for a Nextflow Tower platform.
         auth_token: An authentication token for the platform specified
             by the ``api_endpoints`` value.
+        listeners: Callables that are notified with a ``RequestEvent``
+            after each request (see the ``instrumentation`` submodule).
+        max_attempts: Maximum number of attempts for each request.
+            Only responses with a status listed in ``retry_statuses``
+            are retried. Defaults to one (i.e., no retries).
+        backoff_factor: Base number of seconds to wait between attempts,
+            which is doubled after each attempt. This is ignored if the
+            response includes a ``Retry-After`` header.
+        transport: Transport for sending HTTP requests. Defaults to
+            sending live requests (see the ``transport`` submodule
+            for recording and replaying requests).
+
+    Class Variables:
+        retry_statuses: HTTP status codes that warrant another attempt.
     """
 
     auth_token: str
     api_endpoint: str
+    listeners: list[RequestListener] = field(
+        default_factory=list, repr=False, compare=False
+    )
+    max_attempts: int = 1
+    backoff_factor: float = 0.5
+    transport: Any = field(default_factory=RequestsTransport, repr=False, compare=False)
+
+    retry_statuses: ClassVar[set[int]] = {429, 502, 503, 504}
 
     @staticmethod
     def update_kwarg(
@@ -49,6 +81,30 @@ class NextflowTowerClient:
             )
             raise ValueError(message)
 
+    def get_retry_delay(self, response: requests.Response, attempt: int) -> float:
+        """Determine how long to wait before the next attempt.
+
+        Args:
+            response: Response from the previous attempt.
+            attempt: Number of attempts made so far.
+
+        Returns:
+            Number of seconds to wait.
+        """
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff_factor * 2 ** (attempt - 1)
+
+    def notify(self, event: RequestEvent) -> None:
+        """Send a request event to all listeners.
+
+        Args:
+            event: Request event.
+        """
+        for listener in self.listeners:
+            listener(event)
+
     def request(self, method: str, path: str, **kwargs) -> requests.Response:
         """Make an authenticated HTTP request.
 
@@ -69,7 +125,103 @@ class NextflowTowerClient:
         auth_header = f"Bearer {self.auth_token}"
         self.update_kwarg(kwargs, "headers", "Authorization", auth_header)
 
-        return requests.request(method, url, **kwargs)
+        attempts = 0
+        response: Optional[requests.Response] = None
+        start_time = time.perf_counter()
+        try:
+            while True:
+                attempts += 1
+                response = self.send_attempt(method, path, url, **kwargs)
+                is_retryable = response.status_code in self.retry_statuses
+                if not is_retryable or attempts >= self.max_attempts:
+                    break
+                time.sleep(self.get_retry_delay(response, attempts))
+        finally:
+            if self.listeners:
+                latency = time.perf_counter() - start_time
+                self.record_request(method, path, response, attempts, latency)
+
+        return response
+
+    def send_attempt(
+        self, method: str, path: str, url: str, **kwargs
+    ) -> requests.Response:
+        """Make a single HTTP request (in a tracing span if enabled).
+
+        Args:
+            method: An HTTP method (GET, PUT, POST, or DELETE).
+            path: The API path with the parameters filled in.
+            url: The full URL for the request.
+            **kwargs: Additional named arguments passed through to
+                the transport.
+
+        Returns:
+            The raw Response object.
+        """
+        if get_tracer().enabled:
+            return self.traced_request(method, path, url, **kwargs)
+        return self.transport.send(method, url, **kwargs)
+
+    def traced_request(
+        self, method: str, path: str, url: str, **kwargs
+    ) -> requests.Response:
+        """Make a single HTTP request in a tracing span.
+
+        Args:
+            method: An HTTP method (GET, PUT, POST, or DELETE).
+            path: The API path with the parameters filled in.
+            url: The full URL for the request.
+            **kwargs: Additional named arguments passed through to
+                the transport.
+
+        Returns:
+            The raw Response object.
+        """
+        attributes = {"http.method": method.upper(), "http.route": template_path(path)}
+        with get_tracer().start_span(f"HTTP {method.upper()}", attributes) as span:
+            response = self.transport.send(method, url, **kwargs)
+            if span is not None:
+                span.set_attribute("http.status_code", response.status_code)
+        return response
+
+    def record_request(
+        self,
+        method: str,
+        path: str,
+        response: Optional[requests.Response],
+        attempts: int,
+        latency: float,
+    ) -> None:
+        """Notify listeners about a completed request.
+
+        Args:
+            method: HTTP method.
+            path: The API path with the parameters filled in.
+            response: Final response (if any was received).
+            attempts: Number of attempts made.
+            latency: Total time in seconds spent on all attempts.
+        """
+        status = None
+        response_bytes = 0
+        if response is not None:
+            status = response.status_code
+            content_length = response.headers.get("Content-Length")
+            if content_length is not None and content_length.isdigit():
+                response_bytes = int(content_length)
+            else:
+                response_bytes = len(response.content or b"")
+        event = RequestEvent(
+            method=method.upper(),
+            path_template=template_path(path),
+            status=status,
+            attempts=attempts,
+            latency=latency,
+            response_bytes=response_bytes,
+        )
+        page_events = getattr(_paging, "events", None)
+        if page_events is not None:
+            page_events.append(event)
+        self.notify(event)
 
     def request_json(self, method: str, path: str, **kwargs) -> dict[str, Any]:
         """Make an auth'ed HTTP request and parse the JSON response.
@@ -87,7 +239,7 @@ class NextflowTowerClient:
             response.raise_for_status()
         except HTTPError as e:
             # Add extra context if possible
-            raise HTTPError(response.text) from e
+            raise HTTPError(response.text, response=response) from e
         return response.json()
 
     def request_paged(self, method: str, path: str, **kwargs) -> dict[str, Any]:
@@ -110,13 +262,21 @@ class NextflowTowerClient:
         all_items = list()
         key_name = "items"  # Setting a default value
         total_size = float("inf")  # Artificial value for initiating the while-loop
-        while num_items < total_size:
-            kwargs["params"]["offset"] = num_items
-            json = self.request_json(method, path, **kwargs)
-            total_size = json.pop("totalSize", None) or json.pop("total", 0)
-            key_name, items = json.popitem()
-            num_items += len(items)
-            all_items.extend(items)
+        parent_events = getattr(_paging, "events", None)
+        _paging.events = list()
+        try:
+            while num_items < total_size:
+                kwargs["params"]["offset"] = num_items
+                json = self.request_json(method, path, **kwargs)
+                total_size = json.pop("totalSize", None) or json.pop("total", 0)
+                key_name, items = json.popitem()
+                num_items += len(items)
+                all_items.extend(items)
+        finally:
+            page_events = _paging.events
+            _paging.events = parent_events
+            if self.listeners and page_events:
+                self.record_paged_request(method, path, page_events)
 
         if len(all_items) != total_size:
             message = f"Expected {total_size} items, but got: {all_items}"
@@ -125,6 +285,27 @@ class NextflowTowerClient:
         json = {"totalSize": total_size, key_name: all_items}
         return json
 
+    def record_paged_request(
+        self, method: str, path: str, page_events: list[RequestEvent]
+    ) -> None:
+        """Notify listeners about a completed paged request.
+
+        Args:
+            method: HTTP method.
+            path: The API path with the parameters filled in.
+            page_events: Events for the request made for each page.
+        """
+        event = RequestEvent(
+            method=method.upper(),
+            path_template=template_path(path),
+            status=page_events[-1].status,
+            attempts=sum(event.attempts for event in page_events),
+            latency=sum(event.latency for event in page_events),
+            response_bytes=sum(event.response_bytes for event in page_events),
+            pages=len(page_events),
+        )
+        self.notify(event)
+
     def get(self, path: str, **kwargs) -> dict[str, Any]:
         """Send an auth'ed GET request and parse the JSON response.
 
@@ -163,6 +344,7 @@ class NextflowTowerClient:
             raise HTTPError(message)
         return json[key]
 
+    @traced
     def get_user_info(self) -> models.User:
         """Describe current user.
 
@@ -174,6 +356,7 @@ class NextflowTowerClient:
         unwrapped = self.unwrap(json, "user")
         return models.User.from_json(unwrapped)
 
+    @traced
     def list_user_workspaces_and_orgs(
         self,
         user_id: int,
@@ -196,6 +379,7 @@ class NextflowTowerClient:
                 objects.append(org)
         return objects
 
+    @traced
     def list_user_workspaces(self) -> list[models.Workspace]:
         """List the workspaces that are available to the current user.
 
@@ -229,6 +413,7 @@ class NextflowTowerClient:
                 params[name] = value
         return params
 
+    @traced
     def get_compute_env(
         self,
         compute_env_id: str,
@@ -249,6 +434,7 @@ class NextflowTowerClient:
         unwrapped = self.unwrap(json, "computeEnv")
         return models.ComputeEnv.from_json(unwrapped)
 
+    @traced
     def list_compute_envs(
         self,
         workspace_id: Optional[int] = None,
@@ -270,6 +456,7 @@ class NextflowTowerClient:
         items = self.unwrap(json, "computeEnvs")
         return [models.ComputeEnvSummary.from_json(item) for item in items]
 
+    @traced
     def create_label(
         self,
         name: str,
@@ -290,6 +477,7 @@ class NextflowTowerClient:
         json = self.post(path, params=params, json=payload)
         return models.Label.from_json(json)
 
+    @traced
     def list_labels(self, workspace_id: Optional[int] = None) -> list[models.Label]:
         """List all available labels.
 
@@ -305,6 +493,7 @@ class NextflowTowerClient:
         items = self.unwrap(json, "labels")
         return [models.Label.from_json(item) for item in items]
 
+    @traced
     def launch_workflow(
         self,
         launch_info: models.LaunchInfo,
@@ -326,6 +515,7 @@ class NextflowTowerClient:
         json = self.post(path, params=params, json=payload)
         return self.unwrap(json, "workflowId")
 
+    @traced
     def get_workflow(
         self,
         workflow_id: str,
@@ -348,6 +538,7 @@ class NextflowTowerClient:
         unwrapped = self.unwrap(json, "workflow")
         return models.Workflow.from_json(unwrapped)
 
+    @traced
     def list_workflows(
         self,
         search_filter: Optional[str] = None,
@@ -370,6 +561,7 @@ class NextflowTowerClient:
         items = self.unwrap(json, "workflows")
         return [models.Workflow.from_json(item["workflow"]) for item in items]
 
+    @traced
     def get_workflow_tasks(
         self,
         workflow_id: str,
@@ -392,6 +584,7 @@ class NextflowTowerClient:
         items = self.unwrap(json, "tasks")
         return [models.WorkflowTask.from_json(item["task"]) for item in items]
 
+    @traced
     def get_task_logs(
         self, workflow_id: str, task_id: int, workspace_id: Optional[int]
     ) -> str:
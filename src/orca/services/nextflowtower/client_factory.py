@@ -1,3 +1,5 @@
+from typing import Any
+
 from pydantic.dataclasses import dataclass
 
 from orca.errors import ConfigError
@@ -34,7 +36,7 @@ class NextflowTowerClientFactory(BaseClientFactory):
         Returns:
             An authenticated client object.
         """
-        kwargs = dict()
+        kwargs: dict[str, Any] = dict()
         api_endpoint = self.config.api_endpoint
         auth_token = self.config.auth_token
 
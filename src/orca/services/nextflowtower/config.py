@@ -8,7 +8,7 @@ from pydantic.dataclasses import dataclass
 from orca.services.base.config import BaseConfig
 
 if TYPE_CHECKING:
-    from airflow.models.connection import Connection
+    from orca.services.base.config import AnyConnection
 
 
 @dataclass(kw_only=False)
@@ -58,11 +58,11 @@ class NextflowTowerConfig(BaseConfig):
         return value
 
     @classmethod
-    def parse_connection(cls, connection: Connection) -> dict[str, Any]:
+    def parse_connection(cls, connection: AnyConnection) -> dict[str, Any]:
         """Parse Airflow connection as arguments for this configuration.
 
         Args:
-            connection: An Airflow connection object.
+            connection: An Airflow (or lightweight) connection object.
 
         Returns:
             Keyword arguments for this configuration.
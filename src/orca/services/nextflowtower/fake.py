@@ -0,0 +1,667 @@
+"""Local stand-in for a Nextflow Tower server.
+
+``FakeTower`` implements the endpoints used by ``NextflowTowerClient``
+in memory, including paging (``max``/``offset``/``totalSize``),
+configurable latency, rate limiting with ``429`` responses, and
+synthetic workflow runs that progress through ``WorkflowState``
+every time they are polled. It can be used in two ways:
+
+FakeTowerTransport:
+    In-process transport for ``NextflowTowerClient``, which avoids
+    any sockets and is the cheapest option for load tests.
+FakeTowerServer:
+    Threaded HTTP server listening on localhost, which exercises
+    the full networking stack.
+
+Example:
+    Launch and monitor runs without a real Tower instance::
+
+        tower = FakeTower(latency=0.05, rate_limit=500)
+        client = NextflowTowerClient("token", "http://fake", max_attempts=5)
+        client.transport = FakeTowerTransport(tower)
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+from orca.services.nextflowtower.models import WorkflowState
+from orca.services.nextflowtower.transport import Transport, build_response
+
+# Order in which synthetic runs progress before reaching a final state
+RUN_STATES = [WorkflowState.SUBMITTED, WorkflowState.RUNNING]
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def format_datetime(value: datetime) -> str:
+    """Format datetimes like Tower (RFC 3339).
+
+    Args:
+        value: Datetime object.
+
+    Returns:
+        Datetime string.
+    """
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+@dataclass
+class FakeResponse:
+    """Response generated by the fake Tower server.
+
+    Attributes:
+        status: HTTP status code.
+        body: JSON-serializable response body.
+        headers: Response headers.
+    """
+
+    status: int
+    body: Any
+    headers: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def text(self) -> str:
+        """Serialized response body."""
+        return json.dumps(self.body)
+
+
+@dataclass
+class FakeRun:
+    """Synthetic workflow run.
+
+    Attributes:
+        id: Workflow run ID.
+        launch: Launch specification (as sent by the client).
+        final_state: State reached once the run is done.
+        submit: Submission timestamp.
+        polls: Number of times that the run was retrieved.
+        state: Current state (if forced using ``FakeTower.set_state()``).
+        complete: Completion timestamp (once done).
+    """
+
+    id: str
+    launch: dict[str, Any]
+    final_state: WorkflowState
+    submit: datetime
+    polls: int = 0
+    state: Optional[WorkflowState] = None
+    complete: Optional[datetime] = None
+
+
+class FakeTower:
+    """In-memory implementation of the Nextflow Tower API."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        rate_limit: Optional[float] = None,
+        burst: int = 10,
+        polls_per_state: int = 1,
+        failure_rate: float = 0.0,
+        num_tasks: int = 4,
+        num_compute_envs: int = 1,
+        auth_token: Optional[str] = None,
+        seed: int = 0,
+    ):
+        """Construct a fake Tower server without any workflow runs.
+
+        Args:
+            latency: Number of seconds to wait before each response.
+            rate_limit: Number of requests per second allowed before
+                responding with ``429 Too Many Requests``. Defaults to
+                None (no throttling).
+            burst: Number of requests that can be made back-to-back
+                before the rate limit kicks in.
+            polls_per_state: Number of times that a run must be
+                retrieved before it progresses to the next state.
+            failure_rate: Fraction of runs that end up failing.
+            num_tasks: Number of tasks reported for each run.
+            num_compute_envs: Number of available compute environments.
+            auth_token: Expected authentication token. Defaults to
+                None, which accepts any token.
+            seed: Seed for the random number generator used for
+                deciding which runs fail, which ensures reproducibility.
+        """
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self.polls_per_state = polls_per_state
+        self.failure_rate = failure_rate
+        self.num_tasks = num_tasks
+        self.auth_token = auth_token
+
+        self.user: dict[str, Any] = {
+            "id": 100,
+            "userName": "fake-user",
+            "email": "fake@example.com",
+        }
+        self.org: dict[str, Any] = {"orgId": 10, "orgName": "Fake-Org"}
+        self.workspace: dict[str, Any] = {
+            "workspaceId": 1000,
+            "workspaceName": "fake-workspace",
+        }
+        self.labels: list[dict[str, Any]] = [
+            {"id": 1, "name": "CostCenter", "value": "12345", "resource": True},
+        ]
+        self.compute_envs = [
+            self.generate_compute_env(index) for index in range(num_compute_envs)
+        ]
+        self.runs: dict[str, FakeRun] = dict()
+        self.num_requests = 0
+        self.num_throttled = 0
+
+        self._random = random.Random(seed)
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def workspace_name(self) -> str:
+        """Fully-qualified name of the only workspace."""
+        return f"{self.org['orgName']}/{self.workspace['workspaceName']}"
+
+    def generate_compute_env(self, index: int) -> dict[str, Any]:
+        """Generate a synthetic compute environment.
+
+        Args:
+            index: Compute environment index.
+
+        Returns:
+            Compute environment JSON.
+        """
+        return {
+            "id": f"ce{index:03d}",
+            "name": f"fake-compute-env-ondemand-v{index}",
+            "platform": "aws-batch",
+            "status": "AVAILABLE",
+            "dateCreated": f"2023-01-{index % 28 + 1:02d}T00:00:00Z",
+            "config": {
+                "workDir": "s3://fake-bucket/work",
+                "preRunScript": "",
+            },
+        }
+
+    def is_throttled(self) -> bool:
+        """Consume a token from the rate limiter (if any).
+
+        Returns:
+            Whether the request should be rejected.
+        """
+        if self.rate_limit is None:
+            return False
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate_limit)
+        self._last_refill = now
+        if self._tokens < 1:
+            return True
+        self._tokens -= 1
+        return False
+
+    def handle(
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict[str, str]] = None,
+        payload: Any = None,
+        headers: Optional[dict[str, str]] = None,
+    ) -> FakeResponse:
+        """Respond to an API request.
+
+        Args:
+            method: HTTP method.
+            path: URL path (with or without an '/api' prefix).
+            params: URL query parameters.
+            payload: Deserialized JSON request body.
+            headers: Request headers.
+
+        Returns:
+            Fake response.
+        """
+        if self.latency:
+            time.sleep(self.latency)
+
+        params = params or {}
+        segments = [segment for segment in path.split("/") if segment]
+        if segments[:1] == ["api"]:
+            segments = segments[1:]
+
+        with self._lock:
+            self.num_requests += 1
+            if self.is_throttled():
+                self.num_throttled += 1
+                message = {"message": "Too many requests"}
+                return FakeResponse(429, message, {"Retry-After": "1"})
+
+            if self.auth_token is not None:
+                auth_header = (headers or {}).get("Authorization")
+                if auth_header != f"Bearer {self.auth_token}":
+                    return FakeResponse(401, {"message": "Unauthorized"})
+
+            return self.route(method.upper(), segments, params, payload)
+
+    def route(
+        self,
+        method: str,
+        segments: list[str],
+        params: dict[str, str],
+        payload: Any,
+    ) -> FakeResponse:
+        """Dispatch an API request to the matching endpoint.
+
+        Args:
+            method: HTTP method (in uppercase).
+            segments: URL path segments.
+            params: URL query parameters.
+            payload: Deserialized JSON request body.
+
+        Returns:
+            Fake response.
+        """
+        if method == "GET" and segments == ["user-info"]:
+            body = {"user": self.user, "needConsent": False}
+            return FakeResponse(200, body)
+        elif method == "GET" and segments[::2] == ["user", "workspaces"]:
+            org_row = {**self.org, "workspaceId": None, "workspaceName": None}
+            workspace_row = {**self.org, **self.workspace}
+            body = {"orgsAndWorkspaces": [org_row, workspace_row]}
+            return FakeResponse(200, body)
+        elif method == "GET" and segments == ["compute-envs"]:
+            status = params.get("status")
+            envs = [
+                self.summarize_compute_env(env)
+                for env in self.compute_envs
+                if status is None or env["status"] == status
+            ]
+            return FakeResponse(200, {"computeEnvs": envs})
+        elif method == "GET" and segments[:1] == ["compute-envs"]:
+            for env in self.compute_envs:
+                if env["id"] == segments[1]:
+                    body = {"computeEnv": {**env, "labels": self.resource_labels}}
+                    return FakeResponse(200, body)
+        elif method == "GET" and segments == ["labels"]:
+            return self.paginate("labels", self.labels, params)
+        elif method == "POST" and segments == ["labels"]:
+            label = {"id": len(self.labels) + 1, "value": None, **payload}
+            self.labels.append(label)
+            return FakeResponse(200, label)
+        elif method == "POST" and segments == ["workflow", "launch"]:
+            return self.launch(payload)
+        elif method == "GET" and segments == ["workflow"]:
+            runs = self.search(params.get("search", ""))
+            items = [self.wrap_workflow(run) for run in runs]
+            return self.paginate("workflows", items, params)
+        elif method == "GET" and len(segments) == 2 and segments[0] == "workflow":
+            run = self.runs.get(segments[1])
+            if run is not None:
+                self.poll(run)
+                return FakeResponse(200, {"workflow": self.describe(run)})
+        elif method == "GET" and segments[::2] == ["workflow", "tasks"]:
+            if segments[1] in self.runs:
+                tasks = self.generate_tasks(self.runs[segments[1]])
+                return self.paginate("tasks", tasks, params, total_key="total")
+        elif method == "GET" and segments[::2] == ["workflow", "log"]:
+            if segments[1] in self.runs:
+                entries = [f"Task {segments[3]} of run {segments[1]}"]
+                body = {"log": {"entries": entries, "pending": False}}
+                return FakeResponse(200, body)
+
+        path = "/".join(segments)
+        return FakeResponse(404, {"message": f"Not found ({method} /{path})"})
+
+    @property
+    def resource_labels(self) -> list[dict[str, Any]]:
+        """Labels that are applied to resources."""
+        return [label for label in self.labels if label["resource"]]
+
+    def summarize_compute_env(self, env: dict[str, Any]) -> dict[str, Any]:
+        """Generate the summary of a compute environment.
+
+        Args:
+            env: Compute environment JSON.
+
+        Returns:
+            Compute environment summary JSON.
+        """
+        keys = ["id", "name", "platform", "status"]
+        summary = {key: env[key] for key in keys}
+        summary["workDir"] = env["config"]["workDir"]
+        return summary
+
+    def paginate(
+        self,
+        key: str,
+        items: list[Any],
+        params: dict[str, str],
+        total_key: str = "totalSize",
+    ) -> FakeResponse:
+        """Respond with a page of items.
+
+        Args:
+            key: Key for the list of items.
+            items: All items.
+            params: URL query parameters, including 'max' and 'offset'.
+            total_key: Key for the total number of items.
+
+        Returns:
+            Fake response.
+        """
+        max_items = int(params.get("max", 50))
+        offset = int(params.get("offset", 0))
+        body = {key: items[offset : offset + max_items], total_key: len(items)}
+        return FakeResponse(200, body)
+
+    def launch(self, payload: Any) -> FakeResponse:
+        """Create a synthetic workflow run.
+
+        Args:
+            payload: Launch request body.
+
+        Returns:
+            Fake response.
+        """
+        launch = (payload or {}).get("launch", {})
+        for required in ["computeEnvId", "pipeline", "workDir"]:
+            if not launch.get(required):
+                message = f"Missing launch attribute ({required})"
+                return FakeResponse(400, {"message": message})
+
+        workflow_id = f"run{len(self.runs) + 1:05d}"
+        is_failure = self._random.random() < self.failure_rate
+        final_state = WorkflowState.FAILED if is_failure else WorkflowState.SUCCEEDED
+        now = datetime.now(timezone.utc)
+        self.runs[workflow_id] = FakeRun(workflow_id, launch, final_state, now)
+        return FakeResponse(200, {"workflowId": workflow_id})
+
+    def poll(self, run: FakeRun) -> None:
+        """Advance a run towards its final state.
+
+        Args:
+            run: Synthetic workflow run.
+        """
+        if run.state is None:
+            index = run.polls // self.polls_per_state
+            if index >= len(RUN_STATES):
+                run.state = run.final_state
+                run.complete = datetime.now(timezone.utc)
+        run.polls += 1
+
+    def get_state(self, run: FakeRun) -> WorkflowState:
+        """Determine the current state of a run.
+
+        Args:
+            run: Synthetic workflow run.
+
+        Returns:
+            Workflow state.
+        """
+        if run.state is not None:
+            return run.state
+        index = max(run.polls - 1, 0) // self.polls_per_state
+        return RUN_STATES[min(index, len(RUN_STATES) - 1)]
+
+    def set_state(self, workflow_id: str, state: WorkflowState) -> None:
+        """Force the state of a run.
+
+        Args:
+            workflow_id: Workflow run ID.
+            state: New workflow state.
+        """
+        with self._lock:
+            run = self.runs[workflow_id]
+            run.state = state
+            if state not in RUN_STATES:
+                run.complete = datetime.now(timezone.utc)
+
+    def search(self, search_filter: str) -> list[FakeRun]:
+        """Find runs matching a search filter.
+
+        Only run name substrings and 'label:<name>' terms are supported.
+
+        Args:
+            search_filter: Search query.
+
+        Returns:
+            Matching runs (most recent first).
+        """
+        label_ids = {label["name"]: label["id"] for label in self.labels}
+        runs = list()
+        for run in reversed(list(self.runs.values())):
+            is_match = True
+            for term in search_filter.split():
+                if term.startswith("label:"):
+                    label_id = label_ids.get(term[len("label:") :])
+                    is_match &= label_id in run.launch.get("labelIds", [])
+                else:
+                    is_match &= term in (run.launch.get("runName") or "")
+            if is_match:
+                runs.append(run)
+        return runs
+
+    def describe(self, run: FakeRun) -> dict[str, Any]:
+        """Generate the JSON representation of a run.
+
+        Args:
+            run: Synthetic workflow run.
+
+        Returns:
+            Workflow JSON.
+        """
+        launch = run.launch
+        state = self.get_state(run)
+        params_text = launch.get("paramsText")
+        complete = format_datetime(run.complete) if run.complete else None
+        return {
+            "id": run.id,
+            "submit": format_datetime(run.submit),
+            "complete": complete,
+            "dateCreated": format_datetime(run.submit),
+            "runName": launch.get("runName") or run.id,
+            "sessionId": launch.get("sessionId") or f"session-{run.id}",
+            "userName": self.user["userName"],
+            "projectName": launch["pipeline"],
+            "workDir": launch["workDir"],
+            "status": state.value,
+            "params": json.loads(params_text) if params_text else {},
+            "commitId": None,
+            "revision": launch.get("revision"),
+            "resume": launch.get("resume", False),
+            "success": state == WorkflowState.SUCCEEDED if complete else None,
+        }
+
+    def wrap_workflow(self, run: FakeRun) -> dict[str, Any]:
+        """Generate a run listing item.
+
+        Args:
+            run: Synthetic workflow run.
+
+        Returns:
+            Workflow listing JSON.
+        """
+        return {
+            "workflow": self.describe(run),
+            "orgId": self.org["orgId"],
+            "workspaceId": self.workspace["workspaceId"],
+        }
+
+    def generate_tasks(self, run: FakeRun) -> list[dict[str, Any]]:
+        """Generate the tasks for a run.
+
+        Args:
+            run: Synthetic workflow run.
+
+        Returns:
+            List of task listing JSON.
+        """
+        tasks = list()
+        for task_id in range(1, self.num_tasks + 1):
+            task = {
+                "id": task_id,
+                "taskId": task_id,
+                "status": "COMPLETED",
+                "name": f"process ({task_id})",
+                "module": [],
+                "queue": "fake-queue",
+                "memory": None,
+                "script": "echo 'Hello world!'",
+                "tag": None,
+                "executor": "awsbatch",
+                "duration": 1000,
+                "container": "quay.io/nextflow/bash",
+                "process": "process",
+                "attempt": 1,
+                "scratch": None,
+                "workdir": f"{run.launch['workDir']}/{run.id}/{task_id}",
+                "disk": None,
+                "priceModel": "spot",
+                "cost": 0.0001,
+                "errorAction": None,
+                "nativeId": f"{run.id}-{task_id}",
+                "env": None,
+                "exitStatus": 0,
+                "cpus": 1,
+                "machineType": "c6i.2xlarge",
+                "hash": f"{task_id:02d}/{run.id}",
+            }
+            tasks.append({"task": task})
+        return tasks
+
+
+class FakeTowerTransport(Transport):
+    """Transport that sends requests to a fake Tower server in-process."""
+
+    def __init__(self, tower: FakeTower):
+        """Construct a transport for a fake Tower server.
+
+        Args:
+            tower: Fake Tower server.
+        """
+        self.tower = tower
+
+    def send(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Send an HTTP request to the fake Tower server.
+
+        Args:
+            method: An HTTP method (GET, PUT, POST, or DELETE).
+            url: The full URL for the request.
+            **kwargs: Additional named arguments (as expected by
+                requests.request()).
+
+        Returns:
+            The raw Response object.
+        """
+        parsed = urlsplit(url)
+        params = dict(parse_qsl(parsed.query))
+        params.update({k: str(v) for k, v in (kwargs.get("params") or {}).items()})
+        payload = kwargs.get("json")
+        headers = kwargs.get("headers")
+        response = self.tower.handle(method, parsed.path, params, payload, headers)
+        headers = {**JSON_HEADERS, **response.headers}
+        return build_response(url, response.status, response.text, headers)
+
+
+class FakeTowerServer:
+    """Threaded HTTP server for a fake Tower instance on localhost.
+
+    The server runs in a background thread while used as a context
+    manager (or between calls to ``start()`` and ``stop()``).
+    """
+
+    def __init__(self, tower: FakeTower, host: str = "127.0.0.1", port: int = 0):
+        """Construct an HTTP server for a fake Tower instance.
+
+        Args:
+            tower: Fake Tower server.
+            host: Host name to bind to. Defaults to localhost.
+            port: Port to bind to. Defaults to any available port.
+        """
+        self.tower = tower
+
+        class Handler(BaseHTTPRequestHandler):
+            """Request handler forwarding requests to the fake Tower."""
+
+            def handle_request(self) -> None:
+                """Forward the current request and send the response."""
+                parsed = urlsplit(self.path)
+                params = dict(parse_qsl(parsed.query))
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length)) if length else None
+                headers = dict(self.headers.items())
+                response = tower.handle(
+                    self.command, parsed.path, params, payload, headers
+                )
+                content = response.text.encode()
+                self.send_response(response.status)
+                for name, value in {**JSON_HEADERS, **response.headers}.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = do_PUT = do_DELETE = handle_request
+
+            def log_message(self, format: str, *args: Any) -> None:
+                """Silence the request logs.
+
+                Args:
+                    format: Message format.
+                    *args: Message arguments.
+                """
+
+        class Server(ThreadingHTTPServer):
+            """HTTP server with a backlog large enough for load tests."""
+
+            daemon_threads = True
+            request_queue_size = 1024
+
+        self.server = Server((host, port), Handler)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def api_endpoint(self) -> str:
+        """API endpoint for configuring clients."""
+        host, port = self.server.server_address[:2]
+        if isinstance(host, bytes):
+            host = host.decode()
+        return f"http://{host}:{port}/api"
+
+    def start(self) -> None:
+        """Start serving requests in a background thread."""
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving requests and release the socket."""
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> FakeTowerServer:
+        """Start serving requests.
+
+        Returns:
+            This server.
+        """
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Stop serving requests.
+
+        Args:
+            *args: Exception details (ignored).
+        """
+        self.stop()
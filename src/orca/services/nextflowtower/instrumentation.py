@@ -0,0 +1,370 @@
+"""Per-request instrumentation for the Nextflow Tower client.
+
+The ``NextflowTowerClient`` notifies its listeners with a
+``RequestEvent`` after every request. A listener is any callable
+that accepts an event. This module provides a few built-in sinks:
+
+LoggingSink:
+    Log a one-line summary of each request.
+HistogramSink:
+    Aggregate latencies, response sizes, attempts and page counts
+    in memory, grouped by HTTP method and path template.
+PrometheusExporter:
+    Render the aggregates of a ``HistogramSink`` using the
+    Prometheus text exposition format.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Callable, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (in seconds) for the request latency histogram buckets
+DEFAULT_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Upper bounds for the page count histogram buckets
+DEFAULT_PAGE_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+
+@dataclass(frozen=True)
+class RequestEvent:
+    """Summary of a completed request to Nextflow Tower.
+
+    Attributes:
+        method: HTTP method (e.g., 'GET').
+        path_template: API path with identifiers replaced by
+            placeholders (e.g., '/workflow/{id}').
+        status: HTTP status code of the final response or
+            ``None`` if no response was received.
+        attempts: Number of attempts made for this request.
+        latency: Total time in seconds spent on all attempts.
+        response_bytes: Size of the final response body.
+        pages: Number of pages retrieved for a paged request
+            or ``None`` if this event describes a single request.
+    """
+
+    method: str
+    path_template: str
+    status: Optional[int]
+    attempts: int
+    latency: float
+    response_bytes: int
+    pages: Optional[int] = None
+
+    @property
+    def is_paged(self) -> bool:
+        """Whether this event summarizes a paged request."""
+        return self.pages is not None
+
+
+RequestListener = Callable[[RequestEvent], None]
+
+
+@dataclass
+class LoggingSink:
+    """Log a one-line summary of each request.
+
+    Attributes:
+        level: Logging level for the messages.
+        logger: Logger used for emitting messages.
+    """
+
+    level: int = logging.DEBUG
+    logger: logging.Logger = field(default=logger, repr=False)
+
+    def __call__(self, event: RequestEvent) -> None:
+        """Log the request event.
+
+        Args:
+            event: Request event.
+        """
+        if not self.logger.isEnabledFor(self.level):
+            return
+        pages = f" pages={event.pages}" if event.is_paged else ""
+        self.logger.log(
+            self.level,
+            f"{event.method} {event.path_template} status={event.status} "
+            f"attempts={event.attempts} latency={event.latency:.3f}s "
+            f"bytes={event.response_bytes}{pages}",
+        )
+
+
+@dataclass
+class Histogram:
+    """Cumulative histogram with fixed bucket upper bounds.
+
+    Attributes:
+        bounds: Sorted upper bounds for each bucket. An implicit
+            bucket (``+Inf``) collects values above the last bound.
+        counts: Number of observations per bucket (non-cumulative).
+        count: Total number of observations.
+        total: Sum of all observed values.
+    """
+
+    bounds: Sequence[float]
+    counts: list[int] = field(init=False)
+    count: int = 0
+    total: float = 0.0
+
+    def __post_init__(self) -> None:
+        """Initialize one counter per bucket (including +Inf)."""
+        self.counts = [0] * (len(self.bounds) + 1)
+
+    def observe(self, value: float) -> None:
+        """Record a value.
+
+        Args:
+            value: Observed value.
+        """
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def cumulative_counts(self) -> list[int]:
+        """Compute cumulative counts (as expected by Prometheus).
+
+        Returns:
+            Cumulative counts, one per bucket (including +Inf).
+        """
+        cumulative = list()
+        running = 0
+        for count in self.counts:
+            running += count
+            cumulative.append(running)
+        return cumulative
+
+    @property
+    def mean(self) -> float:
+        """Mean of all observed values (zero if none)."""
+        return self.total / self.count if self.count else 0.0
+
+
+EndpointKey = tuple[str, str]
+
+
+class HistogramSink:
+    """Aggregate request metrics in memory by endpoint.
+
+    Endpoints are identified by the HTTP method and path template.
+    Single requests contribute to the latency histogram and the
+    counters, whereas paged requests (which are summaries of single
+    requests that were already recorded) only contribute to the
+    page count histogram.
+    """
+
+    def __init__(
+        self,
+        latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        page_buckets: Sequence[float] = DEFAULT_PAGE_BUCKETS,
+    ):
+        """Construct an empty aggregator.
+
+        Args:
+            latency_buckets: Upper bounds (in seconds) for latencies.
+            page_buckets: Upper bounds for page counts.
+        """
+        self.latency_buckets = tuple(sorted(latency_buckets))
+        self.page_buckets = tuple(sorted(page_buckets))
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard all recorded metrics."""
+        with self._lock:
+            self.latencies: dict[EndpointKey, Histogram] = dict()
+            self.pages: dict[EndpointKey, Histogram] = dict()
+            self.statuses: dict[EndpointKey, Counter] = defaultdict(Counter)
+            self.attempts: Counter[EndpointKey] = Counter()
+            self.response_bytes: Counter[EndpointKey] = Counter()
+
+    def __call__(self, event: RequestEvent) -> None:
+        """Record the request event.
+
+        Args:
+            event: Request event.
+        """
+        key = (event.method, event.path_template)
+        with self._lock:
+            if event.pages is not None:
+                if key not in self.pages:
+                    self.pages[key] = Histogram(self.page_buckets)
+                self.pages[key].observe(event.pages)
+                return
+            if key not in self.latencies:
+                self.latencies[key] = Histogram(self.latency_buckets)
+            self.latencies[key].observe(event.latency)
+            self.statuses[key][str(event.status)] += 1
+            self.attempts[key] += event.attempts
+            self.response_bytes[key] += event.response_bytes
+
+    def summary(self) -> list[dict]:
+        """Summarize the recorded metrics per endpoint.
+
+        Endpoints are sorted by their total latency (descending),
+        which makes it easy to see which endpoints dominate.
+
+        Returns:
+            One dictionary per endpoint.
+        """
+        with self._lock:
+            rows = list()
+            for (method, path), histogram in self.latencies.items():
+                pages = self.pages.get((method, path))
+                row = {
+                    "method": method,
+                    "path_template": path,
+                    "count": histogram.count,
+                    "total_latency": histogram.total,
+                    "mean_latency": histogram.mean,
+                    "attempts": self.attempts[(method, path)],
+                    "response_bytes": self.response_bytes[(method, path)],
+                    "statuses": dict(self.statuses[(method, path)]),
+                    "paged_requests": pages.count if pages else 0,
+                    "mean_pages": pages.mean if pages else 0.0,
+                }
+                rows.append(row)
+        return sorted(rows, key=lambda row: row["total_latency"], reverse=True)
+
+
+class PrometheusExporter:
+    """Export the metrics of a ``HistogramSink`` for Prometheus.
+
+    The output follows the Prometheus text exposition format, so it
+    can be served over HTTP or written to a file for the textfile
+    collector of the node exporter.
+    """
+
+    def __init__(self, sink: HistogramSink, prefix: str = "orca_tower"):
+        """Construct an exporter for a given aggregator.
+
+        Args:
+            sink: In-memory metrics aggregator.
+            prefix: Prefix for all metric names.
+        """
+        self.sink = sink
+        self.prefix = prefix
+
+    @staticmethod
+    def format_labels(method: str, path: str, **extra: str) -> str:
+        """Format Prometheus labels for an endpoint.
+
+        Args:
+            method: HTTP method.
+            path: API path template.
+            **extra: Additional labels.
+
+        Returns:
+            Label set enclosed in curly braces.
+        """
+        labels = {"method": method, "path": path, **extra}
+        escaped = {
+            name: value.replace("\\", "\\\\").replace('"', '\\"')
+            for name, value in labels.items()
+        }
+        pairs = ",".join(f'{name}="{value}"' for name, value in escaped.items())
+        return "{" + pairs + "}"
+
+    def render_histogram(
+        self, name: str, help: str, histograms: dict[EndpointKey, Histogram]
+    ) -> list[str]:
+        """Render histograms as Prometheus text lines.
+
+        Args:
+            name: Metric name (without prefix).
+            help: Metric description.
+            histograms: Histograms by endpoint.
+
+        Returns:
+            Lines of the Prometheus text format.
+        """
+        metric = f"{self.prefix}_{name}"
+        lines = [f"# HELP {metric} {help}", f"# TYPE {metric} histogram"]
+        for (method, path), histogram in sorted(histograms.items()):
+            bounds = [str(bound) for bound in histogram.bounds] + ["+Inf"]
+            for bound, count in zip(bounds, histogram.cumulative_counts()):
+                labels = self.format_labels(method, path, le=bound)
+                lines.append(f"{metric}_bucket{labels} {count}")
+            labels = self.format_labels(method, path)
+            lines.append(f"{metric}_sum{labels} {histogram.total}")
+            lines.append(f"{metric}_count{labels} {histogram.count}")
+        return lines
+
+    def render_counter(
+        self, name: str, help: str, counter: dict[EndpointKey, int]
+    ) -> list[str]:
+        """Render counters as Prometheus text lines.
+
+        Args:
+            name: Metric name (without prefix).
+            help: Metric description.
+            counter: Counts by endpoint.
+
+        Returns:
+            Lines of the Prometheus text format.
+        """
+        metric = f"{self.prefix}_{name}"
+        lines = [f"# HELP {metric} {help}", f"# TYPE {metric} counter"]
+        for (method, path), value in sorted(counter.items()):
+            labels = self.format_labels(method, path)
+            lines.append(f"{metric}{labels} {value}")
+        return lines
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text format.
+
+        Returns:
+            Prometheus text exposition.
+        """
+        sink = self.sink
+        with sink._lock:
+            lines = self.render_histogram(
+                "request_duration_seconds",
+                "Latency of Nextflow Tower requests (including retries).",
+                sink.latencies,
+            )
+            lines += self.render_histogram(
+                "request_pages",
+                "Number of pages retrieved by paged Nextflow Tower requests.",
+                sink.pages,
+            )
+            metric = f"{self.prefix}_requests_total"
+            lines += [
+                f"# HELP {metric} Number of Nextflow Tower requests by status.",
+                f"# TYPE {metric} counter",
+            ]
+            for (method, path), statuses in sorted(sink.statuses.items()):
+                for status, count in sorted(statuses.items()):
+                    labels = self.format_labels(method, path, status=status)
+                    lines.append(f"{metric}{labels} {count}")
+            lines += self.render_counter(
+                "request_attempts_total",
+                "Number of attempts made for Nextflow Tower requests.",
+                sink.attempts,
+            )
+            lines += self.render_counter(
+                "response_bytes_total",
+                "Size of Nextflow Tower response bodies in bytes.",
+                sink.response_bytes,
+            )
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """Atomically write the metrics to a file.
+
+        The file is first written under a temporary name and then
+        renamed so that scrapers never read a partial file.
+
+        Args:
+            path: Output file path (e.g., ending with '.prom').
+        """
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as file:
+            file.write(self.render())
+        os.replace(temp_path, path)
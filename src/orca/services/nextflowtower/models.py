@@ -1,4 +1,6 @@
+import hashlib
 import json as json_module
+import weakref
 from dataclasses import KW_ONLY, field, fields
 from datetime import datetime
 from enum import Enum
@@ -10,6 +12,11 @@ from typing_extensions import Self
 
 from orca.services.nextflowtower.utils import dedup, get_nested
 
+# Cached serializations of launch specifications keyed by object ID,
+# which are kept out of the instance `__dict__` to preserve idioms like
+# `LaunchInfo(**launch_info.__dict__)`
+LAUNCH_INFO_CACHE: dict[int, dict[str, Any]] = dict()
+
 
 class WorkflowState(str, Enum):
     """Valid values for the state of a Tower workflow."""
@@ -151,7 +158,16 @@ class Workspace(BaseTowerModel):
 
 @dataclass(kw_only=False)
 class LaunchInfo(BaseTowerModel):
-    """Nextflow Tower workflow launch specification."""
+    """Nextflow Tower workflow launch specification.
+
+    The canonical serializations (including of ``params``) and the
+    content hash (see ``fingerprint``) are cached until an attribute is
+    assigned (including with ``fill_in()`` and ``add_in()``). Mutating
+    attributes in place (e.g., ``launch_info.params["foo"] = "bar"``)
+    isn't detected, so the cache must be cleared with ``invalidate()``
+    afterwards. Launch requests (see ``to_json()``) aren't cached and
+    always reflect the current parameters.
+    """
 
     pipeline: Optional[str] = None
     compute_env_id: Optional[str] = None
@@ -188,6 +204,84 @@ class LaunchInfo(BaseTowerModel):
             raise ValueError(message)
         return values
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set an attribute and invalidate cached serializations.
+
+        Args:
+            name: Attribute name.
+            value: Attribute value.
+        """
+        super().__setattr__(name, value)
+        self.invalidate()
+
+    @property
+    def _cache(self) -> dict[str, Any]:
+        """Cached serializations for this launch specification."""
+        key = id(self)
+        cache = LAUNCH_INFO_CACHE.get(key)
+        if cache is None:
+            cache = LAUNCH_INFO_CACHE[key] = dict()
+            weakref.finalize(self, lambda: LAUNCH_INFO_CACHE.pop(key, None))
+        return cache
+
+    def invalidate(self) -> None:
+        """Clear cached serializations after in-place mutations."""
+        cache = LAUNCH_INFO_CACHE.get(id(self))
+        if cache:
+            cache.clear()
+
+    def get_params_text(self, canonical: bool = False) -> str:
+        """Serialize the workflow parameters as JSON.
+
+        Only the canonical serialization is cached, so the parameters
+        are always serialized as they currently are for launches.
+
+        Args:
+            canonical: Whether to sort the parameter keys.
+                Defaults to False.
+
+        Returns:
+            JSON-serialized parameters (empty if there are none).
+        """
+        if not canonical:
+            return json_module.dumps(self.params) if self.params else ""
+        if "canonical_params_text" not in self._cache:
+            params_text = ""
+            if self.params:
+                params_text = json_module.dumps(self.params, sort_keys=True)
+            self._cache["canonical_params_text"] = params_text
+        return self._cache["canonical_params_text"]
+
+    def to_canonical_json(self) -> str:
+        """Serialize all attributes in a canonical form.
+
+        Unlike ``to_json()``, this works with incomplete launch
+        specifications (e.g., before the compute environment is filled
+        in). Keys are sorted (including in ``params``) and list
+        attributes are deduplicated while preserving their order.
+
+        Returns:
+            Canonical JSON representation.
+        """
+        if "canonical_json" not in self._cache:
+            values = {f.name: getattr(self, f.name) for f in fields(self)}
+            del values["raw"]
+            for name, value in values.items():
+                if isinstance(value, list):
+                    values[name] = dedup(value, stable=True)
+            self._cache["canonical_json"] = json_module.dumps(
+                values, sort_keys=True, separators=(",", ":"), default=str
+            )
+        return self._cache["canonical_json"]
+
+    @property
+    def fingerprint(self) -> str:
+        """Content hash of the canonical launch specification."""
+        if "fingerprint" not in self._cache:
+            data = self.to_canonical_json().encode()
+            self._cache["fingerprint"] = hashlib.sha256(data).hexdigest()
+        return self._cache["fingerprint"]
+
     def fill_in(self, attr: str, value: Any):
         """Fill in any missing or falsy values.
 
@@ -213,25 +307,30 @@ class LaunchInfo(BaseTowerModel):
         updated_values = dedup(updated_values)
         setattr(self, attr, updated_values)
 
-    def to_json(self) -> dict[str, Any]:
+    def to_json(self, canonical: bool = False) -> dict[str, Any]:
         """Generate JSON representation of a launch specification.
 
+        Args:
+            canonical: Whether to generate a deterministic representation
+                by sorting parameter keys and preserving the order of
+                deduplicated lists. Defaults to False.
+
         Returns:
             JSON representation.
         """
         launch = {
             "computeEnvId": self.get("compute_env_id"),
-            "configProfiles": dedup(self.profiles),
+            "configProfiles": dedup(self.profiles, stable=canonical),
             "configText": self.nextflow_config,
             "dateCreated": None,
             "entryName": self.get("entry_name"),
             "headJobCpus": None,
             "headJobMemoryMb": None,
             "id": None,
-            "labelIds": dedup(self.label_ids),
+            "labelIds": dedup(self.label_ids, stable=canonical),
             "mainScript": None,
             "optimizationId": None,
-            "paramsText": json_module.dumps(self.params) if self.params else "",
+            "paramsText": self.get_params_text(canonical),
             "pipeline": self.get("pipeline"),
             "postRunScript": None,
             "preRunScript": self.pre_run_script,
@@ -241,9 +340,9 @@ class LaunchInfo(BaseTowerModel):
             "schemaName": None,
             "stubRun": False,
             "towerConfig": None,
-            "userSecrets": dedup(self.user_secrets),
+            "userSecrets": dedup(self.user_secrets, stable=canonical),
             "workDir": self.get("work_dir"),
-            "workspaceSecrets": dedup(self.workspace_secrets),
+            "workspaceSecrets": dedup(self.workspace_secrets, stable=canonical),
         }
         if self.resume:
             launch["resume"] = self.resume
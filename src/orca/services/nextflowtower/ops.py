@@ -1,12 +1,15 @@
 import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import field
 from functools import cached_property
-from typing import ClassVar, Optional
+from typing import ClassVar, Iterable, Optional
 
 from pydantic.dataclasses import dataclass
+from requests.exceptions import HTTPError
 
 from orca.errors import ConfigError
+from orca.services.base.idempotency import idempotent
 from orca.services.base.ops import BaseOps
 from orca.services.nextflowtower.client import NextflowTowerClient
 from orca.services.nextflowtower.client_factory import NextflowTowerClientFactory
@@ -31,6 +34,9 @@ class NextflowTowerOps(BaseOps):
 
     Class Variables:
         client_factory_class: The class for constructing clients.
+        launch_label: The label applied to workflow runs launched by orca.
+        max_workers: Maximum number of concurrent requests when
+            retrieving many workflow runs.
     """
 
     config: NextflowTowerConfig = field(default_factory=NextflowTowerConfig)
@@ -41,6 +47,8 @@ class NextflowTowerOps(BaseOps):
 
     launch_label: ClassVar[str] = "launched-by-orca"
 
+    max_workers: ClassVar[int] = 4
+
     @cached_property
     def workspace_id(self) -> int:
         """The currently active Nextflow Tower workspace ID."""
@@ -110,7 +118,7 @@ class NextflowTowerOps(BaseOps):
         label = self.client.create_label(name, self.workspace_id)
         return label.id
 
-    # TODO: Once get_workflow() is available, try to make idempotent
+    @idempotent(verify="is_reusable_workflow", skip_lookup="ignore_previous_runs")
     def launch_workflow(
         self,
         launch_info: LaunchInfo,
@@ -175,6 +183,26 @@ class NextflowTowerOps(BaseOps):
         logger.info(f"Launched a new workflow run: {workflow_repr}")
         return workflow_id
 
+    def is_reusable_workflow(self, workflow_id: str) -> bool:
+        """Check whether a previous workflow run can be reused.
+
+        Like with previous runs found by ``launch_workflow()``, ongoing,
+        succeeded and unknown runs can be reused whereas failed and
+        cancelled runs should be relaunched.
+
+        Args:
+            workflow_id: Workflow run ID.
+
+        Returns:
+            Whether the workflow run exists and can be reused.
+        """
+        try:
+            workflow = self.get_workflow(workflow_id)
+        except HTTPError:
+            return False
+        state = workflow.status.state
+        return not workflow.status.is_done or state in {"SUCCEEDED", "UNKNOWN"}
+
     def get_workflow(self, workflow_id: str) -> Workflow:
         """Retrieve details about a workflow run.
 
@@ -256,6 +284,31 @@ class NextflowTowerOps(BaseOps):
         sorted_runs = sorted(previous_runs, key=lambda x: x.get("submit"))
         return sorted_runs[-1]
 
+    def get_workflow_statuses(
+        self, run_ids: Iterable[str]
+    ) -> dict[str, WorkflowStatus]:
+        """Retrieve the status of many workflow runs at once.
+
+        Each workflow run is retrieved individually, so the number of
+        requests only depends on the given runs rather than on the size
+        of the workspace. At most ``max_workers`` requests are in flight
+        at once.
+
+        Args:
+            run_ids: Workflow run IDs.
+
+        Returns:
+            The status of each workflow run (keyed by run ID).
+        """
+        run_ids = list(run_ids)
+        # Resolve the workspace upfront rather than once per thread
+        self.workspace_id
+        with ThreadPoolExecutor(self.max_workers) as executor:
+            workflows = executor.map(self.get_workflow, run_ids)
+            return {
+                run_id: workflow.status for run_id, workflow in zip(run_ids, workflows)
+            }
+
     async def monitor_workflow(
         self, run_id: str, wait_time: int = 60 * 5
     ) -> WorkflowStatus:
@@ -0,0 +1,325 @@
+"""Transports for sending HTTP requests on behalf of the Tower client.
+
+A transport is responsible for sending a single HTTP request and
+returning the response. By default, ``NextflowTowerClient`` uses
+``RequestsTransport``, which sends live requests. The other
+transports enable offline and reproducible benchmarking:
+
+RecordingTransport:
+    Forward requests to another transport and record the
+    request/response pairs in a compact cassette file.
+ReplayTransport:
+    Replay the responses saved in a cassette file without any
+    network access, optionally with injected latency and errors.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import random
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from http import HTTPStatus
+from threading import Lock
+from typing import Any, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Response headers worth keeping in cassettes (others are discarded)
+RECORDED_HEADERS = {"content-type", "retry-after"}
+
+# Version of the cassette file format
+CASSETTE_VERSION = 1
+
+STATUS_CODES = {status.value for status in HTTPStatus}
+
+
+class Transport(ABC):
+    """Base class for sending HTTP requests."""
+
+    @abstractmethod
+    def send(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Send an HTTP request.
+
+        Args:
+            method: An HTTP method (GET, PUT, POST, or DELETE).
+            url: The full URL for the request.
+            **kwargs: Additional named arguments (as expected by
+                requests.request()).
+
+        Returns:
+            The raw Response object.
+        """
+
+
+class RequestsTransport(Transport):
+    """Send live HTTP requests using the ``requests`` package."""
+
+    def send(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Send an HTTP request.
+
+        Args:
+            method: An HTTP method (GET, PUT, POST, or DELETE).
+            url: The full URL for the request.
+            **kwargs: Additional named arguments passed through to
+                requests.request().
+
+        Returns:
+            The raw Response object.
+        """
+        return requests.request(method, url, **kwargs)
+
+
+def get_request_key(method: str, url: str, **kwargs: Any) -> str:
+    """Generate a key for matching requests across recording and replay.
+
+    The key ignores the host name and request headers (including
+    the authentication token), so cassettes don't contain secrets.
+
+    Args:
+        method: An HTTP method.
+        url: The full URL for the request.
+        **kwargs: Additional named arguments (as expected by
+            requests.request()).
+
+    Returns:
+        A string identifying the request.
+    """
+    parsed = urlsplit(url)
+    params = parse_qsl(parsed.query)
+    params += [(str(k), str(v)) for k, v in (kwargs.get("params") or {}).items()]
+    key = {
+        "method": method.upper(),
+        "path": parsed.path,
+        "params": sorted(params),
+        "json": kwargs.get("json"),
+    }
+    return json.dumps(key, sort_keys=True, separators=(",", ":"))
+
+
+def read_cassette(path: str) -> list[dict[str, Any]]:
+    """Read the interactions saved in a cassette file.
+
+    Args:
+        path: Cassette file path. Files ending with '.gz'
+            are decompressed automatically.
+
+    Returns:
+        List of interactions (in the order they were recorded).
+    """
+    opener: Any = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt") as file:
+        cassette = json.load(file)
+    return cassette["interactions"]
+
+
+def write_cassette(path: str, interactions: list[dict[str, Any]]) -> None:
+    """Write interactions to a cassette file.
+
+    Args:
+        path: Cassette file path. Files ending with '.gz'
+            are compressed automatically.
+        interactions: List of interactions.
+    """
+    opener: Any = gzip.open if path.endswith(".gz") else open
+    cassette = {"version": CASSETTE_VERSION, "interactions": interactions}
+    with opener(path, "wt") as file:
+        json.dump(cassette, file, separators=(",", ":"))
+        file.write("\n")
+
+
+def build_response(
+    url: str, status: int, body: str, headers: Optional[dict[str, str]] = None
+) -> requests.Response:
+    """Build a Response object without making a request.
+
+    Args:
+        url: The full URL for the request.
+        status: HTTP status code.
+        body: Response body.
+        headers: Response headers.
+
+    Returns:
+        The raw Response object.
+    """
+    response = requests.Response()
+    response.status_code = status
+    response.reason = HTTPStatus(status).phrase if status in STATUS_CODES else ""
+    response.url = url
+    response.headers = CaseInsensitiveDict(headers or {})
+    response._content = body.encode()
+    response.encoding = "utf-8"
+    return response
+
+
+class RecordingTransport(Transport):
+    """Record request/response pairs while forwarding requests.
+
+    Interactions are saved when ``save()`` is called or when used
+    as a context manager.
+    """
+
+    def __init__(self, path: str, transport: Optional[Transport] = None):
+        """Construct a recording transport.
+
+        Args:
+            path: Output cassette file path.
+            transport: Transport for sending requests. Defaults to
+                sending live requests.
+        """
+        self.path = path
+        self.transport = transport or RequestsTransport()
+        self.interactions: list[dict[str, Any]] = list()
+        self._lock = Lock()
+
+    def send(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Send an HTTP request and record the interaction.
+
+        Args:
+            method: An HTTP method (GET, PUT, POST, or DELETE).
+            url: The full URL for the request.
+            **kwargs: Additional named arguments (as expected by
+                requests.request()).
+
+        Returns:
+            The raw Response object.
+        """
+        start_time = time.perf_counter()
+        response = self.transport.send(method, url, **kwargs)
+        latency = time.perf_counter() - start_time
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name.lower() in RECORDED_HEADERS
+        }
+        interaction = {
+            "key": get_request_key(method, url, **kwargs),
+            "status": response.status_code,
+            "headers": headers,
+            "body": response.text,
+            "latency": round(latency, 6),
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+        return response
+
+    def save(self) -> None:
+        """Write the recorded interactions to the cassette file."""
+        with self._lock:
+            write_cassette(self.path, self.interactions)
+
+    def __enter__(self) -> RecordingTransport:
+        """Start recording.
+
+        Returns:
+            This transport.
+        """
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Save the recorded interactions.
+
+        Args:
+            *args: Exception details (ignored).
+        """
+        self.save()
+
+
+class ReplayTransport(Transport):
+    """Replay responses from a cassette file deterministically.
+
+    Responses to identical requests are replayed in the order that
+    they were recorded. Once they are exhausted, the last response
+    is repeated, which is useful for polling (e.g., monitoring).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        latency: Optional[float] = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int = 0,
+    ):
+        """Construct a replay transport.
+
+        Args:
+            path: Input cassette file path.
+            latency: Number of seconds to wait before each response.
+                Use ``None`` to replay the latencies that were
+                recorded. Defaults to zero (no waiting).
+            error_rate: Fraction of requests that are answered with
+                an injected error response. Defaults to zero.
+            error_status: HTTP status code for injected errors.
+            seed: Seed for the random number generator used for
+                injecting errors, which ensures reproducibility.
+        """
+        self.path = path
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.seed = seed
+        self.interactions = read_cassette(path)
+        self.reset()
+
+    def reset(self) -> None:
+        """Rewind the cassette to replay from the beginning."""
+        self._random = random.Random(self.seed)
+        self._queues: dict[str, deque] = defaultdict(deque)
+        for interaction in self.interactions:
+            self._queues[interaction["key"]].append(interaction)
+        self._lock = Lock()
+
+    def next_interaction(self, key: str) -> dict[str, Any]:
+        """Retrieve the next interaction for a given request.
+
+        Args:
+            key: Request key (see ``get_request_key()``).
+
+        Raises:
+            LookupError: If the request wasn't recorded.
+
+        Returns:
+            Recorded interaction.
+        """
+        with self._lock:
+            queue = self._queues.get(key)
+            if not queue:
+                message = f"Request not found in cassette ({self.path}): {key}"
+                raise LookupError(message)
+            return queue.popleft() if len(queue) > 1 else queue[0]
+
+    def send(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Replay the recorded response for an HTTP request.
+
+        Args:
+            method: An HTTP method (GET, PUT, POST, or DELETE).
+            url: The full URL for the request.
+            **kwargs: Additional named arguments (as expected by
+                requests.request()).
+
+        Returns:
+            The raw Response object.
+        """
+        key = get_request_key(method, url, **kwargs)
+        with self._lock:
+            is_error = self._random.random() < self.error_rate
+        interaction: dict[str, Any]
+        if is_error:
+            interaction = {"status": self.error_status, "headers": {}, "body": ""}
+        else:
+            interaction = self.next_interaction(key)
+
+        latency = self.latency
+        if latency is None:
+            latency = interaction.get("latency", 0.0)
+        if latency:
+            time.sleep(latency)
+
+        return build_response(
+            url, interaction["status"], interaction["body"], interaction["headers"]
+        )
@@ -4,6 +4,12 @@ from typing import Any, TypeVar
 
 T = TypeVar("T", int, str)
 
+# Path segments that are followed by an identifier (e.g., '/workflow/{id}')
+ID_PARENT_SEGMENTS = {"compute-envs", "log", "user", "workflow"}
+
+# Path segments that look like identifiers but are fixed API routes
+RESERVED_SEGMENTS = {"launch"}
+
 
 def parse_datetime(text: str) -> datetime:
     """Parse Tower datetime strings (RFC 3339).
@@ -19,15 +25,19 @@ def parse_datetime(text: str) -> datetime:
     return parsed
 
 
-def dedup(items: Collection[T]) -> list[T]:
+def dedup(items: Collection[T], stable: bool = False) -> list[T]:
     """Deduplicate items in a collection.
 
     Args:
         items: Collection of items.
+        stable: Whether to preserve the order in which items first
+            appear. Defaults to False (arbitrary order).
 
     Returns:
         Deduplicated collection or None.
     """
+    if stable:
+        return list(dict.fromkeys(items))
     return list(set(items))
 
 
@@ -80,3 +90,29 @@ def get_nested(dictionary: dict[str, Any], keys: str) -> Any:
             raise ValueError(message)
         target = target[api_name_part]
     return target
+
+
+def template_path(path: str) -> str:
+    """Replace identifiers in an API path with placeholders.
+
+    This is useful for grouping requests by endpoint rather than
+    by individual resource (e.g., for metrics and tracing).
+
+    Args:
+        path: The API path with the parameters filled in
+            (e.g., '/workflow/123abc/tasks').
+
+    Returns:
+        The API path with placeholders (e.g., '/workflow/{id}/tasks').
+    """
+    segments = path.split("/")
+    templated = list()
+    previous = None
+    for segment in segments:
+        is_child = previous in ID_PARENT_SEGMENTS
+        if segment and (is_child or segment.isdigit()):
+            if segment not in RESERVED_SEGMENTS:
+                segment = "{id}"
+        templated.append(segment)
+        previous = segment
+    return "/".join(templated)
@@ -1,13 +1,33 @@
 """Submodule for SevenBridges platforms (like Cavatica and CGC)."""
 
-from orca.services.sevenbridges.client_factory import SevenBridgesClientFactory
-from orca.services.sevenbridges.config import SevenBridgesConfig
-from orca.services.sevenbridges.hook import SevenBridgesHook
-from orca.services.sevenbridges.ops import SevenBridgesOps
+from typing import TYPE_CHECKING
+
+from orca.lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from orca.services.sevenbridges.client_factory import SevenBridgesClientFactory
+    from orca.services.sevenbridges.config import SevenBridgesConfig
+    from orca.services.sevenbridges.hook import SevenBridgesHook
+    from orca.services.sevenbridges.ops import SevenBridgesOps
+    from orca.services.sevenbridges.trigger import SevenBridgesTaskTrigger
+
+# Attributes are imported from their submodule on first access to
+# avoid loading the dependencies of unused classes (see `orca.lazy`)
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "SevenBridgesClientFactory": "client_factory",
+        "SevenBridgesConfig": "config",
+        "SevenBridgesHook": "hook",
+        "SevenBridgesOps": "ops",
+        "SevenBridgesTaskTrigger": "trigger",
+    },
+)
 
 __all__ = [
     "SevenBridgesConfig",
     "SevenBridgesClientFactory",
     "SevenBridgesOps",
     "SevenBridgesHook",
+    "SevenBridgesTaskTrigger",
 ]
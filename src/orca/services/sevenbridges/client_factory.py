@@ -23,6 +23,9 @@ class SevenBridgesClientFactory(BaseClientFactory):
         maintenance_sleeper: Pause execution while the SevenBridges
             API is in maintenance mode.
 
+    The HTTP connection pool is sized using the ``pool_size`` setting
+    so that concurrent requests from batch operations reuse connections.
+
     Attributes:
         config: Configuration object for this service.
 
@@ -57,11 +60,16 @@ class SevenBridgesClientFactory(BaseClientFactory):
 
         default_handlers = [rate_limit_sleeper, maintenance_sleeper]
         kwargs.setdefault("error_handlers", default_handlers)
+        kwargs.setdefault("pool_maxsize", self.config.pool_size)
+        kwargs.setdefault("advance_access", self.config.advance_access)
 
         kwargs["url"] = api_endpoint.rstrip("/")
         kwargs["token"] = auth_token
 
-        return Api(**kwargs)
+        client = Api(**kwargs)
+        if not self.config.trust_env:
+            client.session.trust_env = False
+        return client
 
     @staticmethod
     def test_client_request(client: Api) -> None:
@@ -9,7 +9,7 @@ from pydantic.dataclasses import dataclass
 from orca.services.base import BaseConfig
 
 if TYPE_CHECKING:
-    from airflow.models.connection import Connection
+    from orca.services.base.config import AnyConnection
 
 
 API_ENDPOINTS = {
@@ -31,7 +31,17 @@ class SevenBridgesConfig(BaseConfig):
             by the ``api_endpoints`` value.
         project: A SevenBridges project name (prefixed by username).
         client_kwargs: Keyword arguments for the SevenBridges Api class
-            in the form of a dictionary.
+            in the form of a dictionary. These take precedence over
+            the client settings below.
+        pool_size: Maximum number of pooled HTTP connections, which
+            should be at least ``max_workers`` to avoid blocking.
+            Defaults to the SevenBridges client default (100).
+        max_workers: Number of threads used for concurrent requests
+            in batch operations.
+        advance_access: Whether to enable Advance Access API features.
+        trust_env: Whether to look up proxy settings and credentials
+            from the environment for every request. Disabling this
+            skips these lookups when there is no proxy.
 
     Class Variables:
         connection_env_var: The name of the environment variable whose
@@ -42,6 +52,10 @@ class SevenBridgesConfig(BaseConfig):
     auth_token: Optional[str] = None
     project: Optional[str] = None
     client_kwargs: dict[str, Any] = field(default_factory=dict)
+    pool_size: int = 100
+    max_workers: int = 8
+    advance_access: bool = False
+    trust_env: bool = True
 
     connection_env_var = "SEVENBRIDGES_CONNECTION_URI"
 
@@ -64,11 +78,11 @@ class SevenBridgesConfig(BaseConfig):
         return value
 
     @classmethod
-    def parse_connection(cls, connection: Connection) -> dict[str, Any]:
+    def parse_connection(cls, connection: AnyConnection) -> dict[str, Any]:
         """Parse Airflow connection as arguments for this configuration.
 
         Args:
-            connection: An Airflow connection object.
+            connection: An Airflow (or lightweight) connection object.
 
         Returns:
             Keyword arguments for this configuration.
@@ -84,4 +98,7 @@ class SevenBridgesConfig(BaseConfig):
             "auth_token": connection.password,
             "project": connection.extra_dejson.get("project"),
         }
+        for name in ["pool_size", "max_workers", "advance_access", "trust_env"]:
+            if name in connection.extra_dejson:
+                kwargs[name] = connection.extra_dejson[name]
         return kwargs
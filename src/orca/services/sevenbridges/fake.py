@@ -0,0 +1,197 @@
+"""Local stand-in for SevenBridges project file storage.
+
+``FakeStorage`` stores project files in a local directory (with one
+subdirectory per project), which allows file transfers to be tested
+offline. It can also simulate interrupted downloads and uploads.
+
+Example:
+    Stage files in a fake project::
+
+        ops = SevenBridgesOps(config)
+        ops.storage = FakeStorage("/tmp/fake-storage")
+        ops.upload_files(["sample1.fastq.gz", "sample2.fastq.gz"])
+"""
+
+from __future__ import annotations
+
+import os
+from itertools import count
+from threading import Lock
+from typing import Iterator, Optional
+
+from orca.services.base.transfer import CHUNK_SIZE
+from orca.services.sevenbridges.models import RemoteFile
+from orca.services.sevenbridges.storage import FileStorage
+
+
+class FakeStorage(FileStorage):
+    """File storage backed by a local directory."""
+
+    def __init__(
+        self,
+        root: str,
+        chunk_size: int = CHUNK_SIZE,
+        fail_after: Optional[int] = None,
+        fail_after_parts: Optional[int] = None,
+    ):
+        """Construct a fake storage backend.
+
+        Args:
+            root: Local directory for storing project files.
+            chunk_size: Number of bytes per streamed chunk.
+            fail_after: Number of bytes that can be read before every
+                subsequent read fails with a ``ConnectionError``.
+                Defaults to None (no failures).
+            fail_after_parts: Number of parts that can be uploaded before
+                every subsequent part upload fails with a
+                ``ConnectionError``. Defaults to None (no failures).
+        """
+        self.root = root
+        self.chunk_size = chunk_size
+        self.fail_after = fail_after
+        self.fail_after_parts = fail_after_parts
+        self.bytes_read = 0
+        self.num_parts = 0
+        self.num_uploads = 0
+        self._uploads: dict[str, dict] = dict()
+        self._checksums: dict[str, str] = dict()
+        self._upload_ids = count(1)
+        self._lock = Lock()
+
+    def get_path(self, project: str, name: str) -> str:
+        """Determine the local path of a project file.
+
+        Args:
+            project: Project ID.
+            name: File name.
+
+        Returns:
+            Local file path.
+        """
+        return os.path.join(self.root, project, name)
+
+    def list_files(self, project: str) -> list[RemoteFile]:
+        """List the files in a project.
+
+        Args:
+            project: Project ID.
+
+        Returns:
+            Files in the project.
+        """
+        directory = os.path.join(self.root, project)
+        if not os.path.isdir(directory):
+            return []
+        files = list()
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            size = os.path.getsize(path)
+            file_id = f"{project}/{name}"
+            md5 = self._checksums.get(file_id)
+            files.append(RemoteFile(file_id, name, size, md5))
+        return files
+
+    def read_range(self, remote: RemoteFile, start: int, end: int) -> Iterator[bytes]:
+        """Stream a range of bytes from a project file.
+
+        Args:
+            remote: Remote file.
+            start: Offset of the first byte.
+            end: Offset after the last byte.
+
+        Raises:
+            ConnectionError: If the simulated failure threshold is reached.
+
+        Yields:
+            Chunks of the file contents.
+        """
+        with open(os.path.join(self.root, remote.id), "rb") as file:
+            file.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                with self._lock:
+                    if (
+                        self.fail_after is not None
+                        and self.bytes_read >= self.fail_after
+                    ):
+                        raise ConnectionError("Simulated connection failure")
+                chunk = file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                with self._lock:
+                    self.bytes_read += len(chunk)
+                remaining -= len(chunk)
+                yield chunk
+
+    def start_upload(
+        self, project: str, name: str, size: int, part_size: int, overwrite: bool
+    ) -> tuple[str, int]:
+        """Start a multipart upload to a project.
+
+        Args:
+            project: Project ID.
+            name: Remote file name.
+            size: File size in bytes.
+            part_size: Requested number of bytes per part.
+            overwrite: Whether to overwrite an existing remote file.
+
+        Raises:
+            FileExistsError: If the file exists and overwrite is disabled.
+
+        Returns:
+            Upload ID and the number of bytes per part.
+        """
+        if os.path.exists(self.get_path(project, name)) and not overwrite:
+            raise FileExistsError(f"File already exists ({name}).")
+        with self._lock:
+            upload_id = f"upload-{next(self._upload_ids)}"
+            upload = {"project": project, "name": name, "parts": dict()}
+            self._uploads[upload_id] = upload
+        return upload_id, part_size
+
+    def is_upload_active(self, upload_id: str) -> bool:
+        """Check whether a multipart upload can still be resumed.
+
+        Args:
+            upload_id: Upload ID.
+
+        Returns:
+            Whether the upload is still active.
+        """
+        return upload_id in self._uploads
+
+    def upload_part(self, upload_id: str, number: int, data: bytes) -> None:
+        """Store a part of a multipart upload in memory.
+
+        Args:
+            upload_id: Upload ID.
+            number: Part number (starting at 1).
+            data: Part contents.
+
+        Raises:
+            ConnectionError: If the simulated failure threshold is reached.
+        """
+        with self._lock:
+            limit = self.fail_after_parts
+            if limit is not None and self.num_parts >= limit:
+                raise ConnectionError("Simulated connection failure")
+            self._uploads[upload_id]["parts"][number] = data
+            self.num_parts += 1
+
+    def complete_upload(self, upload_id: str, md5: str) -> None:
+        """Assemble the parts of a multipart upload into a project file.
+
+        Args:
+            upload_id: Upload ID.
+            md5: MD5 checksum of the uploaded file.
+        """
+        with self._lock:
+            upload = self._uploads.pop(upload_id)
+        destination = self.get_path(upload["project"], upload["name"])
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        with open(destination, "wb") as file:
+            for number in sorted(upload["parts"]):
+                file.write(upload["parts"][number])
+        with self._lock:
+            self._checksums[f"{upload['project']}/{upload['name']}"] = md5
+            self.num_uploads += 1
@@ -0,0 +1,87 @@
+"""Local index of SevenBridges tasks by name."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import datetime
+from threading import Lock
+from typing import Any, Iterable, Optional
+
+
+class TaskNameIndex:
+    """Name-to-ID index for the tasks in a SevenBridges project.
+
+    The SevenBridges API cannot filter tasks by name, so finding a task
+    by name normally requires listing every task in the project. This
+    index is built once and then refreshed incrementally by only listing
+    the tasks created since the latest task that was listed (i.e., the
+    watermark), which is typically a single page of results. Deleted or
+    renamed tasks aren't listed by refreshes, so matches should be
+    verified before they're used (see ``SevenBridgesOps.lookup_tasks``).
+
+    Attributes:
+        apps: Mapping from task names to the app of each task
+            (keyed by task ID).
+        watermark: Creation time of the latest listed task.
+    """
+
+    def __init__(self) -> None:
+        """Construct an empty index."""
+        self.apps: dict[str, dict[str, str]] = defaultdict(dict)
+        self.watermark: Optional[datetime] = None
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        """Number of indexed tasks."""
+        return sum(len(apps) for apps in self.apps.values())
+
+    def add(self, task: Any) -> None:
+        """Add (or update) a task in the index without moving the watermark.
+
+        This is meant for tasks created by this process, which doesn't
+        guarantee that other tasks created before them were indexed.
+        Hence, only listings can move the watermark (see ``update()``).
+
+        Args:
+            task: SevenBridges task (or any object with the ``id``,
+                ``name`` and ``app`` attributes).
+        """
+        with self._lock:
+            self.apps[task.name][task.id] = task.app
+
+    def update(self, tasks: Iterable[Any]) -> None:
+        """Add (or update) the tasks listed since the watermark.
+
+        The watermark is moved to the creation time of the latest
+        listed task, so the listing must include every task created
+        since the previous watermark.
+
+        Args:
+            tasks: SevenBridges tasks (or any objects with the ``id``,
+                ``name``, ``app`` and ``created_time`` attributes).
+        """
+        for task in tasks:
+            self.add(task)
+            created_time = getattr(task, "created_time", None)
+            if isinstance(created_time, datetime):
+                with self._lock:
+                    if self.watermark is None or created_time > self.watermark:
+                        self.watermark = created_time
+
+    def lookup(self, name: str) -> dict[str, str]:
+        """Find the indexed tasks with a given name.
+
+        Args:
+            name: Task name.
+
+        Returns:
+            Mapping from task IDs to apps for the matching tasks.
+        """
+        with self._lock:
+            return dict(self.apps.get(name, {}))
+
+    def clear(self) -> None:
+        """Remove all tasks from the index."""
+        with self._lock:
+            self.apps.clear()
+            self.watermark = None
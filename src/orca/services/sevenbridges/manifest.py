@@ -0,0 +1,204 @@
+"""Manifests of the files output by SevenBridges tasks.
+
+Manifest rows are written in batches as soon as they are available,
+so memory usage doesn't depend on the number of tasks.
+"""
+
+from __future__ import annotations
+
+import csv
+import os
+from abc import ABC, abstractmethod
+from dataclasses import astuple
+from typing import Any, Iterable, Iterator, Optional
+
+from sevenbridges import File
+
+from orca.errors import ConfigError
+from orca.services.sevenbridges.models import OutputFile
+
+MANIFEST_COLUMNS = ("task_id", "port", "file_id", "file_name", "size")
+
+
+def iter_output_files(task: Any) -> Iterator[OutputFile]:
+    """Iterate over the files referenced by the outputs of a task.
+
+    Lists and records (i.e., dictionaries) of files are flattened,
+    whereas non-file outputs (e.g., strings, numbers) are ignored.
+    Files nested in records are still in their raw (CWL) form since
+    the SevenBridges client only converts top-level files.
+
+    Args:
+        task: SevenBridges task.
+
+    Yields:
+        Files referenced by the task outputs.
+    """
+
+    def flatten(port: str, value: Any) -> Iterator[OutputFile]:
+        if isinstance(value, File):
+            yield OutputFile(task.id, port, value.id, value.name, value.size)
+        elif isinstance(value, dict) and value.get("class") == "File":
+            name = value.get("basename", value.get("name"))
+            yield OutputFile(task.id, port, value["path"], name, value.get("size"))
+        elif isinstance(value, list):
+            for item in value:
+                yield from flatten(port, item)
+        elif isinstance(value, dict):
+            for item in value.values():
+                yield from flatten(port, item)
+
+    outputs = task.outputs or dict()
+    for port in outputs:
+        yield from flatten(port, outputs[port])
+
+
+class ManifestWriter(ABC):
+    """Base class for writing manifests in batches of rows."""
+
+    def __init__(self, path: str) -> None:
+        """Open a manifest for writing.
+
+        Args:
+            path: Local file path.
+        """
+        self.path = path
+
+    def __enter__(self) -> ManifestWriter:
+        """Use the manifest writer as a context manager.
+
+        Returns:
+            The manifest writer itself.
+        """
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Close the manifest when exiting the context.
+
+        Args:
+            *args: Exception details (if any), which are ignored.
+        """
+        self.close()
+
+    @abstractmethod
+    def write(self, rows: Iterable[OutputFile]) -> None:
+        """Write a batch of rows to the manifest.
+
+        Args:
+            rows: Manifest rows.
+        """
+
+    @abstractmethod
+    def close(self) -> None:
+        """Flush any buffered rows and close the manifest."""
+
+
+class CsvManifestWriter(ManifestWriter):
+    """Manifest writer for CSV files."""
+
+    def __init__(self, path: str) -> None:
+        """Open a CSV manifest and write its header.
+
+        Args:
+            path: Local file path.
+        """
+        super().__init__(path)
+        self._file = open(path, "w", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(MANIFEST_COLUMNS)
+
+    def write(self, rows: Iterable[OutputFile]) -> None:
+        """Append a batch of rows to the CSV file.
+
+        Args:
+            rows: Manifest rows.
+        """
+        self._writer.writerows(astuple(row) for row in rows)
+
+    def close(self) -> None:
+        """Close the CSV file."""
+        self._file.close()
+
+
+class ParquetManifestWriter(ManifestWriter):
+    """Manifest writer for Parquet files.
+
+    Each batch of rows is written as a separate row group. This
+    writer requires the optional ``pyarrow`` package.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Open a Parquet manifest with the manifest schema.
+
+        Args:
+            path: Local file path.
+
+        Raises:
+            ConfigError: If the ``pyarrow`` package isn't installed.
+        """
+        super().__init__(path)
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as error:
+            message = "The 'pyarrow' package is required to write Parquet files."
+            raise ConfigError(message) from error
+        self._pa = pa
+        self._schema = pa.schema(
+            [
+                ("task_id", pa.string()),
+                ("port", pa.string()),
+                ("file_id", pa.string()),
+                ("file_name", pa.string()),
+                ("size", pa.int64()),
+            ]
+        )
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, rows: Iterable[OutputFile]) -> None:
+        """Write a batch of rows as a row group (unless it's empty).
+
+        Args:
+            rows: Manifest rows.
+        """
+        columns: list[list] = [[] for _ in MANIFEST_COLUMNS]
+        for row in rows:
+            for column, value in zip(columns, astuple(row)):
+                column.append(value)
+        if columns[0]:
+            table = self._pa.Table.from_arrays(columns, schema=self._schema)
+            self._writer.write_table(table)
+
+    def close(self) -> None:
+        """Write the Parquet footer and close the file."""
+        self._writer.close()
+
+
+MANIFEST_WRITERS: dict[str, type[ManifestWriter]] = {
+    "csv": CsvManifestWriter,
+    "parquet": ParquetManifestWriter,
+}
+
+
+def open_manifest(path: str, format: Optional[str] = None) -> ManifestWriter:
+    """Open a manifest writer for the given file format.
+
+    Args:
+        path: Local file path.
+        format: File format (``csv`` or ``parquet``). Defaults to None,
+            in which case it is inferred from the file extension.
+
+    Raises:
+        ConfigError: If the file format isn't supported.
+
+    Returns:
+        Manifest writer.
+    """
+    if format is None:
+        format = os.path.splitext(path)[1].lstrip(".")
+    writer_class = MANIFEST_WRITERS.get(format.lower())
+    if writer_class is None:
+        supported = ", ".join(MANIFEST_WRITERS)
+        message = f"Unsupported manifest format ({format}). Choose from: {supported}."
+        raise ConfigError(message)
+    return writer_class(path)
@@ -1,3 +1,6 @@
+from enum import Enum
+from typing import Any, Optional
+
 from pydantic import validator
 from pydantic.dataclasses import dataclass
 from sevenbridges.models.enums import TaskStatus as TaskState
@@ -21,3 +24,87 @@ class TaskStatus:
     def is_done(self) -> bool:
         """Whether the workflow is done irrespective of success."""
         return self.state in TaskState.terminal_states
+
+
+@dataclass(kw_only=False)
+class TaskStatusResult:
+    """Result of retrieving a task status as part of a batch.
+
+    Attributes:
+        status: Task status (unless the task couldn't be retrieved).
+        error: Error message (if the task couldn't be retrieved).
+    """
+
+    status: Optional[TaskStatus] = None
+    error: Optional[str] = None
+
+
+@dataclass(kw_only=False)
+class TaskSpec:
+    """Specification for drafting a task (workflow run)."""
+
+    name: str
+    app_id: str
+    inputs: dict[str, Any]
+
+
+class TaskOutcome(str, Enum):
+    """Outcome of creating a task as part of a batch."""
+
+    LAUNCHED = "LAUNCHED"
+    SKIPPED = "SKIPPED"
+    FAILED = "FAILED"
+
+
+@dataclass(kw_only=False)
+class TaskResult:
+    """Result of creating a task as part of a batch.
+
+    Attributes:
+        name: Task name.
+        outcome: Whether the task was launched, skipped because it was
+            already launched, or failed to be drafted or launched.
+        task_id: Task ID (unless the task couldn't be drafted).
+        error: Error message (if the outcome is a failure).
+    """
+
+    name: str
+    outcome: TaskOutcome
+    task_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass(kw_only=False)
+class RemoteFile:
+    """File stored in a SevenBridges project.
+
+    Attributes:
+        id: File ID.
+        name: File name.
+        size: File size in bytes.
+        md5: MD5 checksum (if known).
+    """
+
+    id: str
+    name: str
+    size: int
+    md5: Optional[str] = None
+
+
+@dataclass(kw_only=False)
+class OutputFile:
+    """File referenced by a task output.
+
+    Attributes:
+        task_id: Task ID.
+        port: Output port (i.e., output ID).
+        file_id: File ID.
+        file_name: File name.
+        size: File size in bytes (if known).
+    """
+
+    task_id: str
+    port: str
+    file_id: str
+    file_name: Optional[str] = None
+    size: Optional[int] = None
@@ -1,16 +1,44 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from dataclasses import field
 from functools import cached_property
-from typing import Any, Optional, cast
+from itertools import islice
+from typing import Any, ClassVar, Iterable, Optional, cast
 
 from pydantic.dataclasses import dataclass
+from sevenbridges.errors import NotFound
+from sevenbridges.meta.collection import Collection
 
-from orca.errors import ConfigError, UnexpectedMatchError
+from orca.errors import ClientRequestError, ConfigError, UnexpectedMatchError
+from orca.services.base.idempotency import idempotent
 from orca.services.base.ops import BaseOps
+from orca.services.base.transfer import TransferOutcome, TransferResult, is_same_file
 from orca.services.sevenbridges.client_factory import SevenBridgesClientFactory
 from orca.services.sevenbridges.config import SevenBridgesConfig
-from orca.services.sevenbridges.models import TaskStatus
+from orca.services.sevenbridges.index import TaskNameIndex
+from orca.services.sevenbridges.manifest import iter_output_files, open_manifest
+from orca.services.sevenbridges.models import (
+    OutputFile,
+    TaskOutcome,
+    TaskResult,
+    TaskSpec,
+    TaskStatus,
+    TaskStatusResult,
+)
+from orca.services.sevenbridges.storage import (
+    FileStorage,
+    ResumableDownload,
+    ResumableTransfer,
+    ResumableUpload,
+    SevenBridgesStorage,
+)
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass(kw_only=False)
@@ -22,12 +50,20 @@ class SevenBridgesOps(BaseOps):
 
     Class Variables:
         client_factory_class: The class for constructing clients.
+        page_limit: Maximum number of items per page when listing
+            resources (the API maximum is 100).
+        bulk_limit: Maximum number of items per bulk request
+            (the API maximum is 100).
     """
 
     config: SevenBridgesConfig = field(default_factory=SevenBridgesConfig)
 
     client_factory_class = SevenBridgesClientFactory
 
+    page_limit: ClassVar[int] = 100
+
+    bulk_limit: ClassVar[int] = 100
+
     @cached_property
     def project(self) -> str:
         """The currently active SevenBridges project."""
@@ -36,9 +72,124 @@ class SevenBridgesOps(BaseOps):
             raise ConfigError(message)
         return self.config.project
 
+    def __enter__(self) -> SevenBridgesOps:
+        """Use the ops object as a context manager.
+
+        Returns:
+            This ops object, which is closed when exiting the context.
+        """
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Close the ops object when exiting the context.
+
+        Args:
+            *args: Exception details (ignored).
+        """
+        self.close()
+
+    @cached_property
+    def executor(self) -> ThreadPoolExecutor:
+        """Thread pool shared by batch operations for concurrent requests."""
+        max_workers = self.config.max_workers
+        return ThreadPoolExecutor(max_workers, thread_name_prefix="orca-sbg")
+
+    def close(self) -> None:
+        """Shut down the thread pool used for concurrent requests.
+
+        The thread pool is created again if another batch operation
+        is performed afterwards.
+        """
+        executor = vars(self).pop("executor", None)
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    @cached_property
+    def storage(self) -> FileStorage:
+        """Storage backend for transferring project files."""
+        return SevenBridgesStorage(self.client)
+
+    @cached_property
+    def task_index(self) -> TaskNameIndex:
+        """Name-to-ID index for the tasks in the active project."""
+        return TaskNameIndex()
+
+    def refresh_task_index(self, full: bool = False) -> None:
+        """Index the tasks created since the last refresh.
+
+        Args:
+            full: Whether to rebuild the index from scratch by listing
+                all tasks in the project. Defaults to False.
+        """
+        if full:
+            self.task_index.clear()
+        kwargs: dict[str, Any] = {"project": self.project, "limit": self.page_limit}
+        if self.task_index.watermark is not None:
+            # The lower bound is inclusive, so the latest task is listed again
+            kwargs["created_from"] = self.task_index.watermark
+        tasks = self.client.tasks.query(**kwargs)
+        if isinstance(tasks, Collection):
+            tasks = tasks.all()
+        self.task_index.update(tasks)
+
+    def find_stale_tasks(self, names: dict[str, str]) -> set[str]:
+        """Find indexed tasks that were deleted or renamed since indexing.
+
+        The tasks are retrieved using bulk requests, which are sent
+        concurrently using the shared executor.
+
+        Args:
+            names: Indexed name of each task (keyed by task ID).
+
+        Returns:
+            IDs of the tasks that couldn't be retrieved or whose names
+            changed.
+        """
+        task_ids = list(names)
+        limit = self.bulk_limit
+        chunks = [task_ids[i : i + limit] for i in range(0, len(task_ids), limit)]
+        all_records = self.executor.map(self.client.tasks.bulk_get, chunks)
+        stale = set()
+        for chunk, records in zip(chunks, all_records):
+            for task_id, record in zip(chunk, records):
+                if not record.valid or record.resource.name != names[task_id]:
+                    stale.add(task_id)
+        return stale
+
+    def lookup_tasks(self, names: Iterable[str]) -> dict[str, dict[str, str]]:
+        """Find the tasks with some names using the task index.
+
+        The index is refreshed with the tasks created since the previous
+        lookup. The matching tasks are then checked against the API since
+        deleted or renamed tasks aren't listed by refreshes. If any match
+        is stale, the index is rebuilt from a full listing.
+
+        Args:
+            names: Task names.
+
+        Returns:
+            Mapping from task IDs to apps for the matching tasks (keyed
+            by task name).
+        """
+        names = list(names)
+        self.refresh_task_index()
+        matches = {name: self.task_index.lookup(name) for name in names}
+        indexed_names = {
+            task_id: name for name, tasks in matches.items() for task_id in tasks
+        }
+        if indexed_names and self.find_stale_tasks(indexed_names):
+            logger.info("Rebuilding the task index since some tasks changed.")
+            self.refresh_task_index(full=True)
+            matches = {name: self.task_index.lookup(name) for name in names}
+        return matches
+
     def get_task(self, name: str, app_id: str) -> Optional[str]:
         """Retrieve a task ID based on some filters.
 
+        The task is looked up in a local index, which is refreshed
+        with the tasks that were created since the previous lookup
+        (see ``lookup_tasks``).
+
         Args:
             name: Task name.
             app_id: App ID.
@@ -50,8 +201,7 @@ class SevenBridgesOps(BaseOps):
         Returns:
             The matching task ID or `None` if no matches were found.
         """
-        project_matches = self.client.tasks.query(project=self.project)
-        name_matches = [task for task in project_matches if task.name == name]
+        name_matches = self.lookup_tasks([name])[name]
 
         if len(name_matches) == 0:
             return None
@@ -59,17 +209,33 @@ class SevenBridgesOps(BaseOps):
             message = f"Found many tasks ({name_matches}) with given name ({name})."
             raise UnexpectedMatchError(message)
         else:
-            task = name_matches[0]
+            task_id, task_app = name_matches.popitem()
 
-        if app_id not in task.app:
+        if app_id not in task_app:
             message = (
-                f"Found task ({task.id}) with given name ({name}), but its app "
-                f"({task.app}) doesn't match what's expected ({app_id})."
+                f"Found task ({task_id}) with given name ({name}), but its app "
+                f"({task_app}) doesn't match what's expected ({app_id})."
             )
             raise UnexpectedMatchError(message)
 
-        return task.id
+        return task_id
+
+    def task_exists(self, task_id: str) -> bool:
+        """Check whether a task exists.
 
+        Args:
+            task_id: Task ID.
+
+        Returns:
+            Whether the task exists.
+        """
+        try:
+            self.client.tasks.get(task_id)
+        except NotFound:
+            return False
+        return True
+
+    @idempotent(verify="task_exists")
     def draft_task(self, name: str, app_id: str, inputs: dict[str, Any]) -> str:
         """Draft a task (workflow run) if need be.
 
@@ -90,6 +256,7 @@ class SevenBridgesOps(BaseOps):
 
         # Note that `create()` does not launch by default (run=False)
         task = self.client.tasks.create(name, self.project, app_id, inputs=inputs)
+        self.task_index.add(task)
         task_id = cast(str, task.id)
         return task_id
 
@@ -120,6 +287,89 @@ class SevenBridgesOps(BaseOps):
         task_id = self.draft_task(name, app_id, inputs)
         return self.launch_task(task_id)
 
+    def create_tasks(
+        self, specs: Iterable[TaskSpec | tuple[str, str, dict[str, Any]]]
+    ) -> list[TaskResult]:
+        """Draft and launch many tasks (workflow runs) if need be.
+
+        Existing tasks are found with a single refresh of the task index
+        and their statuses are retrieved in bulk. Only the missing tasks
+        are drafted and only the draft tasks are launched, with up to
+        ``config.max_workers`` tasks being drafted or launched concurrently
+        using the shared ``executor``. Errors are reported per task rather
+        than raised.
+
+        Args:
+            specs: Task specifications or (name, app_id, inputs) tuples.
+
+        Returns:
+            The result for each task (in the same order as the input).
+        """
+        task_specs = [
+            spec if isinstance(spec, TaskSpec) else TaskSpec(*spec) for spec in specs
+        ]
+        results: list[Optional[TaskResult]] = [None] * len(task_specs)
+        all_matches = self.lookup_tasks({spec.name for spec in task_specs})
+
+        # Find existing tasks (and flag invalid specifications)
+        existing: dict[int, str] = dict()
+        names = set()
+        for index, spec in enumerate(task_specs):
+            matches = all_matches[spec.name]
+            error = None
+            if spec.name in names:
+                error = f"Task name ({spec.name}) is repeated in the batch."
+            elif len(matches) > 1:
+                error = f"Found many tasks ({matches}) with given name ({spec.name})."
+            elif len(matches) == 1:
+                task_id, task_app = next(iter(matches.items()))
+                if spec.app_id not in task_app:
+                    error = (
+                        f"Found task ({task_id}) with given name ({spec.name}), but "
+                        f"its app ({task_app}) doesn't match ({spec.app_id})."
+                    )
+                existing[index] = task_id
+            if error is not None:
+                results[index] = TaskResult(spec.name, TaskOutcome.FAILED, error=error)
+            names.add(spec.name)
+
+        # Skip existing tasks that were already launched
+        pending = {i: task_id for i, task_id in existing.items() if not results[i]}
+        statuses = self.get_task_statuses(pending.values())
+        for index, task_id in pending.items():
+            name = task_specs[index].name
+            status = statuses[task_id].status
+            if status is None:
+                error = statuses[task_id].error
+                results[index] = TaskResult(name, TaskOutcome.FAILED, task_id, error)
+            elif status.state != "DRAFT":
+                results[index] = TaskResult(name, TaskOutcome.SKIPPED, task_id)
+
+        def draft_and_launch(index: int) -> TaskResult:
+            spec = task_specs[index]
+            task_id = existing.get(index)
+            try:
+                if task_id is None:
+                    task = self.client.tasks.create(
+                        spec.name, self.project, spec.app_id, inputs=spec.inputs
+                    )
+                    self.task_index.add(task)
+                    task_id = cast(str, task.id)
+                    task.run()
+                else:
+                    self.launch_task(task_id)
+            except Exception as error:
+                message = f"{type(error).__name__}: {error}"
+                return TaskResult(spec.name, TaskOutcome.FAILED, task_id, message)
+            return TaskResult(spec.name, TaskOutcome.LAUNCHED, task_id)
+
+        remaining = [index for index, result in enumerate(results) if result is None]
+        remaining_results = self.executor.map(draft_and_launch, remaining)
+        for index, result in zip(remaining, remaining_results):
+            results[index] = result
+
+        return cast(list[TaskResult], results)
+
     def get_task_status(self, task_id) -> TaskStatus:
         """Retrieve the status of a task and whether it's done.
 
@@ -132,3 +382,351 @@ class SevenBridgesOps(BaseOps):
         task = self.client.tasks.get(task_id)
         status = TaskStatus(task.status)
         return status
+
+    def get_task_statuses(self, task_ids: Iterable[str]) -> dict[str, TaskStatusResult]:
+        """Retrieve the status of many tasks using bulk requests.
+
+        The bulk requests are sent concurrently using the shared executor.
+        Errors are reported per task rather than raised.
+
+        Args:
+            task_ids: Task IDs.
+
+        Returns:
+            The status of each task or why it couldn't be retrieved
+            (keyed by task ID).
+        """
+        task_ids = list(task_ids)
+        limit = self.bulk_limit
+        chunks = [task_ids[i : i + limit] for i in range(0, len(task_ids), limit)]
+        all_records = self.executor.map(self.client.tasks.bulk_get, chunks)
+        results = dict()
+        for chunk, records in zip(chunks, all_records):
+            for task_id, record in zip(chunk, records):
+                if record.valid:
+                    status = TaskStatus(record.resource.status)
+                    results[task_id] = TaskStatusResult(status)
+                else:
+                    message = f"Failed to retrieve task ({task_id}): {record.error}"
+                    results[task_id] = TaskStatusResult(error=message)
+        return results
+
+    @staticmethod
+    def get_next_wait_time(
+        wait_time: float, min_wait_time: float, max_wait_time: float, changed: bool
+    ) -> float:
+        """Adapt the time to wait between checks to the task progress.
+
+        Args:
+            wait_time: Previous number of seconds waited.
+            min_wait_time: Minimum number of seconds to wait.
+            max_wait_time: Maximum number of seconds to wait.
+            changed: Whether any task state changed since the last check.
+
+        Returns:
+            The wait time, which is reset to the minimum when a change
+            is observed and doubled (up to the maximum) otherwise.
+        """
+        if changed:
+            return min_wait_time
+        return min(wait_time * 2, max_wait_time)
+
+    async def monitor_task(
+        self, task_id: str, wait_time: int = 60 * 5, min_wait_time: int = 30
+    ) -> TaskStatus:
+        """Wait until the task is done without blocking the event loop.
+
+        Blocking SDK calls are run in a worker thread, so many tasks can
+        be monitored concurrently (e.g., from an Airflow triggerer). The
+        time between checks starts at ``min_wait_time``, doubles while
+        the task state is unchanged, and is reset when the state changes.
+
+        Args:
+            task_id: Task ID.
+            wait_time: Maximum number of seconds to wait between checks.
+                Default is 5 minutes.
+            min_wait_time: Minimum number of seconds to wait between
+                checks. Default is 30 seconds.
+
+        Returns:
+            The final task status.
+        """
+        min_wait_time = min(min_wait_time, wait_time)
+        current_wait_time: float = min_wait_time
+        status = await asyncio.to_thread(self.get_task_status, task_id)
+        while not status.is_done:
+            logger.info(f"Task ({task_id}) is {status.state} (not done yet)...")
+            await asyncio.sleep(current_wait_time)
+            previous_status = status
+            status = await asyncio.to_thread(self.get_task_status, task_id)
+            changed = status != previous_status
+            current_wait_time = self.get_next_wait_time(
+                current_wait_time, min_wait_time, wait_time, changed
+            )
+
+        logger.info(f"Task ({task_id}) is now done ({status.state})!")
+        return status
+
+    async def monitor_tasks(
+        self,
+        task_ids: Iterable[str],
+        wait_time: int = 60 * 5,
+        min_wait_time: int = 30,
+    ) -> dict[str, TaskStatus]:
+        """Wait until all of the given tasks are done.
+
+        Only the tasks that aren't done yet are polled each time, using
+        bulk requests that are run in a worker thread. The time between
+        checks adapts to the task progress like in ``monitor_task()``.
+
+        Args:
+            task_ids: Task IDs.
+            wait_time: Maximum number of seconds to wait between checks.
+                Default is 5 minutes.
+            min_wait_time: Minimum number of seconds to wait between
+                checks. Default is 30 seconds.
+
+        Raises:
+            ClientRequestError: If any of the tasks couldn't be retrieved.
+
+        Returns:
+            The final status of each task (keyed by task ID).
+        """
+        min_wait_time = min(min_wait_time, wait_time)
+        current_wait_time: float = min_wait_time
+        pending = list(dict.fromkeys(task_ids))
+        previous_statuses: dict[str, TaskStatus] = dict()
+        final_statuses = dict()
+        while True:
+            results = await asyncio.to_thread(self.get_task_statuses, pending)
+            statuses = dict()
+            for task_id, result in results.items():
+                if result.status is None:
+                    raise ClientRequestError(result.error)
+                statuses[task_id] = result.status
+            for task_id, status in statuses.items():
+                if status.is_done:
+                    final_statuses[task_id] = status
+            pending = [task_id for task_id in pending if task_id not in final_statuses]
+            if not pending:
+                break
+            changed = any(
+                previous_statuses.get(task_id) != status
+                for task_id, status in statuses.items()
+            )
+            if previous_statuses:
+                current_wait_time = self.get_next_wait_time(
+                    current_wait_time, min_wait_time, wait_time, changed
+                )
+            previous_statuses = statuses
+            logger.info(f"{len(pending)} task(s) are not done yet...")
+            await asyncio.sleep(current_wait_time)
+
+        logger.info(f"All {len(final_statuses)} task(s) are now done!")
+        return final_statuses
+
+    def _transfer_parts(
+        self, transfers: dict[str, ResumableTransfer]
+    ) -> dict[str, TransferResult]:
+        """Transfer the pending parts of many files concurrently.
+
+        Args:
+            transfers: Resumable transfers keyed by file name.
+
+        Returns:
+            The result for each file.
+        """
+        futures = {
+            self.executor.submit(transfer.transfer_part, index): name
+            for name, transfer in transfers.items()
+            for index in transfer.pending_parts
+        }
+        errors: dict[str, str] = dict()
+        for future in as_completed(futures):
+            error = future.exception()
+            if error is not None:
+                errors.setdefault(futures[future], f"{type(error).__name__}: {error}")
+
+        results: dict[str, TransferResult] = dict()
+        for name, transfer in transfers.items():
+            if name in errors:
+                failure = TransferResult(name, TransferOutcome.FAILED, errors[name])
+                results[name] = failure
+                continue
+            try:
+                transfer.finish()
+            except Exception as error:
+                message = f"{type(error).__name__}: {error}"
+                results[name] = TransferResult(name, TransferOutcome.FAILED, message)
+            else:
+                results[name] = TransferResult(name, TransferOutcome.TRANSFERRED)
+        return results
+
+    def upload_files(
+        self,
+        paths: Iterable[str],
+        overwrite: bool = False,
+        part_size: int = 32 * 1024**2,
+    ) -> list[TransferResult]:
+        """Upload local files to the root of the active project.
+
+        Files are split into parts, which are uploaded concurrently
+        using the shared executor. Interrupted uploads are resumed from
+        the completed parts the next time. Files that already exist in
+        the project with the same size and checksum are skipped.
+
+        Args:
+            paths: Local file paths.
+            overwrite: Whether to overwrite project files whose contents
+                differ from the local files (or can't be verified since
+                their checksums are unknown). Defaults to False, in which
+                case these uploads fail.
+            part_size: Requested number of bytes per part. Defaults to
+                32 MiB.
+
+        Raises:
+            ValueError: If several local files share the same name.
+
+        Returns:
+            The result for each file (in the same order as the input).
+        """
+        paths = list(paths)
+        names = [os.path.basename(path) for path in paths]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            message = f"Local files share the same names ({duplicates})."
+            raise ValueError(message)
+
+        remote_files = {
+            file.name: file for file in self.storage.list_files(self.project)
+        }
+
+        results: dict[str, TransferResult] = dict()
+        uploads: dict[str, ResumableTransfer] = dict()
+        for path, name in zip(paths, names):
+            remote = remote_files.get(name)
+            try:
+                if remote is not None and is_same_file(path, remote.size, remote.md5):
+                    results[name] = TransferResult(name, TransferOutcome.SKIPPED)
+                    continue
+                if remote is not None and not overwrite:
+                    if remote.md5 is None:
+                        message = (
+                            f"Cannot verify project file ({name}) against local "
+                            f"file ({path}) since its checksum is unknown."
+                        )
+                    else:
+                        message = (
+                            f"Project file ({name}) differs from local file ({path})."
+                        )
+                    raise FileExistsError(message)
+                uploads[name] = ResumableUpload(
+                    self.storage, path, self.project, name, part_size, overwrite
+                )
+            except Exception as error:
+                message = f"{type(error).__name__}: {error}"
+                results[name] = TransferResult(name, TransferOutcome.FAILED, message)
+
+        results.update(self._transfer_parts(uploads))
+        return [results[name] for name in names]
+
+    def download_files(
+        self,
+        directory: str,
+        names: Optional[Iterable[str]] = None,
+        part_size: int = 64 * 1024**2,
+    ) -> list[TransferResult]:
+        """Download files from the root of the active project.
+
+        Files are split into parts, which are downloaded concurrently
+        using the shared executor and streamed to disk. Interrupted
+        downloads are resumed from the completed parts the next time.
+        Local files with the same size and checksum as the project
+        files are skipped.
+
+        Args:
+            directory: Local destination directory.
+            names: Names of the files to download. Defaults to None,
+                which downloads all files in the project.
+            part_size: Number of bytes per part. Defaults to 64 MiB.
+
+        Returns:
+            The result for each file (in the order of the given names
+            or the project listing).
+        """
+        remote_files = {
+            file.name: file for file in self.storage.list_files(self.project)
+        }
+        names = list(remote_files) if names is None else list(names)
+        os.makedirs(directory, exist_ok=True)
+
+        results: dict[str, TransferResult] = dict()
+        downloads: dict[str, ResumableTransfer] = dict()
+        for name in names:
+            remote = remote_files.get(name)
+            path = os.path.join(directory, name)
+            if remote is None:
+                message = f"File ({name}) not found in project ({self.project})."
+                results[name] = TransferResult(name, TransferOutcome.FAILED, message)
+            elif is_same_file(path, remote.size, remote.md5):
+                results[name] = TransferResult(name, TransferOutcome.SKIPPED)
+            else:
+                downloads[name] = ResumableDownload(
+                    self.storage, remote, path, part_size
+                )
+
+        results.update(self._transfer_parts(downloads))
+        return [results[name] for name in names]
+
+    def export_task_outputs(
+        self, task_ids: Iterable[str], path: str, format: Optional[str] = None
+    ) -> int:
+        """Export a manifest of the files output by many tasks.
+
+        The tasks are retrieved using bulk requests, which are sent
+        concurrently using the shared executor. At most one bulk request
+        per worker is in flight at once and each batch of tasks is
+        written to the manifest as soon as it's retrieved, so memory
+        usage doesn't depend on the number of tasks.
+
+        Args:
+            task_ids: Task IDs.
+            path: Local path for the manifest.
+            format: Manifest format (``csv`` or ``parquet``). Defaults
+                to None, in which case it's inferred from the extension.
+
+        Raises:
+            ClientRequestError: If any of the tasks couldn't be retrieved.
+
+        Returns:
+            The number of files in the manifest.
+        """
+        task_ids = iter(task_ids)
+        pending: deque[tuple[list[str], Future]] = deque()
+
+        def submit_next_chunk() -> None:
+            chunk = list(islice(task_ids, self.bulk_limit))
+            if chunk:
+                future = self.executor.submit(self.client.tasks.bulk_get, chunk)
+                pending.append((chunk, future))
+
+        for _ in range(self.config.max_workers):
+            submit_next_chunk()
+
+        num_files = 0
+        with open_manifest(path, format) as manifest:
+            while pending:
+                chunk, future = pending.popleft()
+                records = future.result()
+                submit_next_chunk()
+                rows: list[OutputFile] = list()
+                for task_id, record in zip(chunk, records):
+                    if not record.valid:
+                        message = f"Failed to retrieve task ({task_id}): {record.error}"
+                        raise ClientRequestError(message)
+                    rows.extend(iter_output_files(record.resource))
+                manifest.write(rows)
+                num_files += len(rows)
+
+        logger.info(f"Exported {num_files} output file(s) to {path}.")
+        return num_files
@@ -0,0 +1,488 @@
+"""Transfers of SevenBridges project files.
+
+File contents are always streamed in chunks or parts, so memory usage
+doesn't depend on file sizes. Transfers are split into parts that can
+be sent concurrently and resumed after an interruption.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from abc import ABC, abstractmethod
+from threading import Lock
+from typing import Any, Iterator, Optional
+
+import requests
+from sevenbridges import Api
+from sevenbridges.errors import NotFound
+from sevenbridges.meta.collection import Collection
+
+from orca.services.base.transfer import CHUNK_SIZE, compute_md5, is_same_file
+from orca.services.sevenbridges.models import RemoteFile
+
+# File metadata field used to record checksums on upload
+MD5_METADATA_KEY = "md5_sum"
+
+
+class FileStorage(ABC):
+    """Base class for project file storage backends."""
+
+    @abstractmethod
+    def list_files(self, project: str) -> list[RemoteFile]:
+        """List the files in a project.
+
+        Args:
+            project: Project ID.
+
+        Returns:
+            Files in the project.
+        """
+
+    @abstractmethod
+    def read_range(self, remote: RemoteFile, start: int, end: int) -> Iterator[bytes]:
+        """Stream a range of bytes from a remote file.
+
+        Args:
+            remote: Remote file.
+            start: Offset of the first byte.
+            end: Offset after the last byte.
+
+        Yields:
+            Chunks of the file contents.
+        """
+
+    @abstractmethod
+    def start_upload(
+        self, project: str, name: str, size: int, part_size: int, overwrite: bool
+    ) -> tuple[str, int]:
+        """Start a multipart upload to a project.
+
+        Args:
+            project: Project ID.
+            name: Remote file name.
+            size: File size in bytes.
+            part_size: Requested number of bytes per part.
+            overwrite: Whether to overwrite an existing remote file.
+
+        Returns:
+            Upload ID and the number of bytes per part (which can be
+            adjusted by the backend).
+        """
+
+    @abstractmethod
+    def is_upload_active(self, upload_id: str) -> bool:
+        """Check whether a multipart upload can still be resumed.
+
+        Args:
+            upload_id: Upload ID.
+
+        Returns:
+            Whether the upload is still active.
+        """
+
+    @abstractmethod
+    def upload_part(self, upload_id: str, number: int, data: bytes) -> None:
+        """Upload a part of a multipart upload.
+
+        Args:
+            upload_id: Upload ID.
+            number: Part number (starting at 1).
+            data: Part contents.
+        """
+
+    @abstractmethod
+    def complete_upload(self, upload_id: str, md5: str) -> None:
+        """Complete a multipart upload and record the file checksum.
+
+        Args:
+            upload_id: Upload ID.
+            md5: MD5 checksum of the uploaded file.
+        """
+
+
+class SevenBridgesStorage(FileStorage):
+    """Storage backend using the SevenBridges API.
+
+    Uploads use the multipart upload API, where each part is sent to
+    a presigned storage URL. Downloads stream byte ranges from the file
+    download URL using the pooled connections of the client session.
+    Checksums are recorded in the file metadata on upload.
+    """
+
+    def __init__(self, client: Api, timeout: int = 300):
+        """Construct a storage backend for an authenticated client.
+
+        Args:
+            client: An authenticated SevenBridges client.
+            timeout: Number of seconds to wait for the server.
+        """
+        self.client = client
+        self.timeout = timeout
+        self._urls: dict[str, str] = dict()
+        self._lock = Lock()
+        # Presigned storage URLs shouldn't receive the API credentials
+        self.storage_session = requests.Session()
+
+    def list_files(self, project: str) -> list[RemoteFile]:
+        """List the files at the root of a project.
+
+        Args:
+            project: Project ID.
+
+        Returns:
+            Files in the project (excluding folders).
+        """
+        files = self.client.files.query(project=project, limit=100)
+        if isinstance(files, Collection):
+            files = files.all()
+        remote_files = list()
+        for file in files:
+            if getattr(file, "type", "file") != "file":
+                continue
+            metadata = getattr(file, "metadata", None)
+            md5 = metadata.get(MD5_METADATA_KEY) if isinstance(metadata, dict) else None
+            remote = RemoteFile(file.id, file.name, file.size or 0, md5)
+            remote_files.append(remote)
+        return remote_files
+
+    def get_download_url(self, remote: RemoteFile) -> str:
+        """Retrieve (and cache) the download URL for a file.
+
+        Args:
+            remote: Remote file.
+
+        Returns:
+            Download URL.
+        """
+        with self._lock:
+            if remote.id not in self._urls:
+                file = self.client.files.get(remote.id)
+                self._urls[remote.id] = file.download_info().url
+            return self._urls[remote.id]
+
+    def read_range(self, remote: RemoteFile, start: int, end: int) -> Iterator[bytes]:
+        """Stream a range of bytes from a remote file.
+
+        Args:
+            remote: Remote file.
+            start: Offset of the first byte.
+            end: Offset after the last byte.
+
+        Yields:
+            Chunks of the file contents.
+        """
+        url = self.get_download_url(remote)
+        headers = {"Range": f"bytes={start}-{end - 1}"}
+        session = self.client.session
+        with session.get(url, headers=headers, stream=True, timeout=self.timeout) as r:
+            r.raise_for_status()
+            yield from r.iter_content(CHUNK_SIZE)
+
+    def start_upload(
+        self, project: str, name: str, size: int, part_size: int, overwrite: bool
+    ) -> tuple[str, int]:
+        """Start a multipart upload to a project.
+
+        Args:
+            project: Project ID.
+            name: Remote file name.
+            size: File size in bytes.
+            part_size: Requested number of bytes per part.
+            overwrite: Whether to overwrite an existing remote file.
+
+        Returns:
+            Upload ID and the number of bytes per part (which can be
+            adjusted by the server).
+        """
+        data = {"project": project, "name": name, "size": size, "part_size": part_size}
+        params = {"overwrite": True} if overwrite else {}
+        response = self.client.post("/upload/multipart", data=data, params=params)
+        upload = response.json()
+        return upload["upload_id"], upload.get("part_size") or part_size
+
+    def is_upload_active(self, upload_id: str) -> bool:
+        """Check whether a multipart upload can still be resumed.
+
+        Args:
+            upload_id: Upload ID.
+
+        Returns:
+            Whether the upload is still active.
+        """
+        try:
+            self.client.get(f"/upload/multipart/{upload_id}")
+        except NotFound:
+            return False
+        return True
+
+    def upload_part(self, upload_id: str, number: int, data: bytes) -> None:
+        """Upload a part to its presigned URL and report its completion.
+
+        Args:
+            upload_id: Upload ID.
+            number: Part number (starting at 1).
+            data: Part contents.
+        """
+        url = f"/upload/multipart/{upload_id}/part"
+        part_url = self.client.get(f"{url}/{number}").json()["url"]
+        response = self.storage_session.put(part_url, data=data, timeout=self.timeout)
+        response.raise_for_status()
+        etag = response.headers.get("ETag", "").strip('"')
+        report = {"part_number": number, "response": {"headers": {"ETag": etag}}}
+        self.client.post(url, data=report)
+
+    def complete_upload(self, upload_id: str, md5: str) -> None:
+        """Complete a multipart upload and record the file checksum.
+
+        Args:
+            upload_id: Upload ID.
+            md5: MD5 checksum of the uploaded file.
+        """
+        response = self.client.post(f"/upload/multipart/{upload_id}/complete")
+        file_id = response.json()["id"]
+        self.client.patch(f"/files/{file_id}/metadata", data={MD5_METADATA_KEY: md5})
+
+
+class ResumableTransfer(ABC):
+    """Transfer of a file in parts that can be resumed.
+
+    Attributes:
+        parts: Byte ranges (start and end offsets) of each part.
+        completed: Indices of the completed parts.
+    """
+
+    parts: list[tuple[int, int]]
+    completed: set[int]
+
+    @property
+    def pending_parts(self) -> list[int]:
+        """Indices of the parts that still need to be transferred."""
+        return [i for i in range(len(self.parts)) if i not in self.completed]
+
+    @abstractmethod
+    def transfer_part(self, index: int) -> None:
+        """Transfer a part and record its completion.
+
+        Args:
+            index: Part index.
+        """
+
+    @abstractmethod
+    def finish(self) -> None:
+        """Complete the transfer once all parts are transferred."""
+
+
+class ResumableDownload(ResumableTransfer):
+    """Download of a remote file in parts that can be resumed.
+
+    The parts are written to a temporary file next to the destination
+    path, while the completed parts are tracked in a state file. Once
+    all parts are downloaded, the temporary file is verified and moved
+    to the destination path.
+    """
+
+    def __init__(
+        self, storage: FileStorage, remote: RemoteFile, path: str, part_size: int
+    ):
+        """Prepare the download of a remote file.
+
+        Args:
+            storage: Storage backend.
+            remote: Remote file.
+            path: Local destination path.
+            part_size: Number of bytes per part.
+        """
+        self.storage = storage
+        self.remote = remote
+        self.path = path
+        self.part_path = f"{path}.part"
+        self.state_path = f"{path}.part.json"
+        self.parts = [
+            (start, min(start + part_size, remote.size))
+            for start in range(0, remote.size, part_size)
+        ]
+        self.completed = self.load_state()
+        self._lock = Lock()
+
+    def load_state(self) -> set[int]:
+        """Load the completed parts of a previous attempt (if any).
+
+        Returns:
+            Indices of the completed parts.
+        """
+        state = None
+        if os.path.exists(self.part_path) and os.path.exists(self.state_path):
+            with open(self.state_path) as file:
+                state = json.load(file)
+        expected = {"id": self.remote.id, "size": self.remote.size}
+        if state is None or {k: state.get(k) for k in expected} != expected:
+            with open(self.part_path, "wb") as file:
+                file.truncate(self.remote.size)
+            return set()
+        return set(state["parts"])
+
+    def save_state(self) -> None:
+        """Save the completed parts (while holding the lock)."""
+        state = {
+            "id": self.remote.id,
+            "size": self.remote.size,
+            "parts": sorted(self.completed),
+        }
+        with open(self.state_path, "w") as file:
+            json.dump(state, file)
+
+    def transfer_part(self, index: int) -> None:
+        """Download a part and write it at its offset.
+
+        Args:
+            index: Part index.
+
+        Raises:
+            IOError: If fewer bytes than expected were received.
+        """
+        start, end = self.parts[index]
+        offset = start
+        with open(self.part_path, "r+b") as file:
+            file.seek(start)
+            for chunk in self.storage.read_range(self.remote, start, end):
+                file.write(chunk)
+                offset += len(chunk)
+        if offset != end:
+            message = f"Received {offset - start} of {end - start} bytes ({index=})."
+            raise IOError(message)
+        with self._lock:
+            self.completed.add(index)
+            self.save_state()
+
+    def finish(self) -> None:
+        """Verify the downloaded file and move it to its destination.
+
+        Raises:
+            IOError: If any part is missing or the file doesn't match.
+        """
+        if self.pending_parts:
+            message = f"Parts {self.pending_parts} of {self.path} are missing."
+            raise IOError(message)
+        remote = self.remote
+        if not is_same_file(self.part_path, remote.size, remote.md5, require_md5=False):
+            message = f"Downloaded file ({self.path}) doesn't match {self.remote}."
+            raise IOError(message)
+        os.replace(self.part_path, self.path)
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
+
+
+class ResumableUpload(ResumableTransfer):
+    """Upload of a local file in parts that can be resumed.
+
+    The upload ID and the completed parts are tracked in a state file
+    next to the local file, so an interrupted upload can be resumed as
+    long as the local file and the multipart upload are unchanged. Once
+    all parts are uploaded, the upload is completed with the checksum
+    of the local file.
+    """
+
+    def __init__(
+        self,
+        storage: FileStorage,
+        path: str,
+        project: str,
+        name: str,
+        part_size: int,
+        overwrite: bool,
+    ):
+        """Prepare the upload of a local file.
+
+        Args:
+            storage: Storage backend.
+            path: Local file path.
+            project: Project ID.
+            name: Remote file name.
+            part_size: Requested number of bytes per part.
+            overwrite: Whether to overwrite an existing remote file.
+        """
+        self.storage = storage
+        self.path = path
+        self.project = project
+        self.name = name
+        self.state_path = f"{path}.upload.json"
+        stat = os.stat(path)
+        self.size = stat.st_size
+        self.identity = {
+            "project": project,
+            "name": name,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+        }
+        state = self.load_state()
+        if state is None:
+            self.upload_id, self.part_size = storage.start_upload(
+                project, name, self.size, part_size, overwrite
+            )
+            self.completed: set[int] = set()
+        else:
+            self.upload_id = state["upload_id"]
+            self.part_size = state["part_size"]
+            self.completed = set(state["parts"])
+        # Empty files are still uploaded as a single (empty) part
+        self.parts = [
+            (start, min(start + self.part_size, self.size))
+            for start in range(0, self.size, self.part_size)
+        ] or [(0, 0)]
+        self._lock = Lock()
+
+    def load_state(self) -> Optional[dict[str, Any]]:
+        """Load the state of a previous attempt (if it can be resumed).
+
+        Returns:
+            State of the previous attempt or None if there isn't one.
+        """
+        if not os.path.exists(self.state_path):
+            return None
+        with open(self.state_path) as file:
+            state = json.load(file)
+        if {k: state.get(k) for k in self.identity} != self.identity:
+            return None
+        if not self.storage.is_upload_active(state["upload_id"]):
+            return None
+        return state
+
+    def save_state(self) -> None:
+        """Save the completed parts (while holding the lock)."""
+        state = {
+            **self.identity,
+            "upload_id": self.upload_id,
+            "part_size": self.part_size,
+            "parts": sorted(self.completed),
+        }
+        with open(self.state_path, "w") as file:
+            json.dump(state, file)
+
+    def transfer_part(self, index: int) -> None:
+        """Read a part from the local file and upload it.
+
+        Args:
+            index: Part index.
+        """
+        start, end = self.parts[index]
+        with open(self.path, "rb") as file:
+            file.seek(start)
+            data = file.read(end - start)
+        self.storage.upload_part(self.upload_id, index + 1, data)
+        with self._lock:
+            self.completed.add(index)
+            self.save_state()
+
+    def finish(self) -> None:
+        """Complete the upload once all parts are uploaded.
+
+        Raises:
+            IOError: If any part is missing.
+        """
+        if self.pending_parts:
+            message = f"Parts {self.pending_parts} of {self.path} are missing."
+            raise IOError(message)
+        self.storage.complete_upload(self.upload_id, compute_md5(self.path))
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
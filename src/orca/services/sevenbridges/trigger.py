@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, AsyncIterator, Optional
+
+from airflow.triggers.base import BaseTrigger, TriggerEvent
+from sevenbridges.models.enums import TaskStatus as TaskState
+
+from orca.services.sevenbridges.hook import SevenBridgesHook
+from orca.services.sevenbridges.ops import SevenBridgesOps
+
+
+class SevenBridgesTaskTrigger(BaseTrigger):
+    """Airflow trigger that fires once SevenBridges tasks are done.
+
+    This trigger allows deferrable operators and sensors to release
+    their worker slot while tasks are running. The tasks are polled in
+    bulk from the triggerer's event loop (see ``monitor_tasks()``).
+
+    The trigger event payload includes the final state of each task
+    (``states``) and whether all tasks completed (``is_successful``).
+    """
+
+    def __init__(
+        self,
+        task_ids: list[str],
+        conn_id: Optional[str] = None,
+        wait_time: int = 60 * 5,
+        min_wait_time: int = 30,
+    ):
+        """Construct a trigger for monitoring SevenBridges tasks.
+
+        Args:
+            task_ids: Task IDs.
+            conn_id: An Airflow connection ID.
+                Defaults to ``SevenBridgesHook.default_conn_name``.
+            wait_time: Maximum number of seconds to wait between checks.
+            min_wait_time: Minimum number of seconds to wait between checks.
+        """
+        super().__init__()
+        self.task_ids = list(task_ids)
+        self.conn_id = conn_id
+        self.wait_time = wait_time
+        self.min_wait_time = min_wait_time
+
+    def serialize(self) -> tuple[str, dict[str, Any]]:
+        """Serialize the trigger for re-instantiation in the triggerer.
+
+        Returns:
+            The trigger class path and its keyword arguments.
+        """
+        class_path = f"{type(self).__module__}.{type(self).__name__}"
+        kwargs = {
+            "task_ids": self.task_ids,
+            "conn_id": self.conn_id,
+            "wait_time": self.wait_time,
+            "min_wait_time": self.min_wait_time,
+        }
+        return class_path, kwargs
+
+    def get_ops(self) -> SevenBridgesOps:
+        """Retrieve the ops object for the connection.
+
+        This involves blocking calls (i.e., retrieving the connection
+        from the database and possibly testing a shared client), so it
+        shouldn't be called from the event loop.
+
+        Returns:
+            The ops object.
+        """
+        hook = SevenBridgesHook(self.conn_id)
+        return hook.ops
+
+    async def run(self) -> AsyncIterator[TriggerEvent]:
+        """Wait until all tasks are done.
+
+        Yields:
+            A single event with the final task states.
+        """
+        ops = await asyncio.to_thread(self.get_ops)
+        statuses = await ops.monitor_tasks(
+            self.task_ids, self.wait_time, self.min_wait_time
+        )
+        states = {task_id: status.state for task_id, status in statuses.items()}
+        is_successful = all(state == TaskState.COMPLETED for state in states.values())
+        yield TriggerEvent({"states": states, "is_successful": is_successful})
@@ -1,9 +1,26 @@
 """Submodule for Synapse."""
 
-from orca.services.synapse.client_factory import SynapseClientFactory
-from orca.services.synapse.config import SynapseConfig
-from orca.services.synapse.hook import SynapseHook
-from orca.services.synapse.ops import SynapseOps
+from typing import TYPE_CHECKING
+
+from orca.lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from orca.services.synapse.client_factory import SynapseClientFactory
+    from orca.services.synapse.config import SynapseConfig
+    from orca.services.synapse.hook import SynapseHook
+    from orca.services.synapse.ops import SynapseOps
+
+# Attributes are imported from their submodule on first access to
+# avoid loading the dependencies of unused classes (see `orca.lazy`)
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "SynapseClientFactory": "client_factory",
+        "SynapseConfig": "config",
+        "SynapseHook": "hook",
+        "SynapseOps": "ops",
+    },
+)
 
 __all__ = [
     "SynapseConfig",
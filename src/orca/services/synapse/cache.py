@@ -0,0 +1,170 @@
+"""Cache for the results of Synapse table queries."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCache:
+    """Cache for query results keyed by view, query and view etag.
+
+    Only the results for the latest etag of each view and query are
+    kept. The results are stored in a bounded in-memory LRU cache and,
+    optionally, in a directory on disk, which lets the results persist
+    across processes (e.g., different Airflow tasks).
+
+    Attributes:
+        max_size: Maximum number of queries cached in memory.
+        directory: Directory for the on-disk cache (if any).
+    """
+
+    def __init__(self, max_size: int = 128, directory: Optional[str] = None):
+        """Construct an empty cache.
+
+        Args:
+            max_size: Maximum number of queries cached in memory.
+                Defaults to 128.
+            directory: Directory for the on-disk cache. Defaults to None,
+                in which case results are only cached in memory.
+        """
+        self.max_size = max_size
+        self.directory = directory
+        self._entries: OrderedDict[str, tuple[str, Any]] = OrderedDict()
+        self._lock = Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self) -> int:
+        """Number of queries cached in memory."""
+        return len(self._entries)
+
+    @staticmethod
+    def get_key(view: str, query: str) -> str:
+        """Compute the cache key for a query.
+
+        Args:
+            view: Synapse ID of the queried view.
+            query: SQL query.
+
+        Returns:
+            Hexadecimal digest of the view and query.
+        """
+        data = json.dumps([view, query]).encode()
+        return hashlib.sha256(data).hexdigest()
+
+    def get_path(self, key: str) -> str:
+        """Get the on-disk cache path for a key.
+
+        Args:
+            key: Cache key.
+
+        Raises:
+            ValueError: If the cache doesn't have an on-disk directory.
+
+        Returns:
+            Path to the JSON file for the key.
+        """
+        if self.directory is None:
+            raise ValueError("The query cache doesn't have an on-disk directory.")
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, view: str, query: str, etag: str) -> Optional[Any]:
+        """Retrieve the cached results of a query.
+
+        Args:
+            view: Synapse ID of the queried view.
+            query: SQL query.
+            etag: Current etag of the view.
+
+        Returns:
+            The cached results if the view hasn't changed since they
+            were cached, None otherwise.
+        """
+        key = self.get_key(view, query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None and self.directory is not None:
+            entry = self._read(key)
+            if entry is not None:
+                self._remember(key, entry)
+        if entry is None or entry[0] != etag:
+            return None
+        return entry[1]
+
+    def set(self, view: str, query: str, etag: str, results: Any) -> None:
+        """Cache the results of a query.
+
+        Args:
+            view: Synapse ID of the queried view.
+            query: SQL query.
+            etag: Etag of the view when it was queried.
+            results: JSON-serializable query results.
+        """
+        key = self.get_key(view, query)
+        self._remember(key, (etag, results))
+        if self.directory is not None:
+            self._write(key, (etag, results))
+
+    def clear(self) -> None:
+        """Remove all results cached in memory."""
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, key: str, entry: tuple[str, Any]) -> None:
+        """Cache an entry in memory and evict the least recently used ones.
+
+        Args:
+            key: Cache key.
+            entry: View etag and query results.
+        """
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _read(self, key: str) -> Optional[tuple[str, Any]]:
+        """Read an entry from the on-disk cache.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            View etag and query results, or None if the entry is
+            missing or corrupted.
+        """
+        try:
+            with open(self.get_path(key)) as file:
+                data = json.load(file)
+            return data["etag"], data["results"]
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError):
+            logger.warning(f"Ignoring corrupted query cache file for {key}.")
+            return None
+
+    def _write(self, key: str, entry: tuple[str, Any]) -> None:
+        """Write an entry to the on-disk cache atomically.
+
+        Args:
+            key: Cache key.
+            entry: View etag and query results.
+        """
+        # Write to a temporary file first so that concurrent processes
+        # never read a partially written file
+        etag, results = entry
+        handle, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(handle, "w") as file:
+            json.dump({"etag": etag, "results": results}, file)
+        os.replace(tmp_path, self.get_path(key))
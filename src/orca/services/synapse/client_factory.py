@@ -1,9 +1,10 @@
 from pydantic.dataclasses import dataclass
 from synapseclient import Synapse
+from synapseclient.core.credentials.cred_data import SynapseAuthTokenCredentials
 from synapseclient.core.exceptions import SynapseAuthenticationError
 
 from orca.errors import ConfigError
-from orca.services.base.client_factory import BaseClientFactory
+from orca.services.base.client_factory import BaseClientFactory, ValidationPolicy
 from orca.services.synapse.config import SynapseConfig
 
 
@@ -42,11 +43,18 @@ class SynapseClientFactory(BaseClientFactory):
             message = f"Config ({self.config}) is missing auth_token."
             raise ConfigError(message)
 
-        # Ignore authentication error (leave that to `test_client_request`)
-        try:
-            client.login(authToken=auth_token)
-        except SynapseAuthenticationError:
-            pass
+        # Logging in populates the user profile and detects invalid tokens
+        # early, but it makes requests on top of `test_client_request`. It's
+        # skipped unless clients are always tested, in which case an invalid
+        # token is reported by the first request (with a 401 error).
+        if self.get_validation_policy() == ValidationPolicy.ALWAYS:
+            # Ignore authentication error (leave that to `test_client_request`)
+            try:
+                client.login(authToken=auth_token)
+            except SynapseAuthenticationError:
+                pass
+        else:
+            client.credentials = SynapseAuthTokenCredentials(auth_token)
 
         return client
 
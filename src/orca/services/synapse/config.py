@@ -7,7 +7,7 @@ from pydantic.dataclasses import dataclass
 from orca.services.base.config import BaseConfig
 
 if TYPE_CHECKING:
-    from airflow.models.connection import Connection
+    from orca.services.base.config import AnyConnection
 
 
 @dataclass(kw_only=False)
@@ -16,6 +16,12 @@ class SynapseConfig(BaseConfig):
 
     Attributes:
         auth_token: A Synapse personal access token (PAT).
+        query_cache_size: Maximum number of query results cached
+            in memory.
+        query_cache_dir: Directory for caching query results on disk,
+            which persists them across processes. Defaults to an
+            empty string, in which case results are only cached
+            in memory.
 
     Class Variables:
         connection_env_var: The name of the environment variable whose
@@ -23,17 +29,23 @@ class SynapseConfig(BaseConfig):
     """
 
     auth_token: Optional[str] = None
+    query_cache_size: int = 128
+    query_cache_dir: str = ""
 
     connection_env_var = "SYNAPSE_CONNECTION_URI"
 
     @classmethod
-    def parse_connection(cls, connection: Connection) -> dict[str, Any]:
+    def parse_connection(cls, connection: AnyConnection) -> dict[str, Any]:
         """Parse Airflow connection as arguments for this configuration.
 
         Args:
-            connection: An Airflow connection object.
+            connection: An Airflow (or lightweight) connection object.
 
         Returns:
             Keyword arguments for this configuration.
         """
-        return {"auth_token": connection.password}
+        kwargs = {"auth_token": connection.password}
+        for name in ["query_cache_size", "query_cache_dir"]:
+            if name in connection.extra_dejson:
+                kwargs[name] = connection.extra_dejson[name]
+        return kwargs
@@ -1,21 +1,40 @@
 """
 Handles Synapse operations for py-orca services.
 """
+import json
 import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import field
 from functools import cached_property
-from typing import ClassVar, List, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ClassVar,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Union,
+)
 
-from challengeutils import utils
 from pydantic.dataclasses import dataclass
 from synapseclient import Synapse
-from synapsefs import SynapseFS
+from synapseclient.core.exceptions import SynapseHTTPError
 
-from orca.errors import ConfigError
+from orca.errors import ClientRequestError, ConfigError
 from orca.services.base.ops import BaseOps
+from orca.services.synapse.cache import QueryCache
 from orca.services.synapse.client_factory import SynapseClientFactory
 from orca.services.synapse.config import SynapseConfig
 
+if TYPE_CHECKING:
+    from synapsefs import SynapseFS
+
+    from orca.services.base.transfer import TransferResult
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,6 +47,15 @@ class SynapseOps(BaseOps):
 
     Class Variables:
         client_factory_class: The class for constructing clients.
+        batch_size: Maximum number of submission statuses per batch
+            update (the API maximum is 500).
+        max_workers: Maximum number of concurrent requests.
+        max_attempts: Maximum number of attempts for each batch update
+            in case of conflicting concurrent updates.
+        backoff_factor: Base number of seconds for the randomized delay
+            between attempts, which doubles after each attempt.
+        status_page_size: Number of submission statuses per page when
+            retrieving them in bulk (the API maximum is 100).
     """
 
     config: SynapseConfig = field(default_factory=SynapseConfig)
@@ -36,9 +64,22 @@ class SynapseOps(BaseOps):
 
     client: ClassVar[Synapse]
 
+    batch_size: ClassVar[int] = 500
+
+    max_workers: ClassVar[int] = 4
+
+    max_attempts: ClassVar[int] = 3
+
+    backoff_factor: ClassVar[float] = 1
+
+    status_page_size: ClassVar[int] = 100
+
     @cached_property
-    def fs(self) -> SynapseFS:
+    def fs(self) -> "SynapseFS":
         """Synapse file system."""
+        # Deferred because this import is slow and rarely needed
+        from synapsefs import SynapseFS
+
         auth_token = self.config.auth_token
 
         if auth_token is None:
@@ -50,6 +91,9 @@ class SynapseOps(BaseOps):
     def monitor_evaluation_queue(self, evaluation_id: str) -> bool:
         """Monitor an evaluation queue in Synapse.
 
+        Only the first "RECEIVED" submission is retrieved (if any), so
+        this check doesn't depend on the number of pending submissions.
+
         Arguments:
             evaluation_id: The Synapse ID of the queue to monitor.
 
@@ -57,50 +101,210 @@ class SynapseOps(BaseOps):
             True if there are "RECEIVED" submissions, False otherwise.
         """
         received_submissions = self.client.getSubmissionBundles(
-            evaluation_id, status="RECEIVED"
+            evaluation_id, status="RECEIVED", limit=1
         )
-        submissions_num = sum(1 for submission in received_submissions)
-        return submissions_num > 0
+        first_submission = next(iter(received_submissions), None)
+        return first_submission is not None
+
+    def count_received_submissions(self, evaluation_id: str) -> int:
+        """Count the "RECEIVED" submissions in an evaluation queue.
+
+        The total is read from the first page of submission statuses,
+        which is limited to a single result.
+
+        Arguments:
+            evaluation_id: The Synapse ID of the queue.
+
+        Returns:
+            The number of "RECEIVED" submissions.
+        """
+        uri = (
+            f"/evaluation/{evaluation_id}/submission/status/all"
+            "?status=RECEIVED&limit=1&offset=0"
+        )
+        response = self.client.restGET(uri)
+        return int(response["totalNumberOfResults"])
+
+    @cached_property
+    def query_cache(self) -> QueryCache:
+        """Cache for the results of view queries."""
+        size = self.config.query_cache_size
+        return QueryCache(size, self.config.query_cache_dir or None)
+
+    @cached_property
+    def view_etags(self) -> dict[str, str]:
+        """Table change etags of the views as of their latest indexing."""
+        return dict()
+
+    def get_table_status(self, synapse_view: str) -> dict[str, Any]:
+        """
+        Get the status of a Synapse table or view.
+
+        Arguments:
+            synapse_view: The Synapse ID of the view.
+
+        Returns:
+            The table status, including its ``state`` and
+            ``lastTableChangeEtag``.
+        """
+        return self.client.restGET(f"/entity/{synapse_view}/table/status")
 
-    def trigger_indexing(self, synapse_view: str) -> None:
+    def trigger_indexing(
+        self,
+        synapse_view: str,
+        wait: bool = True,
+        timeout: float = 600,
+        wait_time: float = 5,
+    ) -> bool:
         """
-        Trigger indexing in Synapse.
+        Trigger indexing in Synapse and optionally wait until the view is current.
+
+        Indexing is skipped entirely if the view is available and its
+        table change etag hasn't changed since the last call. By default,
+        the table status is polled until the view is current or the
+        timeout is reached. Without waiting, the table status is only
+        checked once after triggering indexing, which leaves any polling
+        to the caller (e.g., a sensor).
 
         Arguments:
-            syn: A Synapse object.
             synapse_view: The Synapse ID of the view.
+            wait: Whether to wait until indexing is done.
+                  Defaults to True.
+            timeout: Maximum number of seconds to wait for indexing.
+                     Defaults to 600 seconds.
+            wait_time: Number of seconds between table status checks.
+                       Defaults to 5 seconds.
+
+        Raises:
+            ClientRequestError: If Synapse failed to index the view.
+
+        Returns:
+            True if the view is current, False if indexing is still
+            in progress (i.e., without waiting or after timing out).
         """
+        status = self.get_table_status(synapse_view)
+        etag = status.get("lastTableChangeEtag")
+        if status.get("state") == "AVAILABLE" and etag is not None:
+            if self.view_etags.get(synapse_view) == etag:
+                logger.debug(f"Skipping indexing of unchanged view ({synapse_view}).")
+                return True
+
         self.client.tableQuery(f"select * from {synapse_view} limit 1")
 
+        deadline = time.monotonic() + timeout
+        while True:
+            status = self.get_table_status(synapse_view)
+            state = status.get("state")
+            if state == "AVAILABLE":
+                etag = status.get("lastTableChangeEtag")
+                if etag is not None:
+                    self.view_etags[synapse_view] = etag
+                return True
+            if state == "PROCESSING_FAILED":
+                message = status.get("errorMessage", "Unknown error")
+                raise ClientRequestError(f"Failed to index {synapse_view}: {message}")
+            if not wait:
+                return False
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(f"Timed out waiting for {synapse_view} to be indexed.")
+                return False
+            time.sleep(min(wait_time, remaining))
+
     def get_submissions_with_status(
-        self, submission_view: str, submission_status: str = "RECEIVED"
+        self,
+        submission_view: str,
+        submission_status: str = "RECEIVED",
+        wait: bool = True,
+        timeout: float = 600,
     ) -> List[str]:
         """
         Get all submissions with desired submission status in a Synapse
         submission view. Status can be one of:
         https://rest-docs.synapse.org/rest/org/sagebionetworks/evaluation/model/SubmissionStatusEnum.html
 
+        The results are cached using the etag of the view, so the view is
+        only queried again once it has changed. Results from a view that
+        is still being indexed are never cached since they can be stale.
+
         Arguments:
             submission_view: The Synapse ID of the table view to get submissions from.
             submission_status: The submission status to filter for.
                                Defaults to "RECEIVED".
+            wait: Whether to wait until the view is indexed before
+                  querying it (see ``trigger_indexing``).
+                  Defaults to True.
+            timeout: Maximum number of seconds to wait for indexing.
+                     Defaults to 600 seconds.
 
         Returns:
             A list of submission IDs.
 
         """
         # Trigger indexing
-        self.trigger_indexing(submission_view)
+        is_current = self.trigger_indexing(submission_view, wait, timeout)
+        if not is_current:
+            logger.warning(f"Querying {submission_view} while it's being indexed.")
+
+        # Reuse the cached results if the view hasn't changed since
+        query = f"select id from {submission_view} where status = '{submission_status}'"
+        etag = self.view_etags.get(submission_view) if is_current else None
+        if etag is not None:
+            cached_ids = self.query_cache.get(submission_view, query, etag)
+            if cached_ids is not None:
+                return list(cached_ids)
 
         # Get all submissions for the given ``submission_view``
-        query_results = self.client.tableQuery(
-            f"select id from {submission_view} where status = '{submission_status}'"
-        )
+        query_results = self.client.tableQuery(query)
 
         submission_ids = query_results.asDataFrame()["id"].tolist()
 
+        if etag is not None:
+            self.query_cache.set(submission_view, query, etag, submission_ids)
+
         return submission_ids
 
+    def iter_submissions_with_status(
+        self,
+        submission_view: str,
+        submission_status: str = "RECEIVED",
+        wait: bool = True,
+        timeout: float = 600,
+    ) -> Iterator[str]:
+        """
+        Lazily iterate over the submissions with desired submission status
+        in a Synapse submission view. Unlike ``get_submissions_with_status``,
+        the query results are paged through as a row set, so only one page
+        of results is held in memory at once.
+
+        Arguments:
+            submission_view: The Synapse ID of the table view to get submissions from.
+            submission_status: The submission status to filter for.
+                               Defaults to "RECEIVED".
+            wait: Whether to wait until the view is indexed before
+                  querying it (see ``trigger_indexing``).
+                  Defaults to True.
+            timeout: Maximum number of seconds to wait for indexing.
+                     Defaults to 600 seconds.
+
+        Yields:
+            Submission IDs.
+
+        """
+        # Trigger indexing
+        is_current = self.trigger_indexing(submission_view, wait, timeout)
+        if not is_current:
+            logger.warning(f"Querying {submission_view} while it's being indexed.")
+
+        # Page through all submissions for the given ``submission_view``
+        query_results = self.client.tableQuery(
+            f"select id from {submission_view} where status = '{submission_status}'",
+            resultsAs="rowset",
+        )
+
+        for row in query_results:
+            yield str(row["values"][0])
+
     def update_submission_status(
         self,
         submission_id: Union[int, str],
@@ -121,7 +325,194 @@ class SynapseOps(BaseOps):
         if type(submission_id) not in [str, int]:
             raise TypeError("``submission_id`` must be a string or int.")
 
+        # Deferred because this import is slow and rarely needed
+        from challengeutils import utils
+
         # Update submission status
         utils.change_submission_status(
             self.client, submissionid=submission_id, status=submission_status
         )
+
+    def get_submission_statuses(
+        self, evaluation_id: str, submission_ids: Iterable[Union[int, str]]
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Get the current status of many submissions in an evaluation queue.
+
+        The statuses are paged through in bulk rather than retrieved one
+        submission at a time, and paging stops as soon as all requested
+        statuses are found.
+
+        Arguments:
+            evaluation_id: The Synapse ID of the evaluation queue.
+            submission_ids: The Synapse IDs of the submissions.
+
+        Raises:
+            ValueError: If any submission isn't in the evaluation queue.
+
+        Returns:
+            The submission status objects keyed by submission ID.
+
+        """
+        remaining = {str(submission_id) for submission_id in submission_ids}
+        statuses: dict[str, dict[str, Any]] = dict()
+        offset = 0
+        while remaining:
+            uri = (
+                f"/evaluation/{evaluation_id}/submission/status/all"
+                f"?limit={self.status_page_size}&offset={offset}"
+            )
+            page = self.client.restGET(uri)
+            results = page["results"]
+            for status in results:
+                if status["id"] in remaining:
+                    remaining.remove(status["id"])
+                    statuses[status["id"]] = status
+            offset += len(results)
+            if not results or offset >= page["totalNumberOfResults"]:
+                break
+        if remaining:
+            message = (
+                f"Submissions {sorted(remaining)} aren't in the evaluation "
+                f"queue ({evaluation_id})."
+            )
+            raise ValueError(message)
+        return statuses
+
+    def get_submission_status(self, submission_id: Union[int, str]) -> dict[str, Any]:
+        """
+        Get the current status of a single submission.
+
+        Arguments:
+            submission_id: The Synapse ID of the submission.
+
+        Returns:
+            The submission status object.
+
+        """
+        return self.client.restGET(f"/evaluation/submission/{submission_id}/status")
+
+    def update_submission_statuses(
+        self,
+        mapping: Mapping[Union[int, str], str],
+        evaluation_id: str,
+    ) -> None:
+        """
+        Update the status of many submissions in Synapse using batch updates.
+        Status can be one of:
+        https://rest-docs.synapse.org/rest/org/sagebionetworks/evaluation/model/SubmissionStatusEnum.html
+
+        The current submission statuses are retrieved in bulk from the
+        evaluation queue and then updated in batches, which are sent
+        concurrently. If a batch is rejected because some of its submission
+        statuses were modified in the meantime, only the statuses in that
+        batch are retrieved again (concurrently, one submission at a time)
+        before retrying after a randomized delay.
+
+        Arguments:
+            mapping: The new status for each submission (keyed by the
+                     Synapse ID of the submission).
+            evaluation_id: The Synapse ID of the evaluation queue that
+                           all submissions belong to. It's required since
+                           the batch update endpoint and the bulk retrieval
+                           of statuses are both scoped to a queue.
+
+        Raises:
+            SynapseHTTPError: If a batch update still fails after
+                              ``max_attempts`` attempts.
+
+        """
+        # Let's catch for anything that was fed that is NOT a str or int
+        if any(type(submission_id) not in [str, int] for submission_id in mapping):
+            raise TypeError("``submission_id`` must be a string or int.")
+
+        new_statuses = {str(key): value for key, value in mapping.items()}
+        submission_ids = list(new_statuses)
+        current_statuses = self.get_submission_statuses(evaluation_id, submission_ids)
+
+        def update_batch(batch_ids: list[str]) -> None:
+            statuses = [current_statuses[submission_id] for submission_id in batch_ids]
+            for attempt in range(1, self.max_attempts + 1):
+                for submission_id, status in zip(batch_ids, statuses):
+                    status["status"] = new_statuses[submission_id]
+                body = {"statuses": statuses, "isFirstBatch": True, "isLastBatch": True}
+                uri = f"/evaluation/{evaluation_id}/statusBatch"
+                try:
+                    self.client.restPUT(uri, body=json.dumps(body))
+                    return
+                except SynapseHTTPError as error:
+                    response = error.response
+                    is_conflict = response is not None and response.status_code == 412
+                    if not is_conflict or attempt == self.max_attempts:
+                        raise
+                    # Full jitter spreads out the retries of conflicting batches
+                    delay = random.uniform(0, self.backoff_factor * 2 ** (attempt - 1))
+                    logger.warning(
+                        f"Conflicting update for a batch of {len(batch_ids)} "
+                        f"submission status(es) (attempt {attempt}). "
+                        f"Retrying in {delay:.1f} seconds..."
+                    )
+                    time.sleep(delay)
+                    get_status = self.get_submission_status
+                    statuses = list(refresh_executor.map(get_status, batch_ids))
+
+        size = self.batch_size
+        batches = [
+            submission_ids[i : i + size] for i in range(0, len(submission_ids), size)
+        ]
+        # Refreshes use their own threads so they never wait behind batches
+        refresh_executor = ThreadPoolExecutor(self.max_workers)
+        with refresh_executor, ThreadPoolExecutor(self.max_workers) as executor:
+            list(executor.map(update_batch, batches))
+
+    def upload_directory(
+        self, local_dir: str, remote_dir: str
+    ) -> dict[str, "TransferResult"]:
+        """
+        Upload a local directory to Synapse using ``SynapseOps.fs``.
+
+        Files are uploaded concurrently and streamed in chunks. Files that
+        already exist in Synapse with the same size and MD5 checksum are
+        skipped.
+
+        Arguments:
+            local_dir: The local directory to upload.
+            remote_dir: The destination path in ``SynapseOps.fs``, which
+                        can start with a Synapse ID (e.g., ``syn123/foo``).
+
+        Returns:
+            The result for each file (keyed by relative path), which
+            includes the error message if the file failed to transfer.
+
+        """
+        from orca.services.synapse.transfer import upload_directory
+
+        return upload_directory(local_dir, self.fs, remote_dir, self.max_workers)
+
+    def download_directory(
+        self, remote_dir: str, local_dir: str, cache_dir: Optional[str] = None
+    ) -> dict[str, "TransferResult"]:
+        """
+        Download a directory from Synapse using ``SynapseOps.fs``.
+
+        Files are downloaded concurrently and streamed in chunks. Local
+        files with the same size and MD5 checksum are skipped.
+
+        Arguments:
+            remote_dir: The path in ``SynapseOps.fs`` to download, which
+                        can start with a Synapse ID (e.g., ``syn123/foo``).
+            local_dir: The local destination directory.
+            cache_dir: A directory for caching downloaded files by MD5
+                       checksum, so the same content is only downloaded
+                       once across runs. Defaults to None (no cache).
+
+        Returns:
+            The result for each file (keyed by relative path), which
+            includes the error message if the file failed to transfer.
+
+        """
+        from orca.services.synapse.transfer import download_directory
+
+        return download_directory(
+            self.fs, remote_dir, local_dir, cache_dir, self.max_workers
+        )
@@ -0,0 +1,302 @@
+"""Bulk transfers between local directories and Synapse file systems.
+
+These helpers work with any PyFilesystem2 file system, but they are
+meant for ``SynapseFS``. File contents are streamed in chunks, so memory
+usage doesn't depend on file sizes, and files are transferred
+concurrently. Files that are already present with the same size and
+MD5 checksum are skipped, while files without a known checksum are
+always transferred again. A failed transfer doesn't interrupt the
+others, but it's reported in the results with its error.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from fs.base import FS
+from fs.errors import ResourceNotFound
+from fs.path import dirname, join, relpath
+
+from orca.services.base.transfer import (
+    CHUNK_SIZE,
+    TransferOutcome,
+    TransferResult,
+    is_same_file,
+)
+
+
+@dataclass
+class RemoteFileInfo:
+    """Details about a remote file that are needed for transfers.
+
+    Attributes:
+        size: File size in bytes.
+        md5: Hexadecimal MD5 checksum (if the file system exposes it).
+    """
+
+    size: int
+    md5: Optional[str] = None
+
+
+def get_remote_info(remote_fs: FS, path: str) -> Optional[RemoteFileInfo]:
+    """Retrieve the size and checksum of a remote file in one request.
+
+    Args:
+        remote_fs: Remote file system.
+        path: Remote file path.
+
+    Returns:
+        Details about the remote file, or None if it isn't a file.
+    """
+    try:
+        info = remote_fs.getinfo(path, namespaces=["details", "synapse"])
+    except ResourceNotFound:
+        return None
+    if info.is_dir:
+        return None
+    return RemoteFileInfo(info.size, info.get("synapse", "content_md5"))
+
+
+class ContentCache:
+    """Local cache of downloaded files addressed by MD5 checksum.
+
+    Attributes:
+        directory: Cache directory.
+    """
+
+    def __init__(self, directory: str) -> None:
+        """Construct a cache in a directory.
+
+        Args:
+            directory: Cache directory, which is created if needed.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def get_path(self, md5: str) -> str:
+        """Get the cache path for some content.
+
+        Args:
+            md5: Hexadecimal MD5 checksum of the content.
+
+        Returns:
+            The cache path, whether or not the content is cached.
+        """
+        return os.path.join(self.directory, md5[:2], md5)
+
+    def fetch(self, md5: str, path: str) -> bool:
+        """Copy cached content to a local path (if available and intact).
+
+        The checksum of the cached content is verified while it's copied,
+        and corrupted content is evicted from the cache.
+
+        Args:
+            md5: Hexadecimal MD5 checksum of the content.
+            path: Destination path.
+
+        Returns:
+            Whether the content was available in the cache.
+        """
+        cache_path = self.get_path(md5)
+        if not os.path.isfile(cache_path):
+            return False
+        tmp_path = f"{path}.part"
+        actual_md5 = hashlib.md5()
+        with open(cache_path, "rb") as source, open(tmp_path, "wb") as target:
+            while chunk := source.read(CHUNK_SIZE):
+                actual_md5.update(chunk)
+                target.write(chunk)
+        if actual_md5.hexdigest() != md5:
+            os.remove(tmp_path)
+            os.remove(cache_path)
+            return False
+        os.replace(tmp_path, path)
+        return True
+
+    def store(self, md5: str, path: str) -> None:
+        """Add the content of a local file to the cache.
+
+        The file is copied rather than linked into the cache, so later
+        changes to the local file don't affect the cached content.
+
+        Args:
+            md5: Hexadecimal MD5 checksum of the content.
+            path: Local file path.
+        """
+        cache_path = self.get_path(md5)
+        if os.path.isfile(cache_path):
+            return
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.part"
+        shutil.copyfile(path, tmp_path)
+        os.replace(tmp_path, cache_path)
+
+
+def upload_file(local_path: str, remote_fs: FS, path: str) -> TransferOutcome:
+    """Upload a local file unless an identical remote file exists.
+
+    Args:
+        local_path: Local file path.
+        remote_fs: Remote file system.
+        path: Remote file path.
+
+    Returns:
+        Whether the file was transferred or skipped.
+    """
+    remote = get_remote_info(remote_fs, path)
+    if remote is not None and is_same_file(local_path, remote.size, remote.md5):
+        return TransferOutcome.SKIPPED
+    with open(local_path, "rb") as source, remote_fs.openbin(path, "w") as target:
+        shutil.copyfileobj(source, target, CHUNK_SIZE)
+    return TransferOutcome.TRANSFERRED
+
+
+def download_file(
+    remote_fs: FS, path: str, local_path: str, cache: Optional[ContentCache] = None
+) -> TransferOutcome:
+    """Download a remote file unless an identical local file exists.
+
+    The download is written to a temporary file that only replaces the
+    destination once its checksum was verified (if known).
+
+    Args:
+        remote_fs: Remote file system.
+        path: Remote file path.
+        local_path: Local file path.
+        cache: Content-addressed cache for downloaded files. Defaults to
+            None, in which case files are always downloaded.
+
+    Raises:
+        ResourceNotFound: If the remote file doesn't exist.
+        IOError: If the checksum of the downloaded file doesn't match.
+
+    Returns:
+        Whether the file was transferred, copied from the cache,
+        or skipped.
+    """
+    remote = get_remote_info(remote_fs, path)
+    if remote is None:
+        raise ResourceNotFound(path)
+    if is_same_file(local_path, remote.size, remote.md5):
+        return TransferOutcome.SKIPPED
+    os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
+    expected_md5 = remote.md5
+    if cache is not None and expected_md5 is not None:
+        if cache.fetch(expected_md5, local_path):
+            return TransferOutcome.CACHED
+
+    md5 = hashlib.md5()
+    tmp_path = f"{local_path}.part"
+    with remote_fs.openbin(path) as source, open(tmp_path, "wb") as target:
+        while chunk := source.read(CHUNK_SIZE):
+            md5.update(chunk)
+            target.write(chunk)
+    if expected_md5 is not None and md5.hexdigest() != expected_md5:
+        os.remove(tmp_path)
+        raise IOError(f"Checksum mismatch for downloaded file ({path}).")
+    os.replace(tmp_path, local_path)
+
+    if cache is not None:
+        cache.store(md5.hexdigest(), local_path)
+    return TransferOutcome.TRANSFERRED
+
+
+def run_transfers(
+    transfer: Callable[[str], TransferOutcome], rel_paths: list[str], max_workers: int
+) -> dict[str, TransferResult]:
+    """Transfer files concurrently while isolating failures.
+
+    Args:
+        transfer: Function transferring the file at a relative path.
+        rel_paths: Relative paths of the files.
+        max_workers: Maximum number of concurrent transfers.
+
+    Returns:
+        The result for each file (keyed by relative path), including
+        the error message for each failed transfer.
+    """
+    results: dict[str, TransferResult] = dict()
+    with ThreadPoolExecutor(max_workers) as executor:
+        futures = {
+            rel_path: executor.submit(transfer, rel_path) for rel_path in rel_paths
+        }
+        for rel_path, future in futures.items():
+            error = future.exception()
+            if error is None:
+                results[rel_path] = TransferResult(rel_path, future.result())
+            else:
+                message = f"{type(error).__name__}: {error}"
+                failure = TransferResult(rel_path, TransferOutcome.FAILED, message)
+                results[rel_path] = failure
+    return results
+
+
+def upload_directory(
+    local_dir: str, remote_fs: FS, remote_dir: str, max_workers: int = 4
+) -> dict[str, TransferResult]:
+    """Upload a local directory recursively and concurrently.
+
+    Args:
+        local_dir: Local directory.
+        remote_fs: Remote file system.
+        remote_dir: Remote destination directory.
+        max_workers: Maximum number of concurrent uploads.
+
+    Returns:
+        The result for each file (keyed by relative path).
+    """
+    rel_paths = list()
+    for root, _, names in os.walk(local_dir):
+        for name in names:
+            rel_path = os.path.relpath(os.path.join(root, name), local_dir)
+            rel_paths.append(rel_path.replace(os.sep, "/"))
+    rel_paths.sort()
+
+    # Directories are created upfront to avoid races between uploads
+    for rel_dir in sorted({dirname(rel_path) for rel_path in rel_paths}):
+        remote_fs.makedirs(join(remote_dir, rel_dir), recreate=True)
+
+    def upload(rel_path: str) -> TransferOutcome:
+        local_path = os.path.join(local_dir, *rel_path.split("/"))
+        return upload_file(local_path, remote_fs, join(remote_dir, rel_path))
+
+    return run_transfers(upload, rel_paths, max_workers)
+
+
+def download_directory(
+    remote_fs: FS,
+    remote_dir: str,
+    local_dir: str,
+    cache_dir: Optional[str] = None,
+    max_workers: int = 4,
+) -> dict[str, TransferResult]:
+    """Download a remote directory recursively and concurrently.
+
+    Args:
+        remote_fs: Remote file system.
+        remote_dir: Remote directory.
+        local_dir: Local destination directory.
+        cache_dir: Directory for a content-addressed cache of downloaded
+            files, which avoids downloading the same content again across
+            runs. Defaults to None, in which case no cache is used.
+        max_workers: Maximum number of concurrent downloads.
+
+    Returns:
+        The result for each file (keyed by relative path).
+    """
+    cache = None if cache_dir is None else ContentCache(cache_dir)
+    rel_paths = sorted(
+        relpath(path[len(remote_dir.rstrip("/")) :])
+        for path in remote_fs.walk.files(remote_dir)
+    )
+
+    def download(rel_path: str) -> TransferOutcome:
+        local_path = os.path.join(local_dir, *rel_path.split("/"))
+        return download_file(remote_fs, join(remote_dir, rel_path), local_path, cache)
+
+    return run_transfers(download, rel_paths, max_workers)
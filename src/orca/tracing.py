@@ -0,0 +1,411 @@
+"""Lightweight tracing for orca operations and client requests.
+
+Spans are nested as follows: ops method (e.g., ``launch_workflow``),
+then client call (e.g., ``NextflowTowerClient.get_compute_env``), and
+finally individual HTTP attempts. The tracing backend is pluggable
+using ``set_tracer()``. By default, a no-op tracer is used, in which
+case traced functions are called directly with negligible overhead.
+
+Example:
+    Record the spans of a workflow launch and save them as a Chrome
+    trace, which can be loaded as a flame chart in Perfetto or in the
+    ``chrome://tracing`` page::
+
+        tracer = RecordingTracer()
+        set_tracer(tracer)
+        ops.launch_workflow(launch_info)
+        tracer.export("launch.json", format="chrome")
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from inspect import iscoroutinefunction, isgeneratorfunction
+from typing import Any, Callable, ContextManager, Iterator, Optional, TypeVar
+
+Function = TypeVar("Function", bound=Callable[..., Any])
+
+# Attribute set on traced functions to avoid wrapping them twice
+TRACED_MARKER = "__orca_traced__"
+
+
+@dataclass
+class Span:
+    """Timed operation within a trace.
+
+    Attributes:
+        name: Span name.
+        trace_id: Identifier shared by all spans of a trace.
+        span_id: Identifier for this span.
+        parent_id: Identifier for the parent span (if any).
+        start_time: Start time in nanoseconds since the epoch.
+        end_time: End time in nanoseconds since the epoch.
+        attributes: Additional details about the operation.
+        error: Description of the error raised in the span (if any).
+        thread_id: Identifier of the thread that started the span.
+    """
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start_time: int = field(default_factory=time.time_ns)
+    end_time: Optional[int] = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    thread_id: int = field(default_factory=threading.get_ident)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Add or update a span attribute.
+
+        Args:
+            key: Attribute name.
+            value: Attribute value (ideally, a string or number).
+        """
+        self.attributes[key] = value
+
+    @property
+    def duration(self) -> int:
+        """Span duration in nanoseconds (zero if ongoing)."""
+        if self.end_time is None:
+            return 0
+        return self.end_time - self.start_time
+
+
+class Tracer(ABC):
+    """Base class for tracing backends.
+
+    Class Variables:
+        enabled: Whether spans are recorded by this tracer. Traced
+            functions skip all tracing logic if this is false.
+    """
+
+    enabled: bool = True
+
+    @abstractmethod
+    def start_span(
+        self, name: str, attributes: Optional[dict[str, Any]] = None
+    ) -> ContextManager[Any]:
+        """Start a span that ends when the context manager exits.
+
+        Args:
+            name: Span name.
+            attributes: Initial span attributes.
+
+        Returns:
+            A context manager yielding an object with a
+            ``set_attribute()`` method or ``None``.
+        """
+
+
+class NoopTracer(Tracer):
+    """Tracer that doesn't record anything (default)."""
+
+    enabled = False
+
+    _context = nullcontext()
+
+    def start_span(
+        self, name: str, attributes: Optional[dict[str, Any]] = None
+    ) -> ContextManager[None]:
+        """Return a reusable context manager that yields ``None``.
+
+        Args:
+            name: Span name (ignored).
+            attributes: Initial span attributes (ignored).
+
+        Returns:
+            A no-op context manager.
+        """
+        return self._context
+
+
+class RecordingTracer(Tracer):
+    """Tracer that records finished spans in memory.
+
+    Recorded spans can be exported to a local file, which avoids
+    the need for an external collector.
+    """
+
+    def __init__(self, service_name: str = "orca"):
+        """Construct a tracer without any spans.
+
+        Args:
+            service_name: Name of the traced service (used
+                by the OTLP export format).
+        """
+        self.service_name = service_name
+        self.spans: list[Span] = list()
+        self._current: ContextVar[Optional[Span]] = ContextVar(
+            "current_span", default=None
+        )
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def start_span(
+        self, name: str, attributes: Optional[dict[str, Any]] = None
+    ) -> Iterator[Span]:
+        """Start a span that ends when the context manager exits.
+
+        The new span is a child of the current span in this context
+        (i.e., thread or asyncio task), if any.
+
+        Args:
+            name: Span name.
+            attributes: Initial span attributes.
+
+        Yields:
+            The ongoing span.
+        """
+        parent = self._current.get()
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else secrets.token_hex(16),
+            span_id=secrets.token_hex(8),
+            parent_id=parent.span_id if parent else None,
+            attributes=dict(attributes or {}),
+        )
+        token = self._current.set(span)
+        try:
+            yield span
+        except BaseException as error:
+            span.error = f"{type(error).__name__}: {error}"
+            raise
+        finally:
+            span.end_time = time.time_ns()
+            self._current.reset(token)
+            with self._lock:
+                self.spans.append(span)
+
+    def clear(self) -> None:
+        """Discard all recorded spans."""
+        with self._lock:
+            self.spans.clear()
+
+    def to_otlp(self) -> dict[str, Any]:
+        """Convert recorded spans to the OTLP/JSON format.
+
+        Returns:
+            An OTLP ``ExportTraceServiceRequest`` as a dictionary.
+        """
+
+        def encode_value(value: Any) -> dict[str, Any]:
+            if isinstance(value, bool):
+                return {"boolValue": value}
+            elif isinstance(value, int):
+                return {"intValue": str(value)}
+            elif isinstance(value, float):
+                return {"doubleValue": value}
+            return {"stringValue": str(value)}
+
+        def encode_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+            items = attributes.items()
+            return [{"key": k, "value": encode_value(v)} for k, v in items]
+
+        otlp_spans = list()
+        for span in self.spans:
+            otlp_span = {
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": 1,  # SPAN_KIND_INTERNAL
+                "startTimeUnixNano": str(span.start_time),
+                "endTimeUnixNano": str(span.end_time),
+                "attributes": encode_attributes(span.attributes),
+                "status": {"code": 2, "message": span.error} if span.error else {},
+            }
+            if span.parent_id:
+                otlp_span["parentSpanId"] = span.parent_id
+            otlp_spans.append(otlp_span)
+
+        resource = {
+            "attributes": encode_attributes({"service.name": self.service_name})
+        }
+        scope_spans = [{"scope": {"name": "orca"}, "spans": otlp_spans}]
+        return {"resourceSpans": [{"resource": resource, "scopeSpans": scope_spans}]}
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Convert recorded spans to the Chrome trace event format.
+
+        Returns:
+            A Chrome trace as a dictionary.
+        """
+        events = list()
+        for span in sorted(self.spans, key=lambda span: span.start_time):
+            args = dict(span.attributes)
+            if span.error:
+                args["error"] = span.error
+            event = {
+                "name": span.name,
+                "ph": "X",  # Complete event (with duration)
+                "ts": span.start_time / 1000,
+                "dur": span.duration / 1000,
+                "pid": os.getpid(),
+                "tid": span.thread_id,
+                "args": args,
+            }
+            events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path: str, format: str = "otlp") -> None:
+        """Write recorded spans to a local JSON file.
+
+        Args:
+            path: Output file path.
+            format: Either "otlp" (OTLP/JSON, which can be imported
+                by OpenTelemetry-compatible tools) or "chrome" (Chrome
+                trace event format, which can be viewed as a flame
+                chart). Defaults to "otlp".
+
+        Raises:
+            ValueError: If the format isn't supported.
+        """
+        with self._lock:
+            if format == "otlp":
+                content = self.to_otlp()
+            elif format == "chrome":
+                content = self.to_chrome_trace()
+            else:
+                message = f"Unsupported trace format ({format})."
+                raise ValueError(message)
+        with open(path, "w") as file:
+            json.dump(content, file)
+
+
+class OpenTelemetryTracer(Tracer):
+    """Tracer that forwards spans to OpenTelemetry.
+
+    This requires the ``opentelemetry-api`` package, which is
+    imported when the tracer is constructed.
+    """
+
+    def __init__(self, tracer_provider: Any = None):
+        """Construct a tracer using an OpenTelemetry tracer provider.
+
+        Args:
+            tracer_provider: OpenTelemetry tracer provider. Defaults
+                to the globally configured provider.
+        """
+        from opentelemetry import trace
+
+        self._tracer = trace.get_tracer("orca", tracer_provider=tracer_provider)
+
+    def start_span(
+        self, name: str, attributes: Optional[dict[str, Any]] = None
+    ) -> ContextManager[Any]:
+        """Start an OpenTelemetry span as the current span.
+
+        Args:
+            name: Span name.
+            attributes: Initial span attributes.
+
+        Returns:
+            A context manager yielding an OpenTelemetry span.
+        """
+        return self._tracer.start_as_current_span(name, attributes=attributes)
+
+
+_tracer: Tracer = NoopTracer()
+
+
+def get_tracer() -> Tracer:
+    """Retrieve the active tracer.
+
+    Returns:
+        The active tracer.
+    """
+    return _tracer
+
+
+def set_tracer(tracer: Optional[Tracer]) -> None:
+    """Activate a tracer for all orca operations.
+
+    Args:
+        tracer: New active tracer. Use ``None`` to disable tracing.
+    """
+    global _tracer
+    _tracer = tracer or NoopTracer()
+
+
+def traced(func: Function) -> Function:
+    """Trace calls of a function or coroutine function in a span.
+
+    The span is named after the qualified function name. For generator
+    functions, each resumption of the generator is traced in its own
+    span (with a ``step`` attribute) rather than only its creation. The
+    span is never left open while the caller has control, so spans
+    started by the caller between items aren't nested in it and the
+    generator can be resumed from other contexts (e.g., threads).
+
+    Args:
+        func: Function to trace.
+
+    Returns:
+        Wrapped function.
+    """
+    if getattr(func, TRACED_MARKER, False):
+        return func
+
+    name = func.__qualname__
+
+    if iscoroutinefunction(func):
+
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            """Await the coroutine function within a span."""
+            tracer = _tracer
+            if not tracer.enabled:
+                return await func(*args, **kwargs)
+            with tracer.start_span(name):
+                return await func(*args, **kwargs)
+
+        wrapper: Any = async_wrapper
+    elif isgeneratorfunction(func):
+
+        @wraps(func)
+        def generator_wrapper(*args, **kwargs):
+            """Resume the generator within a span for each step."""
+            tracer = _tracer
+            generator = func(*args, **kwargs)
+            if not tracer.enabled:
+                return (yield from generator)
+            resume, value = generator.send, None
+            step = 0
+            while True:
+                with tracer.start_span(name, {"step": step}):
+                    try:
+                        item = resume(value)
+                    except StopIteration as stop:
+                        return stop.value
+                step += 1
+                try:
+                    resume, value = generator.send, (yield item)
+                except GeneratorExit:
+                    generator.close()
+                    raise
+                except BaseException as error:
+                    resume, value = generator.throw, error
+
+        wrapper = generator_wrapper
+    else:
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            """Call the function within a span."""
+            tracer = _tracer
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with tracer.start_span(name):
+                return func(*args, **kwargs)
+
+    setattr(wrapper, TRACED_MARKER, True)
+    return wrapper
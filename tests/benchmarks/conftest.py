@@ -0,0 +1,27 @@
+import pytest
+
+from orca.services.nextflowtower import (
+    NextflowTowerClient,
+    NextflowTowerConfig,
+    NextflowTowerOps,
+)
+from orca.services.nextflowtower.fake import FakeTower, FakeTowerTransport
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.fixture
+def make_tower_ops(patch_os_environ):
+    def _make_tower_ops(tower: FakeTower) -> NextflowTowerOps:
+        client = NextflowTowerClient("foo", "http://fake/api")
+        client.transport = FakeTowerTransport(tower)
+        config = NextflowTowerConfig(
+            api_endpoint="http://fake/api",
+            auth_token="foo",
+            workspace=tower.workspace_name,
+        )
+        ops = NextflowTowerOps(config)
+        ops.client = client
+        return ops
+
+    yield _make_tower_ops
@@ -0,0 +1,54 @@
+"""Record the cassettes replayed by the Nextflow Tower benchmarks.
+
+The traffic is recorded from a fake Tower server, so the cassettes can
+be regenerated offline whenever the requests made by orca change.
+
+Usage:
+    python -m tests.benchmarks.record_cassettes
+"""
+
+import asyncio
+import os
+
+from orca.services.nextflowtower import (
+    LaunchInfo,
+    NextflowTowerClient,
+    NextflowTowerConfig,
+    NextflowTowerOps,
+)
+from orca.services.nextflowtower.fake import FakeTower, FakeTowerTransport
+from orca.services.nextflowtower.transport import RecordingTransport
+
+CASSETTE_DIR = os.path.join(os.path.dirname(__file__), "cassettes")
+
+LAUNCH_AND_MONITOR_CASSETTE = os.path.join(CASSETTE_DIR, "launch_and_monitor.json")
+
+
+def make_ops(transport):
+    api_endpoint = "http://fake/api"
+    config = NextflowTowerConfig(
+        api_endpoint=api_endpoint,
+        auth_token="foo",
+        workspace=FakeTower().workspace_name,
+    )
+    ops = NextflowTowerOps(config)
+    ops.client = NextflowTowerClient("foo", api_endpoint)
+    ops.client.transport = transport
+    return ops
+
+
+def launch_and_monitor(ops):
+    launch_info = LaunchInfo(pipeline="nf-core/demo", run_name="orca-benchmark")
+    run_id = ops.launch_workflow(launch_info)
+    return asyncio.run(ops.monitor_workflow(run_id, wait_time=0))
+
+
+def main():
+    path = LAUNCH_AND_MONITOR_CASSETTE
+    with RecordingTransport(path, FakeTowerTransport(FakeTower())) as transport:
+        launch_and_monitor(make_ops(transport))
+    print(f"Recorded {len(transport.interactions)} interaction(s) in {path}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import pytest
+
+from orca.services.nextflowtower import (
+    NextflowTowerClient,
+    NextflowTowerClientFactory,
+    NextflowTowerConfig,
+    NextflowTowerOps,
+)
+from orca.services.nextflowtower.fake import FakeTower, FakeTowerTransport
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.mark.parametrize(
+    "policy",
+    [
+        "always",
+        pytest.param("ttl", marks=pytest.mark.microbenchmark),
+        pytest.param("lazy", marks=pytest.mark.microbenchmark),
+    ],
+)
+def test_client_validation(benchmark, mocker, patch_os_environ, policy):
+    tower = FakeTower(latency=0.01)
+
+    def create_client(self):
+        client = NextflowTowerClient("foo", "http://fake/api")
+        client.transport = FakeTowerTransport(tower)
+        return client
+
+    mocker.patch.object(NextflowTowerClientFactory, "create_client", create_client)
+    env_var = NextflowTowerClientFactory.validation_policy_env_var
+    mocker.patch.dict("os.environ", {env_var: policy})
+    config = NextflowTowerConfig(
+        api_endpoint="http://fake/api",
+        auth_token="foo",
+        workspace=tower.workspace_name,
+    )
+
+    clients = list()
+    benchmark.pedantic(
+        lambda: clients.append(NextflowTowerOps(config).client), rounds=20
+    )
+    expected_requests = {"always": len(clients), "ttl": 1, "lazy": 0}
+    assert tower.num_requests == expected_requests[policy]
@@ -0,0 +1,16 @@
+import pytest
+from airflow.models.connection import Connection
+
+from orca.services.base.connection import ConnectionInfo
+
+pytestmark = pytest.mark.benchmark
+
+CONNECTION_URI = "tower://:foo@api.tower.nf/?workspace=bar/baz"
+
+
+@pytest.mark.microbenchmark
+@pytest.mark.parametrize("parser", ["builtin", "airflow"])
+def test_connection_parsing(benchmark, parser):
+    parse = ConnectionInfo.from_uri if parser == "builtin" else Connection
+    connection = benchmark(parse, uri=CONNECTION_URI)
+    assert connection.extra_dejson == {"workspace": "bar/baz"}
@@ -0,0 +1,158 @@
+import asyncio
+
+import pytest
+
+from orca.services.nextflowtower import LaunchInfo
+from orca.services.nextflowtower.fake import FakeTower
+from orca.services.nextflowtower.instrumentation import HistogramSink
+from orca.services.nextflowtower.models import ComputeEnv, Workflow, WorkflowTask
+from orca.services.nextflowtower.transport import ReplayTransport
+
+from ..services.nextflowtower import responses
+from ..test_lazy import TOWER_OPS_IMPORT, measure_import
+from .record_cassettes import LAUNCH_AND_MONITOR_CASSETTE, launch_and_monitor, make_ops
+
+pytestmark = pytest.mark.benchmark
+
+# Startup budget (in seconds) for importing the Nextflow Tower ops, which
+# is well below the time needed to import Airflow or synapseclient alone
+STARTUP_BUDGET = 0.5
+
+# Number of requests made by `NextflowTowerOps.launch_workflow()` when
+# nothing is cached yet; update this number when it's lowered
+LAUNCH_WORKFLOW_REQUESTS = 10
+
+
+@pytest.mark.microbenchmark
+@pytest.mark.parametrize(
+    "model, json",
+    [
+        (Workflow, responses.get_workflow["workflow"]),
+        (WorkflowTask, responses.get_workflow_tasks["tasks"][0]["task"]),
+        (ComputeEnv, responses.get_compute_env["computeEnv"]),
+    ],
+    ids=["Workflow", "WorkflowTask", "ComputeEnv"],
+)
+def test_model_parsing(benchmark, model, json):
+    instance = benchmark(model.from_json, json)
+    assert instance.raw == json
+
+
+@pytest.mark.parametrize("num_pages", [1, 10, 100])
+def test_request_paged(benchmark, make_tower_ops, num_pages):
+    tower = FakeTower()
+    label = {"value": None, "resource": False}
+    tower.labels = [{"id": i, "name": str(i), **label} for i in range(50 * num_pages)]
+    client = make_tower_ops(tower).client
+    json = benchmark(lambda: client.request_paged("GET", "/labels"))
+    assert json["totalSize"] == len(tower.labels)
+
+
+@pytest.mark.parametrize("latency", [0.0, 0.001], ids=["no-latency", "1ms-latency"])
+def test_launch_workflow(benchmark, make_tower_ops, latency):
+    sinks = list()
+
+    def setup():
+        ops = make_tower_ops(FakeTower(latency=latency))
+        sink = HistogramSink()
+        ops.client.listeners.append(sink)
+        sinks.append(sink)
+        launch_info = LaunchInfo(pipeline="nf-core/demo", run_name="foo")
+        return (ops, launch_info), {}
+
+    def launch_workflow(ops, launch_info):
+        return ops.launch_workflow(launch_info)
+
+    benchmark.pedantic(launch_workflow, setup=setup, rounds=20)
+    num_requests = sum(histogram.count for histogram in sinks[-1].latencies.values())
+    assert num_requests <= LAUNCH_WORKFLOW_REQUESTS
+
+
+@pytest.mark.parametrize("num_runs", [10, 100])
+def test_monitor_workflow(benchmark, make_tower_ops, num_runs):
+    launch = {"computeEnvId": "foo", "pipeline": "nf-core/demo", "workDir": "foo"}
+
+    def setup():
+        tower = FakeTower()
+        ops = make_tower_ops(tower)
+        ops.workspace_id  # Cache the workspace ID outside of the benchmark
+        responses = [tower.launch({"launch": launch}) for _ in range(num_runs)]
+        run_ids = [response.body["workflowId"] for response in responses]
+        return (ops, run_ids), {}
+
+    async def monitor_workflows(ops, run_ids):
+        coroutines = [ops.monitor_workflow(run_id, wait_time=0) for run_id in run_ids]
+        return await asyncio.gather(*coroutines)
+
+    def target(ops, run_ids):
+        return asyncio.run(monitor_workflows(ops, run_ids))
+
+    statuses = benchmark.pedantic(target, setup=setup, rounds=5)
+    assert all(status.is_done for status in statuses)
+
+
+def test_launch_and_monitor_workflow_replayed(benchmark, patch_os_environ):
+    transport = ReplayTransport(LAUNCH_AND_MONITOR_CASSETTE)
+
+    def setup():
+        transport.reset()
+        return (make_ops(transport),), {}
+
+    status = benchmark.pedantic(launch_and_monitor, setup=setup, rounds=20)
+    assert status.is_done
+
+
+def make_large_launch_info(num_rows):
+    columns = ["sample", "fastq_1", "fastq_2", "strandedness"]
+    samplesheet = [
+        {column: f"{column}_{i}" for column in columns} for i in range(num_rows)
+    ]
+    return LaunchInfo(
+        compute_env_id="5ykJF",
+        pipeline="nf-core/rnaseq",
+        work_dir="s3://foo/work",
+        params={"input": samplesheet, "outdir": "s3://foo/outputs"},
+        profiles=["docker"] * 10,
+    )
+
+
+@pytest.mark.parametrize(
+    "canonical",
+    [False, pytest.param(True, marks=pytest.mark.microbenchmark)],
+    ids=["plain", "canonical"],
+)
+@pytest.mark.parametrize("num_rows", [100, 10_000])
+def test_launch_info_to_json(benchmark, num_rows, canonical):
+    # Only the canonical parameters are cached across calls
+    launch_info = make_large_launch_info(num_rows)
+    json = benchmark(launch_info.to_json, canonical)
+    assert json["launch"]["paramsText"]
+
+
+@pytest.mark.parametrize(
+    "cached",
+    [False, pytest.param(True, marks=pytest.mark.microbenchmark)],
+    ids=["uncached", "cached"],
+)
+@pytest.mark.parametrize("num_rows", [100, 10_000])
+def test_launch_info_fingerprint(benchmark, num_rows, cached):
+    launch_info = make_large_launch_info(num_rows)
+
+    def fingerprint():
+        if not cached:
+            launch_info.invalidate()
+        return launch_info.fingerprint
+
+    assert benchmark(fingerprint) == make_large_launch_info(num_rows).fingerprint
+
+
+def test_tower_ops_import(benchmark):
+    import_times = []
+
+    def import_tower_ops():
+        modules = measure_import(TOWER_OPS_IMPORT)
+        import_times.append(sum(modules.values()))
+
+    benchmark.pedantic(import_tower_ops, rounds=5)
+    # The fastest run is compared to the budget to tolerate noisy machines
+    assert min(import_times) < STARTUP_BUDGET
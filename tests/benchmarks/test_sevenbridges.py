@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from orca.services.sevenbridges import SevenBridgesConfig, SevenBridgesOps
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.fixture
+def ops(mocker):
+    config = SevenBridgesConfig(
+        api_endpoint="https://api.sbgenomics.com/v2",
+        auth_token="foo",
+        project="bgrande/sandbox",
+    )
+    mocker.patch.object(SevenBridgesOps, "client")
+    yield SevenBridgesOps(config)
+
+
+def mock_task_query(ops, num_tasks):
+    start = datetime(2023, 1, 1)
+    tasks = [
+        SimpleNamespace(
+            id=str(i),
+            name=f"task-{i}",
+            app="user/project/app/1",
+            created_time=start + timedelta(seconds=i),
+        )
+        for i in range(num_tasks)
+    ]
+
+    # Like the API, only list the tasks created since the watermark
+    def query(created_from=None, **kwargs):
+        if created_from is None:
+            return tasks
+        return [task for task in tasks if task.created_time >= created_from]
+
+    ops.client.tasks.query.side_effect = query
+
+
+@pytest.mark.parametrize("num_tasks", [100, 10_000])
+def test_get_task_cold(benchmark, ops, num_tasks):
+    mock_task_query(ops, num_tasks)
+    target_name = f"task-{num_tasks - 1}"
+
+    def setup():
+        ops.task_index.clear()
+        return (target_name, "user/project/app"), {}
+
+    task_id = benchmark.pedantic(ops.get_task, setup=setup, rounds=10)
+    assert task_id == str(num_tasks - 1)
+
+
+@pytest.mark.microbenchmark
+@pytest.mark.parametrize("num_tasks", [100, 10_000])
+def test_get_task_warm(benchmark, ops, num_tasks):
+    mock_task_query(ops, num_tasks)
+    ops.refresh_task_index()
+    target_name = f"task-{num_tasks - 1}"
+    task_id = benchmark(ops.get_task, target_name, "user/project/app")
+    assert task_id == str(num_tasks - 1)
@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+
+from orca.services.synapse import SynapseConfig, SynapseOps
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.fixture
+def ops(mocker, patch_os_environ):
+    mocker.patch.object(SynapseOps, "client")
+    mocker.patch.object(SynapseOps, "trigger_indexing")
+    yield SynapseOps(SynapseConfig("foo"))
+
+
+def make_rows(num_rows):
+    return ({"values": [str(i)]} for i in range(num_rows))
+
+
+def mock_row_set_query(ops, num_rows):
+    ops.client.tableQuery.side_effect = lambda *args, **kwargs: make_rows(num_rows)
+
+
+def count_submissions(ops):
+    return sum(1 for _ in ops.iter_submissions_with_status("syn123"))
+
+
+@pytest.mark.parametrize("num_rows", [1_000, 100_000])
+def test_get_submissions_with_status(benchmark, ops, num_rows):
+    data_frame = pd.DataFrame({"id": [str(i) for i in range(num_rows)]})
+    ops.client.tableQuery.return_value.asDataFrame.return_value = data_frame
+    submission_ids = benchmark(ops.get_submissions_with_status, "syn123")
+    assert len(submission_ids) == num_rows
+
+
+@pytest.mark.parametrize("num_rows", [1_000, 100_000])
+def test_iter_submissions_with_status(benchmark, ops, num_rows):
+    mock_row_set_query(ops, num_rows)
+    num_submissions = benchmark(count_submissions, ops)
+    assert num_submissions == num_rows
@@ -4,6 +4,9 @@ from uuid import uuid4
 
 import pytest
 
+from orca.services.base.client_factory import VALIDATED_TOKENS
+from orca.services.base.registry import OPS_REGISTRY
+
 UUID = str(uuid4())
 USER = getuser()
 UTCTIME = datetime.now().isoformat("T", "seconds").replace(":", ".")
@@ -18,3 +21,15 @@ def run_id():
 @pytest.fixture
 def patch_os_environ(mocker):
     yield mocker.patch("os.environ", {})
+
+
+@pytest.fixture(autouse=True)
+def clear_ops_registry():
+    yield
+    OPS_REGISTRY.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_validated_tokens():
+    yield
+    VALIDATED_TOKENS.clear()
@@ -44,3 +44,86 @@ def test_that_get_client_calls_test_client_if_test_is_disabled(client_factory, m
     mock = mocker.patch.object(client_factory, "test_client")
     client_factory.get_client(test=False)
     mock.assert_not_called()
+
+
+def set_validation_policy(service, mocker, policy, ttl=None):
+    client_factory_cls = service["client_factory"]
+    environ = {client_factory_cls.validation_policy_env_var: policy}
+    if ttl is not None:
+        environ[client_factory_cls.validation_ttl_env_var] = str(ttl)
+    mocker.patch.dict("os.environ", environ)
+
+
+def test_that_clients_are_tested_once_per_ttl_for_each_token(
+    service, client_factory, mocker
+):
+    set_validation_policy(service, mocker, "ttl", ttl=60)
+    mock_time = mocker.patch("time.monotonic", return_value=0)
+    mock = mocker.patch.object(service["client_factory"], "test_client")
+    other_factory = service["client_factory"](client_factory.config)
+    client_factory.get_client(test=True)
+    other_factory.get_client(test=True)
+    mock.assert_called_once()
+    mock_time.return_value = 60
+    other_factory.get_client(test=True)
+    assert mock.call_count == 2
+
+
+def test_that_failed_client_tests_are_not_cached(service, client_factory, mocker):
+    set_validation_policy(service, mocker, "ttl")
+    mock = mocker.patch.object(service["client_factory"], "test_client")
+    mock.side_effect = ClientRequestError
+    for _ in range(2):
+        with pytest.raises(ClientRequestError):
+            client_factory.get_client(test=True)
+    assert mock.call_count == 2
+
+
+def test_that_clients_are_not_tested_with_the_lazy_policy(
+    service, client_factory, mocker
+):
+    set_validation_policy(service, mocker, "LAZY")
+    mock = mocker.patch.object(client_factory, "test_client")
+    client_factory.get_client(test=True)
+    mock.assert_not_called()
+
+
+def test_for_an_error_when_the_validation_policy_is_invalid(
+    service, client_factory, mocker
+):
+    set_validation_policy(service, mocker, "sometimes")
+    with pytest.raises(ConfigError):
+        client_factory.get_client(test=True)
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class FakeError(Exception):
+    def __init__(self, response=None, status=None):
+        self.response = response
+        self.status = status
+
+
+@pytest.mark.parametrize(
+    "error, expected",
+    [
+        (FakeError(response=FakeResponse(401)), True),
+        (FakeError(response=FakeResponse(403)), False),
+        (FakeError(status=401), True),
+        (ValueError("foo"), False),
+    ],
+)
+def test_that_auth_errors_are_detected(client_factory, error, expected):
+    assert client_factory.is_auth_error(error) is expected
+
+
+def test_that_invalidated_client_tests_are_repeated(service, client_factory, mocker):
+    set_validation_policy(service, mocker, "ttl", ttl=60)
+    mock = mocker.patch.object(service["client_factory"], "test_client")
+    client_factory.get_client(test=True)
+    client_factory.invalidate()
+    client_factory.get_client(test=True)
+    assert mock.call_count == 2
@@ -1,3 +1,5 @@
+from airflow.models.connection import Connection
+
 from orca.services.base import BaseConfig, BaseOps
 
 
@@ -35,3 +37,11 @@ def test_that_config_class_is_set(service):
     hook_cls = service["hook"]
     assert hasattr(hook_cls, "config_class")
     assert issubclass(hook_cls.config_class, BaseConfig)
+
+
+def test_that_hooks_share_ops_for_the_same_connection(service, mocker):
+    hook_cls = service["hook"]
+    connection = Connection(uri=service["connection_uri"])
+    mocker.patch.object(hook_cls, "get_connection", return_value=connection)
+    assert hook_cls("foo").ops is hook_cls("foo").ops
+    assert hook_cls("foo").ops is not hook_cls("bar").ops
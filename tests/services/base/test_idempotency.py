@@ -0,0 +1,130 @@
+import pytest
+from sevenbridges.errors import NotFound
+
+from orca.errors import ConfigError
+from orca.services.base.idempotency import (
+    FileStore,
+    MemoryStore,
+    SqliteStore,
+    get_idempotency_key,
+    open_store,
+)
+from orca.services.sevenbridges import SevenBridgesConfig, SevenBridgesOps
+
+
+@pytest.fixture
+def config(patch_os_environ):
+    yield SevenBridgesConfig("https://api.sbgenomics.com/v2", "foo", "bar/baz")
+
+
+@pytest.fixture
+def ops(config, mocker):
+    ops = SevenBridgesOps(config)
+    ops.client = mocker.MagicMock()
+    ops.client.tasks.create.return_value.id = "123"
+    ops.idempotency_store = MemoryStore()
+    yield ops
+
+
+@pytest.fixture(params=["memory", "sqlite", "file"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        yield MemoryStore()
+    elif request.param == "sqlite":
+        yield SqliteStore(str(tmp_path / "orca.db"))
+    else:
+        yield FileStore(str(tmp_path / "results"))
+
+
+def get_key(ops, *args, **kwargs):
+    return get_idempotency_key(ops, SevenBridgesOps.draft_task, *args, **kwargs)
+
+
+def test_that_equivalent_calls_share_the_same_key(ops):
+    key = get_key(ops, "foo", "bar", {"a": 1, "b": 2})
+    assert get_key(ops, name="foo", app_id="bar", inputs={"b": 2, "a": 1}) == key
+    assert get_key(ops, "foo", "bar", {"a": 1, "b": 3}) != key
+
+
+def test_that_keys_depend_on_the_config_but_not_credentials(ops, config):
+    key = get_key(ops, "foo", "bar", {})
+    config.auth_token = "qux"
+    assert get_key(ops, "foo", "bar", {}) == key
+    config.project = "bar/qux"
+    assert get_key(ops, "foo", "bar", {}) != key
+
+
+def test_that_keys_do_not_depend_on_client_settings(ops, config):
+    key = get_key(ops, "foo", "bar", {})
+    config.client_kwargs = {"error_handlers": [print]}
+    assert get_key(ops, "foo", "bar", {}) == key
+
+
+def test_for_an_error_when_arguments_cannot_be_hashed(ops):
+    with pytest.raises(TypeError):
+        get_key(ops, "foo", "bar", {"a": object()})
+
+
+def test_that_stores_can_set_get_and_delete_results(store):
+    assert store.get("foo") is None
+    store.set("foo", "123")
+    store.set("bar", ["456"])
+    assert store.get("foo") == "123"
+    store.delete("foo")
+    store.delete("foo")
+    assert store.get("foo") is None
+    assert store.get("bar") == ["456"]
+    store.clear()
+    assert store.get("bar") is None
+
+
+@pytest.mark.parametrize("store_class", [SqliteStore, FileStore])
+def test_that_results_persist_across_store_instances(store_class, tmp_path):
+    path = str(tmp_path / "results")
+    store_class(path).set("foo", "123")
+    assert store_class(path).get("foo") == "123"
+
+
+def test_that_stores_can_be_opened_from_uris(tmp_path):
+    assert isinstance(open_store("memory://"), MemoryStore)
+    assert open_store("memory://") is open_store("memory://")
+    sqlite_store = open_store(f"sqlite://{tmp_path}/orca.db")
+    assert isinstance(sqlite_store, SqliteStore)
+    assert sqlite_store.path == f"{tmp_path}/orca.db"
+    assert isinstance(open_store(f"file://{tmp_path}/results"), FileStore)
+    with pytest.raises(ConfigError):
+        open_store("foo://bar")
+
+
+def test_that_the_store_is_opened_from_the_env(config, mocker, tmp_path):
+    env_var = SevenBridgesOps.idempotency_store_env_var
+    mocker.patch.dict("os.environ", {env_var: f"file://{tmp_path}"})
+    assert isinstance(SevenBridgesOps(config).idempotency_store, FileStore)
+
+
+def test_that_the_store_is_disabled_by_default(config):
+    assert SevenBridgesOps(config).idempotency_store is None
+
+
+def test_that_repeat_calls_return_the_stored_result(ops):
+    assert ops.draft_task("foo", "bar", {}) == "123"
+    assert ops.draft_task("foo", "bar", {}) == "123"
+    ops.client.tasks.query.assert_called_once()
+    ops.client.tasks.create.assert_called_once()
+    ops.client.tasks.get.assert_called_once_with("123")
+
+
+def test_that_invalid_stored_results_are_discarded(ops):
+    ops.draft_task("foo", "bar", {})
+    ops.client.tasks.get.side_effect = NotFound()
+    ops.client.tasks.create.return_value.id = "456"
+    ops.task_index.clear()
+    assert ops.draft_task("foo", "bar", {}) == "456"
+    assert ops.client.tasks.create.call_count == 2
+
+
+def test_that_stored_results_are_trusted_without_verification(ops):
+    ops.verify_idempotency = False
+    ops.draft_task("foo", "bar", {})
+    ops.draft_task("foo", "bar", {})
+    ops.client.tasks.get.assert_not_called()
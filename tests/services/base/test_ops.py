@@ -1,7 +1,11 @@
 from dataclasses import fields
 from typing import get_type_hints
 
+import pytest
+
+from orca.errors import ClientRequestError
 from orca.services.base import BaseClientFactory, BaseConfig
+from orca.services.base.ops import reporting_auth_errors
 
 
 def test_that_config_is_set(ops):
@@ -30,3 +34,40 @@ def test_that_a_client_can_be_accessed_from_ops_class(ops, mocker):
     mock = mocker.patch.object(ops.client_factory_class, "get_client")
     ops.client
     mock.assert_called_once()
+
+
+def set_lazy_validation_policy(ops, mocker):
+    env_var = ops.client_factory_class.validation_policy_env_var
+    mocker.patch.dict("os.environ", {env_var: "lazy"})
+
+
+def raise_auth_error():
+    error = Exception("Unauthorized")
+    error.status = 401
+    raise error
+
+
+def test_that_auth_errors_are_reported_and_discard_the_client(ops, mocker):
+    set_lazy_validation_policy(ops, mocker)
+    mocker.patch.object(ops.client_factory_class, "get_client")
+    mock = mocker.patch.object(ops.client_factory_class, "invalidate")
+    ops.client
+    with pytest.raises(ClientRequestError):
+        with reporting_auth_errors(ops):
+            raise_auth_error()
+    mock.assert_called_once()
+    assert "client" not in vars(ops)
+
+
+def test_that_auth_errors_are_left_alone_without_the_lazy_policy(ops):
+    with pytest.raises(Exception, match="Unauthorized") as exc_info:
+        with reporting_auth_errors(ops):
+            raise_auth_error()
+    assert not isinstance(exc_info.value, ClientRequestError)
+
+
+def test_that_other_errors_are_left_alone_by_ops(ops, mocker):
+    set_lazy_validation_policy(ops, mocker)
+    with pytest.raises(ValueError):
+        with reporting_auth_errors(ops):
+            raise ValueError("foo")
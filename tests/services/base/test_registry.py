@@ -0,0 +1,118 @@
+import pytest
+
+from orca.errors import ClientRequestError
+from orca.services.base.registry import OpsRegistry, get_config_fingerprint
+from orca.services.sevenbridges import SevenBridgesConfig, SevenBridgesOps
+
+
+@pytest.fixture
+def config(patch_os_environ):
+    yield SevenBridgesConfig("https://api.sbgenomics.com/v2", "foo", "bar/baz")
+
+
+@pytest.fixture
+def registry():
+    yield OpsRegistry(ttl=60)
+
+
+@pytest.fixture
+def mock_time(mocker):
+    yield mocker.patch("time.monotonic", return_value=0)
+
+
+@pytest.fixture
+def mock_test_client(mocker):
+    yield mocker.patch.object(SevenBridgesOps.client_factory_class, "test_client")
+
+
+def test_that_the_fingerprint_depends_on_the_config_values(config):
+    fingerprint = get_config_fingerprint(config)
+    assert get_config_fingerprint(SevenBridgesConfig(**vars(config))) == fingerprint
+    config.auth_token = "qux"
+    assert get_config_fingerprint(config) != fingerprint
+
+
+def test_that_ops_are_reused_for_the_same_connection(registry, config):
+    ops = registry.get_ops(SevenBridgesOps, config, "foo")
+    assert registry.get_ops(SevenBridgesOps, config, "foo") is ops
+    assert registry.get_ops(SevenBridgesOps, config, "bar") is not ops
+    assert len(registry) == 2
+
+
+def test_that_ops_are_not_reused_after_the_config_changes(registry, config):
+    ops = registry.get_ops(SevenBridgesOps, config, "foo")
+    other_config = SevenBridgesConfig(**{**vars(config), "auth_token": "qux"})
+    assert registry.get_ops(SevenBridgesOps, other_config, "foo") is not ops
+
+
+def test_that_clients_are_only_tested_again_after_the_ttl(
+    registry, config, mock_time, mock_test_client, mocker
+):
+    ops = registry.get_ops(SevenBridgesOps, config, "foo")
+    ops.client = mocker.MagicMock()
+    mock_time.return_value = 59
+    registry.get_ops(SevenBridgesOps, config, "foo")
+    mock_test_client.assert_not_called()
+    mock_time.return_value = 60
+    assert registry.get_ops(SevenBridgesOps, config, "foo") is ops
+    mock_test_client.assert_called_once_with(ops.client)
+    mock_time.return_value = 119
+    registry.get_ops(SevenBridgesOps, config, "foo")
+    mock_test_client.assert_called_once()
+
+
+def test_that_clients_are_replaced_if_they_fail_the_test(
+    registry, config, mock_time, mock_test_client, mocker
+):
+    ops = registry.get_ops(SevenBridgesOps, config, "foo")
+    ops.client = mocker.MagicMock()
+    mock_test_client.side_effect = ClientRequestError
+    mock_time.return_value = 60
+    assert registry.get_ops(SevenBridgesOps, config, "foo") is not ops
+
+
+def test_that_unused_clients_are_not_tested(
+    registry, config, mock_time, mock_test_client
+):
+    ops = registry.get_ops(SevenBridgesOps, config, "foo")
+    mock_time.return_value = 60
+    assert registry.get_ops(SevenBridgesOps, config, "foo") is ops
+    mock_test_client.assert_not_called()
+
+
+def test_that_the_ttl_is_read_from_the_environment(
+    config, mock_time, mock_test_client, mocker
+):
+    mocker.patch.dict("os.environ", {"ORCA_CLIENT_VALIDATION_TTL": "30"})
+    registry = OpsRegistry()
+    ops = registry.get_ops(SevenBridgesOps, config, "foo")
+    ops.client = mocker.MagicMock()
+    mock_time.return_value = 30
+    registry.get_ops(SevenBridgesOps, config, "foo")
+    mock_test_client.assert_called_once_with(ops.client)
+
+
+def test_that_clients_are_tested_without_holding_the_lock(
+    registry, config, mock_time, mock_test_client, mocker
+):
+    ops = registry.get_ops(SevenBridgesOps, config, "foo")
+    ops.client = mocker.MagicMock()
+
+    def test_client(client):
+        assert not registry._lock.locked()
+
+    mock_test_client.side_effect = test_client
+    mock_time.return_value = 60
+    assert registry.get_ops(SevenBridgesOps, config, "foo") is ops
+    mock_test_client.assert_called_once()
+
+
+def test_that_the_least_recently_used_ops_are_evicted(config):
+    registry = OpsRegistry(ttl=60, max_size=2)
+    foo = registry.get_ops(SevenBridgesOps, config, "foo")
+    bar = registry.get_ops(SevenBridgesOps, config, "bar")
+    assert registry.get_ops(SevenBridgesOps, config, "foo") is foo
+    registry.get_ops(SevenBridgesOps, config, "baz")
+    assert len(registry) == 2
+    assert registry.get_ops(SevenBridgesOps, config, "foo") is foo
+    assert registry.get_ops(SevenBridgesOps, config, "bar") is not bar
@@ -0,0 +1,30 @@
+import hashlib
+
+from orca.services.base.transfer import compute_md5, is_same_file
+
+
+def test_that_the_md5_checksum_is_computed_in_chunks(tmp_path):
+    path = tmp_path / "foo.txt"
+    path.write_bytes(b"bar" * 1000)
+    md5 = compute_md5(str(path), chunk_size=7)
+    assert md5 == hashlib.md5(b"bar" * 1000).hexdigest()
+
+
+def test_that_files_with_the_same_size_and_checksum_are_the_same(tmp_path):
+    path = tmp_path / "foo.txt"
+    path.write_bytes(b"bar")
+    md5 = hashlib.md5(b"bar").hexdigest()
+    assert is_same_file(str(path), 3, md5)
+    assert not is_same_file(str(path), 4, md5)
+    assert not is_same_file(str(path), 3, hashlib.md5(b"baz").hexdigest())
+
+
+def test_that_files_without_a_checksum_are_only_the_same_if_not_required(tmp_path):
+    path = tmp_path / "foo.txt"
+    path.write_bytes(b"bar")
+    assert not is_same_file(str(path), 3, None)
+    assert is_same_file(str(path), 3, None, require_md5=False)
+
+
+def test_that_missing_files_are_not_the_same(tmp_path):
+    assert not is_same_file(str(tmp_path / "foo.txt"), 0, None, require_md5=False)
@@ -0,0 +1,224 @@
+import asyncio
+
+import pytest
+from requests.exceptions import HTTPError
+
+from orca.errors import ClientRequestError
+from orca.services.base.idempotency import MemoryStore
+from orca.services.nextflowtower import (
+    LaunchInfo,
+    NextflowTowerClient,
+    NextflowTowerConfig,
+    NextflowTowerOps,
+)
+from orca.services.nextflowtower.fake import (
+    FakeTower,
+    FakeTowerServer,
+    FakeTowerTransport,
+)
+from orca.services.nextflowtower.instrumentation import HistogramSink
+from orca.services.nextflowtower.models import WorkflowState
+
+
+@pytest.fixture
+def tower():
+    yield FakeTower()
+
+
+@pytest.fixture
+def fake_client(tower):
+    client = NextflowTowerClient("foo", "http://fake/api")
+    client.transport = FakeTowerTransport(tower)
+    yield client
+
+
+@pytest.fixture
+def fake_ops(tower, fake_client, patch_os_environ):
+    config = NextflowTowerConfig(
+        api_endpoint="http://fake/api",
+        auth_token="foo",
+        workspace=tower.workspace_name,
+    )
+    ops = NextflowTowerOps(config)
+    ops.client = fake_client
+    yield ops
+
+
+@pytest.fixture
+def launch_info():
+    yield LaunchInfo(pipeline="nf-core/demo", run_name="foo")
+
+
+def test_that_the_fake_tower_describes_the_user_workspaces(fake_client, tower):
+    workspaces = fake_client.list_user_workspaces()
+    assert len(workspaces) == 1
+    assert workspaces[0].full_name == tower.workspace_name.lower()
+
+
+def test_that_a_workflow_can_be_launched_and_monitored(fake_ops, launch_info):
+    workflow_id = fake_ops.launch_workflow(launch_info)
+    status = asyncio.run(fake_ops.monitor_workflow(workflow_id, wait_time=0))
+    assert status.state == WorkflowState.SUCCEEDED
+
+
+def test_that_runs_progress_through_workflow_states(fake_ops, launch_info, tower):
+    tower.polls_per_state = 2
+    workflow_id = fake_ops.launch_workflow(launch_info)
+    states = [fake_ops.get_workflow(workflow_id).state for _ in range(6)]
+    assert states == [
+        WorkflowState.SUBMITTED,
+        WorkflowState.SUBMITTED,
+        WorkflowState.RUNNING,
+        WorkflowState.RUNNING,
+        WorkflowState.SUCCEEDED,
+        WorkflowState.SUCCEEDED,
+    ]
+
+
+def test_that_runs_can_be_forced_to_fail(fake_ops, launch_info, tower):
+    workflow_id = fake_ops.launch_workflow(launch_info)
+    tower.set_state(workflow_id, WorkflowState.FAILED)
+    workflow = fake_ops.get_workflow(workflow_id)
+    assert workflow.state == WorkflowState.FAILED
+    assert workflow.complete is not None
+
+
+def test_that_failed_runs_are_relaunched_with_resume(fake_ops, launch_info, tower):
+    tower.failure_rate = 1.0
+    first_id = fake_ops.launch_workflow(launch_info)
+    asyncio.run(fake_ops.monitor_workflow(first_id, wait_time=0))
+    second_id = fake_ops.launch_workflow(LaunchInfo(**launch_info.__dict__))
+    assert second_id != first_id
+    assert tower.runs[second_id].launch["resume"] is True
+    assert tower.runs[second_id].launch["runName"] == "foo_2"
+
+
+def test_that_relaunches_reuse_the_stored_run_without_listing(
+    fake_ops, fake_client, launch_info, tower
+):
+    fake_ops.idempotency_store = MemoryStore()
+    first_id = fake_ops.launch_workflow(launch_info)
+    sink = HistogramSink()
+    fake_client.listeners.append(sink)
+    second_id = fake_ops.launch_workflow(
+        LaunchInfo(pipeline="nf-core/demo", run_name="foo")
+    )
+    assert second_id == first_id
+    assert list(sink.latencies) == [("GET", "/workflow/{id}")]
+    tower.set_state(first_id, WorkflowState.FAILED)
+    third_id = fake_ops.launch_workflow(
+        LaunchInfo(pipeline="nf-core/demo", run_name="foo")
+    )
+    assert third_id != first_id
+    assert tower.runs[third_id].launch["resume"] is True
+
+
+def test_that_stored_runs_are_ignored_when_ignoring_previous_runs(
+    fake_ops, launch_info
+):
+    fake_ops.idempotency_store = MemoryStore()
+    first_id = fake_ops.launch_workflow(launch_info, ignore_previous_runs=True)
+    info = LaunchInfo(pipeline="nf-core/demo", run_name="foo")
+    second_id = fake_ops.launch_workflow(info, ignore_previous_runs=True)
+    assert second_id != first_id
+
+
+def test_that_list_endpoints_are_paged(fake_ops, fake_client, launch_info):
+    for index in range(7):
+        info = LaunchInfo(pipeline="nf-core/demo", run_name=f"foo{index}")
+        fake_ops.launch_workflow(info, ignore_previous_runs=True)
+    sink = HistogramSink()
+    fake_client.listeners.append(sink)
+    kwargs = {"params": {"max": 3, "workspaceId": fake_ops.workspace_id}}
+    json = fake_client.get("/workflow", **kwargs)
+    assert len(json["workflows"]) == 7
+    assert sink.pages[("GET", "/workflow")].count == 1
+    assert sink.pages[("GET", "/workflow")].total == 3
+
+
+def test_that_workflows_can_be_searched_by_run_name(fake_ops):
+    for run_name in ["foo", "bar"]:
+        info = LaunchInfo(pipeline="nf-core/demo", run_name=run_name)
+        fake_ops.launch_workflow(info)
+    workflows = fake_ops.list_workflows("bar")
+    assert [workflow.run_name for workflow in workflows] == ["bar"]
+
+
+def test_that_workflow_statuses_are_retrieved_without_listing(
+    fake_ops, fake_client, tower
+):
+    tower.polls_per_state = 10
+    run_ids = list()
+    for run_name in ["foo", "bar"]:
+        info = LaunchInfo(pipeline="nf-core/demo", run_name=run_name)
+        run_ids.append(fake_ops.launch_workflow(info))
+    tower.set_state(run_ids[0], WorkflowState.FAILED)
+    sink = HistogramSink()
+    fake_client.listeners.append(sink)
+    statuses = fake_ops.get_workflow_statuses(run_ids)
+    assert statuses[run_ids[0]].state == WorkflowState.FAILED
+    assert statuses[run_ids[1]].state == WorkflowState.SUBMITTED
+    assert list(sink.latencies) == [("GET", "/workflow/{id}")]
+    assert sink.latencies["GET", "/workflow/{id}"].count == 2
+
+
+def test_that_workflow_tasks_and_logs_can_be_retrieved(fake_ops, launch_info, tower):
+    tower.num_tasks = 60
+    workflow_id = fake_ops.launch_workflow(launch_info)
+    tasks = fake_ops.get_workflow_tasks(workflow_id)
+    logs = fake_ops.get_task_logs(workflow_id, tasks[-1].task_id)
+    assert len(tasks) == 60
+    assert "60" in logs
+
+
+def test_for_an_error_when_the_fake_tower_throttles_requests(fake_client, tower):
+    tower.rate_limit = 0.001
+    tower.burst = 1
+    fake_client.get_user_info()
+    with pytest.raises(HTTPError):
+        fake_client.get_user_info()
+    assert tower.num_throttled == 1
+
+
+def test_that_throttled_requests_can_be_retried(fake_client, tower, mocker):
+    sleep = mocker.patch("time.sleep")
+    tower.rate_limit = 1000
+    tower.burst = 1
+    fake_client.max_attempts = 2
+    mocker.patch.object(tower, "is_throttled", side_effect=[True, False])
+    fake_client.get_user_info()
+    sleep.assert_called_once_with(1.0)
+
+
+def test_for_an_error_when_the_auth_token_is_wrong(fake_client, tower):
+    tower.auth_token = "bar"
+    with pytest.raises(HTTPError):
+        fake_client.get_user_info()
+
+
+def test_for_an_error_when_a_workflow_does_not_exist(fake_client):
+    with pytest.raises(HTTPError):
+        fake_client.get_workflow("foo")
+
+
+def test_that_the_fake_tower_can_be_served_over_http(tower):
+    with FakeTowerServer(tower) as server:
+        client = NextflowTowerClient("foo", server.api_endpoint)
+        user = client.get_user_info()
+    assert user.username == tower.user["userName"]
+
+
+def test_that_a_401_is_reported_under_the_lazy_validation_policy(tower, mocker):
+    mocker.patch.dict("os.environ", {"ORCA_CLIENT_VALIDATION_POLICY": "lazy"})
+    tower.auth_token = "bar"
+    with FakeTowerServer(tower) as server:
+        endpoint = server.api_endpoint
+        config = NextflowTowerConfig(
+            api_endpoint=endpoint, auth_token="foo", workspace=tower.workspace_name
+        )
+        ops = NextflowTowerOps(config)
+        with pytest.raises(ClientRequestError) as exc_info:
+            ops.list_workflows()
+    assert isinstance(exc_info.value.__cause__, HTTPError)
+    assert "client" not in vars(ops)
+    assert tower.num_requests == 1
@@ -0,0 +1,123 @@
+import logging
+
+import pytest
+
+from orca.services.nextflowtower.instrumentation import (
+    HistogramSink,
+    LoggingSink,
+    PrometheusExporter,
+    RequestEvent,
+)
+
+
+@pytest.fixture
+def event():
+    yield RequestEvent("GET", "/workflow/{id}", 200, 1, 0.2, 1024)
+
+
+@pytest.fixture
+def paged_event():
+    yield RequestEvent("GET", "/workflow", 200, 3, 0.6, 3072, pages=3)
+
+
+@pytest.fixture
+def mock_response(mocker, get_response):
+    response = mocker.Mock()
+    response.status_code = 200
+    response.headers = {"Content-Length": "27"}
+    response.json.return_value = get_response("get_user_info")
+    yield response
+
+
+def test_that_logging_sink_logs_events(event, caplog):
+    sink = LoggingSink(level=logging.INFO)
+    with caplog.at_level(logging.INFO):
+        sink(event)
+    assert "GET /workflow/{id} status=200" in caplog.text
+
+
+def test_that_histogram_sink_aggregates_by_endpoint(event, paged_event):
+    sink = HistogramSink(latency_buckets=[0.1, 1.0])
+    sink(event)
+    sink(event)
+    sink(paged_event)
+    summary = sink.summary()
+    assert len(summary) == 1
+    assert summary[0]["count"] == 2
+    assert summary[0]["response_bytes"] == 2048
+    assert sink.latencies[("GET", "/workflow/{id}")].counts == [0, 2, 0]
+    assert sink.pages[("GET", "/workflow")].total == 3
+
+
+def test_that_histogram_sink_sorts_endpoints_by_total_latency(event):
+    sink = HistogramSink()
+    sink(event)
+    sink(RequestEvent("POST", "/workflow/launch", 200, 1, 5.0, 10))
+    summary = sink.summary()
+    assert summary[0]["path_template"] == "/workflow/launch"
+
+
+def test_that_prometheus_exporter_renders_metrics(event, paged_event):
+    sink = HistogramSink(latency_buckets=[0.1, 1.0])
+    sink(event)
+    sink(paged_event)
+    text = PrometheusExporter(sink).render()
+    labels = 'method="GET",path="/workflow/{id}"'
+    assert f'orca_tower_request_duration_seconds_bucket{{{labels},le="1.0"}} 1' in text
+    assert f'orca_tower_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1' in text
+    assert f'orca_tower_requests_total{{{labels},status="200"}} 1' in text
+    assert f"orca_tower_response_bytes_total{{{labels}}} 1024" in text
+    assert 'orca_tower_request_pages_count{method="GET",path="/workflow"} 1' in text
+
+
+def test_that_prometheus_exporter_writes_files(event, tmp_path):
+    sink = HistogramSink()
+    sink(event)
+    path = tmp_path / "orca.prom"
+    PrometheusExporter(sink).write(str(path))
+    assert path.read_text() == PrometheusExporter(sink).render()
+
+
+def test_that_client_notifies_listeners_of_requests(client, mocker, mock_response):
+    mocker.patch("requests.request", return_value=mock_response)
+    events = list()
+    client.listeners.append(events.append)
+    client.get_user_info()
+    assert events == [RequestEvent("GET", "/user-info", 200, 1, events[0].latency, 27)]
+
+
+def test_that_client_retries_throttled_requests(client, mocker, mock_response):
+    throttled = mocker.Mock(status_code=429, headers={"Retry-After": "0"})
+    mock = mocker.patch("requests.request")
+    mock.side_effect = [throttled, mock_response]
+    events = list()
+    client.listeners.append(events.append)
+    client.max_attempts = 3
+    client.get_user_info()
+    assert mock.call_count == 2
+    assert events[0].attempts == 2
+
+
+def test_that_client_does_not_retry_by_default(client, mocker):
+    throttled = mocker.Mock(status_code=429, headers={})
+    mock = mocker.patch("requests.request", return_value=throttled)
+    response = client.request("GET", "/user-info")
+    mock.assert_called_once()
+    assert response.status_code == 429
+
+
+def test_that_client_reports_page_counts(client, mocker, get_response):
+    full_response = get_response("list_labels")
+    page_1 = {"totalSize": 5, "labels": full_response["labels"][:3]}
+    page_2 = {"totalSize": 5, "labels": full_response["labels"][3:]}
+    responses = list()
+    for page in [page_1, page_1, page_2]:
+        response = mocker.Mock(status_code=200, headers={"Content-Length": "10"})
+        response.json.return_value = page
+        responses.append(response)
+    mocker.patch("requests.request", side_effect=responses)
+    sink = HistogramSink()
+    client.listeners.append(sink)
+    client.list_labels(98765)
+    assert sink.latencies[("GET", "/labels")].count == 3
+    assert sink.pages[("GET", "/labels")].total == 2
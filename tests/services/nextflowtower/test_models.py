@@ -65,6 +65,62 @@ def test_that_launch_info_can_be_serialized_with_resume_disabled(launch_info):
     assert "sessionId" not in json["launch"]
 
 
+def test_that_launch_info_can_be_serialized_canonically():
+    launch_info = LaunchInfo(
+        compute_env_id="5ykJF",
+        pipeline="foo/bar",
+        work_dir="s3://foo/work",
+        params={"b": 1, "a": {"d": 2, "c": 3}},
+        profiles=["test", "docker", "test"],
+    )
+    launch = launch_info.to_json(canonical=True)["launch"]
+    assert launch["paramsText"] == '{"a": {"c": 3, "d": 2}, "b": 1}'
+    assert launch["configProfiles"] == ["test", "docker"]
+
+
+def test_that_equivalent_launch_infos_have_the_same_fingerprint():
+    first = LaunchInfo(pipeline="foo", params={"a": 1, "b": 2}, label_ids=[1, 2, 1])
+    second = LaunchInfo(pipeline="foo", params={"b": 2, "a": 1}, label_ids=[1, 2])
+    assert first.fingerprint == second.fingerprint
+    assert LaunchInfo(pipeline="foo").fingerprint != first.fingerprint
+
+
+def test_that_the_fingerprint_is_invalidated_by_updates(launch_info):
+    fingerprints = {launch_info.fingerprint}
+    launch_info.fill_in("run_name", "foo")
+    fingerprints.add(launch_info.fingerprint)
+    launch_info.add_in("label_ids", [1])
+    fingerprints.add(launch_info.fingerprint)
+    launch_info.resume = True
+    launch_info.session_id = "foo"
+    fingerprints.add(launch_info.fingerprint)
+    assert len(fingerprints) == 4
+
+
+def test_that_the_cache_is_cleared_after_in_place_updates(launch_info):
+    params_text = launch_info.to_json()["launch"]["paramsText"]
+    fingerprint = launch_info.fingerprint
+    launch_info.params["foo"] = "baz"
+    assert launch_info.fingerprint == fingerprint
+    launch_info.invalidate()
+    assert launch_info.fingerprint != fingerprint
+    assert launch_info.to_json()["launch"]["paramsText"] != params_text
+
+
+def test_that_launch_requests_reflect_in_place_updates(launch_info):
+    launch_info.fingerprint
+    params_text = launch_info.to_json()["launch"]["paramsText"]
+    launch_info.params["foo"] = "baz"
+    assert launch_info.to_json()["launch"]["paramsText"] != params_text
+    assert '"foo": "baz"' in launch_info.to_json()["launch"]["paramsText"]
+
+
+def test_that_cached_serializations_are_not_instance_attributes(launch_info):
+    launch_info.fingerprint
+    copy = LaunchInfo(**launch_info.__dict__)
+    assert copy.fingerprint == launch_info.fingerprint
+
+
 def test_for_an_error_when_enabling_resume_without_session_id():
     with pytest.raises(ValueError):
         LaunchInfo(resume=True)
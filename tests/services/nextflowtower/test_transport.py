@@ -0,0 +1,107 @@
+import pytest
+from requests.exceptions import HTTPError
+
+from orca.services.nextflowtower import models
+from orca.services.nextflowtower.transport import (
+    RecordingTransport,
+    ReplayTransport,
+    Transport,
+    build_response,
+    get_request_key,
+)
+
+
+class FakeTransport(Transport):
+    """Serve canned JSON responses in order."""
+
+    def __init__(self, bodies):
+        self.bodies = list(bodies)
+        self.calls = 0
+
+    def send(self, method, url, **kwargs):
+        body = self.bodies[min(self.calls, len(self.bodies) - 1)]
+        self.calls += 1
+        return build_response(url, 200, body, {"Content-Type": "application/json"})
+
+
+@pytest.fixture
+def cassette(tmp_path, client, get_response):
+    import json
+
+    path = str(tmp_path / "cassette.json.gz")
+    running = get_response("get_workflow")
+    running["workflow"]["status"] = "RUNNING"
+    succeeded = get_response("get_workflow")
+    bodies = [json.dumps(running), json.dumps(succeeded)]
+    with RecordingTransport(path, FakeTransport(bodies)) as transport:
+        client.transport = transport
+        client.get_workflow("123456789", 98765)
+        client.get_workflow("123456789", 98765)
+    yield path
+
+
+def test_that_request_keys_ignore_host_and_headers():
+    key_1 = get_request_key("get", "https://foo/api/a", headers={"x": "1"})
+    key_2 = get_request_key("GET", "https://bar/api/a", headers={"x": "2"})
+    assert key_1 == key_2
+
+
+def test_that_request_keys_depend_on_params_and_payload():
+    key_1 = get_request_key("POST", "https://foo/a", params={"x": 1}, json={"y": 1})
+    key_2 = get_request_key("POST", "https://foo/a", params={"x": 1}, json={"y": 2})
+    key_3 = get_request_key("POST", "https://foo/a", params={"x": 2}, json={"y": 1})
+    assert len({key_1, key_2, key_3}) == 3
+
+
+def test_that_recorded_cassettes_dont_include_the_auth_token(cassette):
+    import gzip
+
+    with gzip.open(cassette, "rt") as file:
+        assert "Bearer" not in file.read()
+
+
+def test_that_responses_are_replayed_in_order(cassette, client):
+    client.transport = ReplayTransport(cassette)
+    first = client.get_workflow("123456789", 98765)
+    second = client.get_workflow("123456789", 98765)
+    third = client.get_workflow("123456789", 98765)
+    assert first.state == models.WorkflowState.RUNNING
+    assert second.state == models.WorkflowState.SUCCEEDED
+    assert third.state == models.WorkflowState.SUCCEEDED
+
+
+def test_that_replay_can_be_reset(cassette, client):
+    client.transport = ReplayTransport(cassette)
+    client.get_workflow("123456789", 98765)
+    client.transport.reset()
+    workflow = client.get_workflow("123456789", 98765)
+    assert workflow.state == models.WorkflowState.RUNNING
+
+
+def test_for_an_error_when_replaying_an_unrecorded_request(cassette, client):
+    client.transport = ReplayTransport(cassette)
+    with pytest.raises(LookupError):
+        client.get_workflow("987654321", 98765)
+
+
+def test_that_replay_can_inject_errors(cassette, client):
+    client.transport = ReplayTransport(cassette, error_rate=1.0)
+    with pytest.raises(HTTPError):
+        client.get_workflow("123456789", 98765)
+
+
+def test_that_error_injection_is_reproducible(cassette, client):
+    def get_statuses(seed):
+        transport = ReplayTransport(cassette, error_rate=0.5, seed=seed)
+        url = f"{client.api_endpoint}//workflow/123456789"
+        params = {"workspaceId": 98765}
+        return [transport.send("GET", url, params=params).status_code for _ in "abcd"]
+
+    assert get_statuses(1) == get_statuses(1)
+
+
+def test_that_replay_can_inject_latency(cassette, client, mocker):
+    sleep = mocker.patch("time.sleep")
+    client.transport = ReplayTransport(cassette, latency=0.5)
+    client.get_workflow("123456789", 98765)
+    sleep.assert_called_once_with(0.5)
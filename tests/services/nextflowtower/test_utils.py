@@ -16,6 +16,11 @@ def test_that_launch_info_dedup_works():
     assert len(dedupped) == 3
 
 
+def test_that_stable_dedup_preserves_the_order():
+    secrets = ["foo", "bar", "foo", "baz", "bar"]
+    assert utils.dedup(secrets, stable=True) == ["foo", "bar", "baz"]
+
+
 def test_that_increment_suffix_works_with_unsuffixed_strings_with_underscore():
     assert utils.increment_suffix("foo_bar") == "foo_bar_2"
 
@@ -56,3 +61,19 @@ def test_for_an_error_when_using_nonexistent_keys_with_get_nested_works():
     input = {"foo": {"bar": {"baz": 123}}}
     with pytest.raises(ValueError):
         utils.get_nested(input, "foo.bar.atchoo")
+
+
+@pytest.mark.parametrize(
+    "path,expected",
+    [
+        ("/user-info", "/user-info"),
+        ("/user/12345/workspaces", "/user/{id}/workspaces"),
+        ("/compute-envs/5ykJF", "/compute-envs/{id}"),
+        ("/workflow/launch", "/workflow/launch"),
+        ("/workflow/4Bi5xBK6E2Nbhj", "/workflow/{id}"),
+        ("/workflow/4Bi5xBK6E2Nbhj/log/1", "/workflow/{id}/log/{id}"),
+        ("/workflow/4Bi5xBK6E2Nbhj/tasks", "/workflow/{id}/tasks"),
+    ],
+)
+def test_that_template_path_replaces_identifiers(path, expected):
+    assert utils.template_path(path) == expected
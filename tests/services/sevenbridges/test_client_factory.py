@@ -47,6 +47,27 @@ class TestWithEmptyEnv:
         assert maintenance_sleeper in handlers
         assert rate_limit_sleeper in handlers
 
+    def test_that_the_connection_pool_is_sized_from_the_config(
+        self, config, mock_api_init
+    ):
+        config.pool_size = 32
+        config.advance_access = True
+        SevenBridgesClientFactory(config).get_client()
+        _, kwargs = mock_api_init.call_args
+        assert kwargs["pool_maxsize"] == 32
+        assert kwargs["advance_access"] is True
+
+    def test_that_client_kwargs_take_precedence(self, config, mock_api_init):
+        config.client_kwargs = {"pool_maxsize": 4}
+        SevenBridgesClientFactory(config).get_client()
+        _, kwargs = mock_api_init.call_args
+        assert kwargs["pool_maxsize"] == 4
+
+    def test_that_environment_lookups_can_be_disabled(self, config):
+        config.trust_env = False
+        client = SevenBridgesClientFactory(config).get_client()
+        assert client.session.trust_env is False
+
 
 def test_that_a_nonempty_connection_can_be_mapped(connection, config):
     actual = SevenBridgesConfig.from_connection(connection)
@@ -54,6 +75,13 @@ def test_that_a_nonempty_connection_can_be_mapped(connection, config):
     assert actual == expected
 
 
+def test_that_client_settings_can_be_mapped_from_connection_extras(connection_uri):
+    connection = Connection(uri=f"{connection_uri}&max_workers=4&trust_env=false")
+    config = SevenBridgesConfig.from_connection(connection)
+    assert config.max_workers == 4
+    assert config.trust_env is False
+
+
 def test_that_an_empty_connection_can_be_mapped():
     expected = SevenBridgesConfig()
     connection = Connection(uri="sbg://")
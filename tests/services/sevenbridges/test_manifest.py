@@ -0,0 +1,103 @@
+import csv
+from uuid import UUID
+
+import pytest
+from sevenbridges import Task
+
+from orca.errors import ClientRequestError, ConfigError
+from orca.services.sevenbridges.manifest import (
+    CsvManifestWriter,
+    iter_output_files,
+    open_manifest,
+)
+from orca.services.sevenbridges.models import OutputFile
+
+TASK_IDS = [str(UUID(int=index)) for index in range(3)]
+
+
+def make_task(task_id):
+    def make_file(name):
+        return {"class": "File", "path": f"{task_id}-{name}", "name": name, "size": 1}
+
+    outputs = {
+        "report": make_file("report.html"),
+        "bams": [make_file("a.bam"), [make_file("b.bam")], None],
+        "record": {"vcf": make_file("c.vcf"), "count": 3},
+        "message": "done",
+        "missing": None,
+    }
+    return Task(api=None, id=task_id, outputs=outputs)
+
+
+@pytest.fixture
+def mock_bulk_get(mock_ops, mocker):
+    bulk_get = mock_ops.client.tasks.bulk_get
+    bulk_get.side_effect = lambda ids: [
+        mocker.Mock(valid=True, resource=make_task(task_id)) for task_id in ids
+    ]
+    yield bulk_get
+
+
+def test_that_task_outputs_are_flattened_into_files():
+    task_id = TASK_IDS[0]
+    files = list(iter_output_files(make_task(task_id)))
+    assert files == [
+        OutputFile(task_id, "report", f"{task_id}-report.html", "report.html", 1),
+        OutputFile(task_id, "bams", f"{task_id}-a.bam", "a.bam", 1),
+        OutputFile(task_id, "bams", f"{task_id}-b.bam", "b.bam", 1),
+        OutputFile(task_id, "record", f"{task_id}-c.vcf", "c.vcf", 1),
+    ]
+
+
+def test_that_tasks_without_outputs_have_no_files():
+    assert list(iter_output_files(Task(api=None, id=TASK_IDS[0], outputs={}))) == []
+
+
+def test_that_the_manifest_format_is_inferred_from_the_extension(tmp_path):
+    with open_manifest(str(tmp_path / "manifest.csv")) as manifest:
+        assert isinstance(manifest, CsvManifestWriter)
+
+
+def test_for_an_error_when_the_manifest_format_is_unsupported(tmp_path):
+    with pytest.raises(ConfigError):
+        open_manifest(str(tmp_path / "manifest.xlsx"))
+
+
+def test_that_task_outputs_are_exported_to_a_csv_manifest(
+    mock_ops, mock_bulk_get, tmp_path
+):
+    mock_ops.bulk_limit = 2
+    path = str(tmp_path / "manifest.csv")
+    num_files = mock_ops.export_task_outputs(iter(TASK_IDS), path)
+    with open(path, newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert num_files == len(rows) == 12
+    assert mock_bulk_get.call_count == 2
+    assert [row["task_id"] for row in rows[::4]] == TASK_IDS
+    assert rows[0] == {
+        "task_id": TASK_IDS[0],
+        "port": "report",
+        "file_id": f"{TASK_IDS[0]}-report.html",
+        "file_name": "report.html",
+        "size": "1",
+    }
+
+
+def test_that_task_outputs_are_exported_to_a_parquet_manifest(
+    mock_ops, mock_bulk_get, tmp_path
+):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "manifest.parquet")
+    mock_ops.export_task_outputs(TASK_IDS[:2], path)
+    table = pq.read_table(path)
+    assert table.num_rows == 8
+    assert table.column("file_id")[0].as_py() == f"{TASK_IDS[0]}-report.html"
+
+
+def test_for_an_error_when_a_task_output_cannot_be_retrieved(
+    mock_ops, mocker, tmp_path
+):
+    record = mocker.Mock(valid=False, error="Not found")
+    mock_ops.client.tasks.bulk_get.return_value = [record]
+    with pytest.raises(ClientRequestError):
+        mock_ops.export_task_outputs(["a"], str(tmp_path / "manifest.csv"))
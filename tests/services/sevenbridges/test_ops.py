@@ -1,8 +1,18 @@
+import asyncio
+from datetime import datetime
+
 import pytest
+from sevenbridges import Task
+from sevenbridges.meta.collection import Collection
 
-from orca.errors import ConfigError, UnexpectedMatchError
+from orca.errors import ClientRequestError, ConfigError, UnexpectedMatchError
 from orca.services.sevenbridges import SevenBridgesOps
-from orca.services.sevenbridges.models import TaskStatus
+from orca.services.sevenbridges.models import (
+    TaskOutcome,
+    TaskSpec,
+    TaskStatus,
+    TaskStatusResult,
+)
 
 
 @pytest.mark.usefixtures("patch_os_environ")
@@ -29,11 +39,115 @@ class TestWithEmptyEnv:
         result = mock_ops.get_task("foo", "bar")
         assert result is None
 
-    def test_that_none_is_returned_when_many_matches(self, mock_task, mock_ops):
-        mock_ops.client.tasks.query.return_value = [mock_task, mock_task]
+    def test_that_none_is_returned_when_many_matches(self, mock_task, mock_ops, mocker):
+        other_task = mocker.MagicMock(Task)
+        other_task.id = "456"
+        other_task.name = mock_task.name
+        other_task.app = mock_task.app
+        mock_ops.client.tasks.query.return_value = [mock_task, other_task]
         with pytest.raises(UnexpectedMatchError):
             mock_ops.get_task("foo", "bar")
 
+    def test_that_task_listings_are_deduplicated(self, mock_task, mock_ops):
+        mock_ops.client.tasks.query.return_value = [mock_task, mock_task]
+        result = mock_ops.get_task("foo", "bar")
+        assert result == "123"
+
+    def test_that_only_new_tasks_are_listed_after_the_first_lookup(
+        self, mock_task, mock_ops
+    ):
+        mock_task.created_time = datetime(2023, 1, 1)
+        mock_ops.client.tasks.query.return_value = [mock_task]
+        mock_ops.get_task("foo", "bar")
+        mock_ops.get_task("foo", "bar")
+        first_call, second_call = mock_ops.client.tasks.query.call_args_list
+        assert "created_from" not in first_call.kwargs
+        assert second_call.kwargs["created_from"] == mock_task.created_time
+
+    def test_that_the_task_index_can_be_rebuilt(self, mock_task, mock_ops):
+        mock_task.created_time = datetime(2023, 1, 1)
+        mock_ops.client.tasks.query.return_value = [mock_task]
+        mock_ops.get_task("foo", "bar")
+        mock_ops.refresh_task_index(full=True)
+        last_call = mock_ops.client.tasks.query.call_args
+        assert "created_from" not in last_call.kwargs
+
+    def test_that_matches_are_verified_before_being_returned(
+        self, mock_task, mock_ops, mocker
+    ):
+        record = mocker.MagicMock(valid=True, resource=mock_task)
+        mock_ops.client.tasks.query.return_value = [mock_task]
+        mock_ops.client.tasks.bulk_get.return_value = [record]
+        result = mock_ops.get_task("foo", "bar")
+        assert result == "123"
+        mock_ops.client.tasks.bulk_get.assert_called_once_with(["123"])
+        mock_ops.client.tasks.query.assert_called_once()
+
+    def test_that_deleted_tasks_are_evicted_by_a_rescan(
+        self, mock_task, mock_ops, mocker
+    ):
+        mock_task.created_time = datetime(2023, 1, 1)
+        mock_ops.client.tasks.query.return_value = [mock_task]
+        mock_ops.get_task("foo", "bar")
+        record = mocker.MagicMock(valid=False, resource=None)
+        mock_ops.client.tasks.bulk_get.return_value = [record]
+        mock_ops.client.tasks.query.return_value = []
+        result = mock_ops.get_task("foo", "bar")
+        assert result is None
+        last_call = mock_ops.client.tasks.query.call_args
+        assert "created_from" not in last_call.kwargs
+
+    def test_that_renamed_tasks_are_evicted_by_a_rescan(
+        self, mock_task, mock_ops, mocker
+    ):
+        mock_task.created_time = datetime(2023, 1, 1)
+        mock_ops.client.tasks.query.return_value = [mock_task]
+        mock_ops.get_task("foo", "bar")
+        renamed_task = mocker.MagicMock(Task)
+        renamed_task.id = mock_task.id
+        renamed_task.name = "renamed"
+        renamed_task.app = mock_task.app
+        renamed_task.created_time = mock_task.created_time
+        record = mocker.MagicMock(valid=True, resource=renamed_task)
+        mock_ops.client.tasks.bulk_get.return_value = [record]
+        mock_ops.client.tasks.query.return_value = [renamed_task]
+        assert mock_ops.get_task("foo", "bar") is None
+        assert mock_ops.task_index.lookup("renamed") == {"123": "user/bar"}
+
+    def test_that_all_pages_are_indexed(self, mock_task, mock_ops, mocker):
+        tasks = mocker.MagicMock(Collection)
+        tasks.all.return_value = iter([mock_task])
+        mock_ops.client.tasks.query.return_value = tasks
+        result = mock_ops.get_task("foo", "bar")
+        assert result == "123"
+
+    def test_that_drafted_tasks_are_indexed(self, mock_task, mock_ops):
+        mock_ops.client.tasks.create.return_value = mock_task
+        mock_ops.draft_task("foo", "bar", {})
+        assert mock_ops.task_index.lookup("foo") == {"123": "user/bar"}
+
+    def test_that_drafted_tasks_do_not_move_the_watermark(self, mock_ops, mocker):
+        def make_task(task_id, name, day):
+            task = mocker.MagicMock(Task)
+            task.id, task.name, task.app = task_id, name, "user/bar"
+            task.created_time = datetime(2023, 1, day)
+            return task
+
+        listed = make_task("1", "listed", 1)
+        other = make_task("2", "other", 2)  # Created by another process
+        drafted = make_task("3", "drafted", 3)
+        tasks = [listed]
+
+        # Like the API, only list the tasks created since the watermark
+        def query(created_from=datetime.min, **kwargs):
+            return [task for task in tasks if task.created_time >= created_from]
+
+        mock_ops.client.tasks.query.side_effect = query
+        mock_ops.client.tasks.create.return_value = drafted
+        mock_ops.draft_task("drafted", "bar", {})
+        tasks.extend([other, drafted])
+        assert mock_ops.get_task("other", "bar") == "2"
+
     def test_for_an_error_when_matching_task_has_diff_app(self, mock_task, mock_ops):
         mock_task.app = "something"
         mock_ops.client.tasks.query.return_value = [mock_task]
@@ -69,3 +183,130 @@ class TestWithEmptyEnv:
         status = mock_ops.get_task_status("foo")
         mock_ops.client.tasks.get.assert_called_once()
         assert status == TaskStatus("DRAFT")
+
+    def test_that_task_statuses_are_retrieved_in_bulk(self, mock_ops, mocker):
+        mock_ops.bulk_limit = 2
+        bulk_get = mock_ops.client.tasks.bulk_get
+        bulk_get.side_effect = lambda ids: [
+            mocker.Mock(valid=True, resource=mocker.Mock(status="RUNNING")) for _ in ids
+        ]
+        statuses = mock_ops.get_task_statuses(["a", "b", "c"])
+        assert bulk_get.call_count == 2
+        expected = TaskStatusResult(TaskStatus("RUNNING"))
+        assert statuses == {task_id: expected for task_id in "abc"}
+
+    def test_that_errors_are_reported_per_task_when_retrieving_in_bulk(
+        self, mock_ops, mocker
+    ):
+        valid = mocker.Mock(valid=True, resource=mocker.Mock(status="RUNNING"))
+        invalid = mocker.Mock(valid=False, error="Not found")
+        mock_ops.client.tasks.bulk_get.return_value = [valid, invalid]
+        statuses = mock_ops.get_task_statuses(["a", "b"])
+        assert statuses["a"].status == TaskStatus("RUNNING")
+        assert statuses["b"].status is None
+        assert "Not found" in statuses["b"].error
+
+    def test_for_an_error_when_a_monitored_task_cannot_be_retrieved(
+        self, mock_ops, mocker
+    ):
+        get_task_statuses = mocker.patch.object(mock_ops, "get_task_statuses")
+        get_task_statuses.return_value = {"a": TaskStatusResult(error="Not found")}
+        with pytest.raises(ClientRequestError):
+            asyncio.run(mock_ops.monitor_tasks(["a"], wait_time=0))
+
+    def test_that_only_pending_tasks_are_monitored(self, mock_ops, mocker):
+        get_task_statuses = mocker.patch.object(mock_ops, "get_task_statuses")
+        get_task_statuses.side_effect = [
+            {
+                "a": TaskStatusResult(TaskStatus("COMPLETED")),
+                "b": TaskStatusResult(TaskStatus("RUNNING")),
+            },
+            {"b": TaskStatusResult(TaskStatus("FAILED"))},
+        ]
+        statuses = asyncio.run(mock_ops.monitor_tasks(["a", "b"], wait_time=0))
+        assert get_task_statuses.call_args_list[1].args == (["b"],)
+        assert statuses == {"a": TaskStatus("COMPLETED"), "b": TaskStatus("FAILED")}
+
+    def test_that_a_task_is_monitored_with_adaptive_wait_times(self, mock_ops, mocker):
+        sleep = mocker.patch("asyncio.sleep")
+        get_task_status = mocker.patch.object(mock_ops, "get_task_status")
+        states = ["QUEUED", "QUEUED", "QUEUED", "RUNNING", "RUNNING", "COMPLETED"]
+        get_task_status.side_effect = [TaskStatus(state) for state in states]
+        status = asyncio.run(mock_ops.monitor_task("foo", 100, 10))
+        waits = [call.args[0] for call in sleep.call_args_list]
+        assert waits == [10, 20, 40, 10, 20]
+        assert status == TaskStatus("COMPLETED")
+
+    def test_that_wait_times_are_capped(self, mock_ops):
+        assert mock_ops.get_next_wait_time(40, 10, 60, changed=False) == 60
+        assert mock_ops.get_next_wait_time(60, 10, 60, changed=True) == 10
+
+    def test_that_many_tasks_can_be_created_at_once(self, mock_ops, mocker):
+        existing_tasks = [
+            mocker.Mock(id="1", app="user/bar"),
+            mocker.Mock(id="2", app="user/bar"),
+            mocker.Mock(id="3", app="user/baz"),
+        ]
+        for name, task in zip(["running", "draft", "wrong-app"], existing_tasks):
+            task.name = name
+        mock_ops.client.tasks.query.return_value = existing_tasks
+        get_task_statuses = mocker.patch.object(mock_ops, "get_task_statuses")
+        get_task_statuses.return_value = {
+            "1": TaskStatusResult(TaskStatus("RUNNING")),
+            "2": TaskStatusResult(TaskStatus("DRAFT")),
+        }
+        new_task = mocker.Mock(id="4")
+        mock_ops.client.tasks.create.return_value = new_task
+        specs = [
+            ("running", "bar", {}),
+            ("draft", "bar", {}),
+            ("wrong-app", "bar", {}),
+            ("new", "bar", {}),
+            ("new", "bar", {}),
+        ]
+        results = mock_ops.create_tasks(specs)
+        outcomes = [(result.task_id, result.outcome) for result in results]
+        assert outcomes == [
+            ("1", TaskOutcome.SKIPPED),
+            ("2", TaskOutcome.LAUNCHED),
+            (None, TaskOutcome.FAILED),
+            ("4", TaskOutcome.LAUNCHED),
+            (None, TaskOutcome.FAILED),
+        ]
+        mock_ops.client.tasks.query.assert_called_once()
+        mock_ops.client.tasks.create.assert_called_once()
+        mock_ops.client.tasks.get.return_value.run.assert_called_once()
+        new_task.run.assert_called_once()
+
+    def test_that_errors_are_reported_when_creating_many_tasks(self, mock_ops):
+        mock_ops.client.tasks.create.side_effect = ValueError("Invalid inputs")
+        results = mock_ops.create_tasks([TaskSpec("foo", "bar", {})])
+        assert results[0].outcome == TaskOutcome.FAILED
+        assert results[0].error == "ValueError: Invalid inputs"
+
+    def test_that_the_executor_is_shared_and_sized_from_the_config(self, mock_ops):
+        mock_ops.config.max_workers = 3
+        assert mock_ops.executor is mock_ops.executor
+        assert mock_ops.executor._max_workers == 3
+
+    def test_that_the_executor_is_shut_down_when_closed(self, mock_ops):
+        executor = mock_ops.executor
+        with mock_ops:
+            assert mock_ops.executor is executor
+        assert executor._shutdown
+        assert mock_ops.executor is not executor
+        mock_ops.close()
+        mock_ops.close()
+
+    def test_that_status_errors_are_reported_when_creating_many_tasks(
+        self, mock_ops, mocker
+    ):
+        task = mocker.Mock(id="1", app="user/bar")
+        task.name = "foo"
+        mock_ops.client.tasks.query.return_value = [task]
+        get_task_statuses = mocker.patch.object(mock_ops, "get_task_statuses")
+        get_task_statuses.return_value = {"1": TaskStatusResult(error="Not found")}
+        results = mock_ops.create_tasks([TaskSpec("foo", "bar", {})])
+        assert results[0].outcome == TaskOutcome.FAILED
+        assert results[0].error == "Not found"
+        mock_ops.client.tasks.create.assert_not_called()
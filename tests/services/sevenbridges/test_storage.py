@@ -0,0 +1,236 @@
+import os
+
+import pytest
+from sevenbridges import Api
+
+from orca.services.base.transfer import TransferOutcome
+from orca.services.sevenbridges.fake import FakeStorage
+from orca.services.sevenbridges.models import RemoteFile
+from orca.services.sevenbridges.storage import SevenBridgesStorage
+
+
+@pytest.fixture
+def local_files(tmp_path):
+    directory = tmp_path / "local"
+    directory.mkdir()
+    paths = list()
+    for index, size in enumerate([0, 1000, 25_000]):
+        path = directory / f"file{index}.txt"
+        path.write_bytes(os.urandom(size))
+        paths.append(str(path))
+    yield paths
+
+
+@pytest.fixture
+def storage(tmp_path):
+    yield FakeStorage(str(tmp_path / "remote"), chunk_size=1000)
+
+
+@pytest.fixture
+def transfer_ops(mock_ops, storage):
+    mock_ops.storage = storage
+    yield mock_ops
+
+
+def read_bytes(path):
+    with open(path, "rb") as file:
+        return file.read()
+
+
+def test_that_files_are_uploaded_once(transfer_ops, storage, local_files):
+    first_results = transfer_ops.upload_files(local_files)
+    second_results = transfer_ops.upload_files(local_files)
+    assert {r.outcome for r in first_results} == {TransferOutcome.TRANSFERRED}
+    assert {r.outcome for r in second_results} == {TransferOutcome.SKIPPED}
+    assert storage.num_uploads == len(local_files)
+
+
+def test_that_modified_files_are_only_uploaded_with_overwrite(
+    transfer_ops, local_files
+):
+    transfer_ops.upload_files(local_files)
+    with open(local_files[1], "wb") as file:
+        file.write(b"foo")
+    results = transfer_ops.upload_files(local_files[1:2])
+    assert results[0].outcome == TransferOutcome.FAILED
+    results = transfer_ops.upload_files(local_files[1:2], overwrite=True)
+    assert results[0].outcome == TransferOutcome.TRANSFERRED
+
+
+def test_that_files_without_checksums_cannot_be_verified_without_overwrite(
+    transfer_ops, storage, local_files
+):
+    remote_path = storage.get_path(transfer_ops.project, "file1.txt")
+    os.makedirs(os.path.dirname(remote_path))
+    with open(remote_path, "wb") as file:
+        file.write(read_bytes(local_files[1]))
+    results = transfer_ops.upload_files(local_files[1:2])
+    assert results[0].outcome == TransferOutcome.FAILED
+    assert "Cannot verify" in results[0].error
+    results = transfer_ops.upload_files(local_files[1:2], overwrite=True)
+    assert results[0].outcome == TransferOutcome.TRANSFERRED
+
+
+def test_for_an_error_when_uploading_files_with_the_same_name(
+    transfer_ops, local_files, tmp_path
+):
+    other = tmp_path / "other"
+    other.mkdir()
+    duplicate = other / os.path.basename(local_files[0])
+    duplicate.write_bytes(b"foo")
+    with pytest.raises(ValueError, match="same names"):
+        transfer_ops.upload_files([local_files[0], str(duplicate)])
+
+
+def test_that_interrupted_uploads_are_resumed(transfer_ops, storage, local_files):
+    transfer_ops.config.max_workers = 1
+    storage.fail_after_parts = 3
+    results = transfer_ops.upload_files(local_files[2:], part_size=5000)
+    assert results[0].outcome == TransferOutcome.FAILED
+    assert os.path.exists(f"{local_files[2]}.upload.json")
+    storage.fail_after_parts = None
+    results = transfer_ops.upload_files(local_files[2:], part_size=5000)
+    assert results[0].outcome == TransferOutcome.TRANSFERRED
+    assert storage.num_parts == 5
+    assert not os.path.exists(f"{local_files[2]}.upload.json")
+    remote_path = storage.get_path(transfer_ops.project, "file2.txt")
+    assert read_bytes(remote_path) == read_bytes(local_files[2])
+
+
+def test_that_uploads_restart_when_the_local_file_changes(
+    transfer_ops, storage, local_files
+):
+    storage.fail_after_parts = 1
+    transfer_ops.upload_files(local_files[2:], part_size=5000)
+    with open(local_files[2], "ab") as file:
+        file.write(b"foo")
+    storage.fail_after_parts = None
+    results = transfer_ops.upload_files(local_files[2:], part_size=5000)
+    assert results[0].outcome == TransferOutcome.TRANSFERRED
+    remote_path = storage.get_path(transfer_ops.project, "file2.txt")
+    assert read_bytes(remote_path) == read_bytes(local_files[2])
+
+
+def test_that_files_are_downloaded_in_parts(transfer_ops, local_files, tmp_path):
+    transfer_ops.upload_files(local_files)
+    directory = str(tmp_path / "downloads")
+    results = transfer_ops.download_files(directory, part_size=4000)
+    assert {r.outcome for r in results} == {TransferOutcome.TRANSFERRED}
+    for path in local_files:
+        downloaded_path = os.path.join(directory, os.path.basename(path))
+        assert read_bytes(downloaded_path) == read_bytes(path)
+    assert sorted(os.listdir(directory)) == sorted(map(os.path.basename, local_files))
+
+
+def test_that_existing_files_are_not_downloaded_again(
+    transfer_ops, storage, local_files, tmp_path
+):
+    transfer_ops.upload_files(local_files)
+    directory = str(tmp_path / "downloads")
+    transfer_ops.download_files(directory)
+    bytes_read = storage.bytes_read
+    results = transfer_ops.download_files(directory)
+    assert {r.outcome for r in results} == {TransferOutcome.SKIPPED}
+    assert storage.bytes_read == bytes_read
+
+
+def test_that_interrupted_downloads_are_resumed(
+    transfer_ops, storage, local_files, tmp_path
+):
+    transfer_ops.upload_files(local_files[2:])
+    directory = str(tmp_path / "downloads")
+    transfer_ops.config.max_workers = 1
+    storage.fail_after = 10_000
+    results = transfer_ops.download_files(directory, part_size=5000)
+    assert results[0].outcome == TransferOutcome.FAILED
+    assert os.path.exists(os.path.join(directory, "file2.txt.part.json"))
+    storage.fail_after = None
+    results = transfer_ops.download_files(directory, part_size=5000)
+    assert results[0].outcome == TransferOutcome.TRANSFERRED
+    assert read_bytes(os.path.join(directory, "file2.txt")) == read_bytes(
+        local_files[2]
+    )
+    assert storage.bytes_read == 25_000
+    assert os.listdir(directory) == ["file2.txt"]
+
+
+def test_that_files_without_checksums_are_downloaded_again(
+    transfer_ops, storage, local_files, tmp_path
+):
+    remote_path = storage.get_path(transfer_ops.project, "file1.txt")
+    os.makedirs(os.path.dirname(remote_path))
+    with open(remote_path, "wb") as file:
+        file.write(os.urandom(1000))
+    directory = tmp_path / "downloads"
+    directory.mkdir()
+    (directory / "file1.txt").write_bytes(read_bytes(local_files[1]))
+    results = transfer_ops.download_files(str(directory))
+    assert results[0].outcome == TransferOutcome.TRANSFERRED
+    assert read_bytes(str(directory / "file1.txt")) == read_bytes(remote_path)
+
+
+def test_for_a_failure_when_downloading_a_missing_file(transfer_ops, tmp_path):
+    results = transfer_ops.download_files(str(tmp_path), names=["foo"])
+    assert results[0].outcome == TransferOutcome.FAILED
+
+
+def test_that_folders_are_not_listed_as_files(mocker):
+    client = mocker.MagicMock()
+    file = mocker.Mock(id="1", size=10, type="file", metadata={})
+    file.name = "foo"
+    folder = mocker.Mock(id="2", size=None, type="folder", metadata={})
+    client.files.query.return_value = [file, folder]
+    files = SevenBridgesStorage(client).list_files("foo/bar")
+    assert files == [RemoteFile("1", "foo", 10)]
+
+
+def test_that_checksums_are_listed_from_the_file_metadata(mocker):
+    client = mocker.MagicMock()
+    file = mocker.Mock(id="1", size=10, type="file", metadata={"md5_sum": "abc"})
+    file.name = "foo"
+    client.files.query.return_value = [file]
+    files = SevenBridgesStorage(client).list_files("foo/bar")
+    assert files == [RemoteFile("1", "foo", 10, "abc")]
+
+
+def test_that_parts_are_uploaded_to_presigned_urls(mocker):
+    client = mocker.MagicMock()
+    client.get.return_value.json.return_value = {"url": "https://foo"}
+    storage = SevenBridgesStorage(client)
+    session = mocker.patch.object(storage, "storage_session")
+    session.put.return_value.headers = {"ETag": '"bar"'}
+    storage.upload_part("upload", 2, b"baz")
+    client.get.assert_called_once_with("/upload/multipart/upload/part/2")
+    session.put.assert_called_once_with("https://foo", data=b"baz", timeout=300)
+    report = {"part_number": 2, "response": {"headers": {"ETag": "bar"}}}
+    client.post.assert_called_once_with("/upload/multipart/upload/part", data=report)
+
+
+def test_that_checksums_are_recorded_when_uploads_complete(mocker):
+    client = mocker.MagicMock()
+    client.post.return_value.json.return_value = {"id": "1"}
+    SevenBridgesStorage(client).complete_upload("upload", "abc")
+    client.post.assert_called_once_with("/upload/multipart/upload/complete")
+    client.patch.assert_called_once_with("/files/1/metadata", data={"md5_sum": "abc"})
+
+
+def test_that_byte_ranges_are_requested_from_the_download_url(mocker):
+    client = mocker.MagicMock()
+    client.files.get.return_value.download_info.return_value.url = "https://foo"
+    response = client.session.get.return_value.__enter__.return_value
+    response.iter_content.return_value = [b"bar"]
+    storage = SevenBridgesStorage(client)
+    chunks = list(storage.read_range(RemoteFile("1", "foo", 10), 5, 8))
+    assert chunks == [b"bar"]
+    _, kwargs = client.session.get.call_args
+    assert kwargs["headers"] == {"Range": "bytes=5-7"}
+    assert kwargs["stream"] is True
+
+
+def test_that_overwrites_are_requested_as_query_parameters(mocker):
+    client = mocker.create_autospec(Api, instance=True)
+    client.post.return_value.json.return_value = {"upload_id": "1"}
+    storage = SevenBridgesStorage(client)
+    assert storage.start_upload("foo/bar", "baz", 10, 5, overwrite=True) == ("1", 5)
+    _, kwargs = client.post.call_args
+    assert kwargs["params"] == {"overwrite": True}
@@ -0,0 +1,51 @@
+import asyncio
+import threading
+
+import pytest
+
+from orca.services.sevenbridges import SevenBridgesTaskTrigger
+from orca.services.sevenbridges.models import TaskStatus
+
+
+@pytest.fixture
+def trigger():
+    yield SevenBridgesTaskTrigger(["foo", "bar"], "sbg_default", 60, 10)
+
+
+async def collect_events(trigger):
+    return [event async for event in trigger.run()]
+
+
+def test_that_the_trigger_can_be_reconstructed_from_its_serialization(trigger):
+    class_path, kwargs = trigger.serialize()
+    assert class_path == "orca.services.sevenbridges.trigger.SevenBridgesTaskTrigger"
+    assert SevenBridgesTaskTrigger(**kwargs).serialize() == (class_path, kwargs)
+
+
+def test_that_the_trigger_fires_once_all_tasks_are_done(trigger, mocker):
+    hook = mocker.patch("orca.services.sevenbridges.trigger.SevenBridgesHook")
+    statuses = {"foo": TaskStatus("COMPLETED"), "bar": TaskStatus("FAILED")}
+    monitor_tasks = mocker.AsyncMock(return_value=statuses)
+    hook.return_value.ops.monitor_tasks = monitor_tasks
+    events = asyncio.run(collect_events(trigger))
+    monitor_tasks.assert_called_once_with(["foo", "bar"], 60, 10)
+    assert len(events) == 1
+    assert events[0].payload == {
+        "states": {"foo": "COMPLETED", "bar": "FAILED"},
+        "is_successful": False,
+    }
+
+
+def test_that_the_ops_are_retrieved_outside_the_event_loop(trigger, mocker):
+    hook = mocker.patch("orca.services.sevenbridges.trigger.SevenBridgesHook")
+    threads = list()
+    ops = mocker.MagicMock()
+    ops.monitor_tasks = mocker.AsyncMock(return_value={})
+
+    def get_ops():
+        threads.append(threading.current_thread())
+        return ops
+
+    type(hook.return_value).ops = mocker.PropertyMock(side_effect=get_ops)
+    asyncio.run(collect_events(trigger))
+    assert threads and threading.main_thread() not in threads
@@ -1,4 +1,5 @@
 import pytest
+from synapseclient import Synapse
 
 from orca.services.synapse import SynapseClientFactory, SynapseConfig, SynapseOps
 
@@ -14,7 +15,8 @@ def config(patch_os_environ):
 
 
 @pytest.fixture
-def client(config):
+def client(config, mocker):
+    mocker.patch.object(Synapse, "login")
     factory = SynapseClientFactory(config=config)
     yield factory.create_client()
 
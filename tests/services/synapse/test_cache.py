@@ -0,0 +1,59 @@
+"""
+Tests for the cache of Synapse query results.
+"""
+import os
+
+import pytest
+
+from orca.services.synapse.cache import QueryCache
+
+
+def test_that_cached_results_are_returned_for_the_same_etag() -> None:
+    """Test that cached results are returned if the view hasn't changed."""
+    cache = QueryCache()
+    cache.set("syn1", "select id from syn1", "0000", ["1", "2"])
+    assert cache.get("syn1", "select id from syn1", "0000") == ["1", "2"]
+
+
+def test_that_cached_results_are_ignored_for_another_etag() -> None:
+    """Test that cached results are ignored once the view has changed."""
+    cache = QueryCache()
+    cache.set("syn1", "select id from syn1", "0000", ["1", "2"])
+    assert cache.get("syn1", "select id from syn1", "1111") is None
+    assert cache.get("syn1", "select * from syn1", "0000") is None
+
+
+def test_that_the_least_recently_used_results_are_evicted() -> None:
+    """Test that the in-memory cache is bounded."""
+    cache = QueryCache(max_size=2)
+    cache.set("syn1", "foo", "0000", [])
+    cache.set("syn2", "foo", "0000", [])
+    cache.get("syn1", "foo", "0000")
+    cache.set("syn3", "foo", "0000", [])
+    assert len(cache) == 2
+    assert cache.get("syn1", "foo", "0000") == []
+    assert cache.get("syn2", "foo", "0000") is None
+
+
+def test_that_cached_results_persist_on_disk(tmp_path) -> None:
+    """Test that cached results are shared across cache instances."""
+    directory = str(tmp_path / "cache")
+    QueryCache(directory=directory).set("syn1", "foo", "0000", ["1"])
+    QueryCache(directory=directory).set("syn1", "foo", "1111", ["1", "2"])
+    cache = QueryCache(directory=directory)
+    assert cache.get("syn1", "foo", "1111") == ["1", "2"]
+    assert len(os.listdir(directory)) == 1
+
+
+def test_that_corrupted_cache_files_are_ignored(tmp_path) -> None:
+    """Test that corrupted cache files result in cache misses."""
+    cache = QueryCache(directory=str(tmp_path))
+    with open(cache.get_path(cache.get_key("syn1", "foo")), "w") as file:
+        file.write("{")
+    assert cache.get("syn1", "foo", "0000") is None
+
+
+def test_for_an_error_when_getting_a_path_without_a_directory() -> None:
+    cache = QueryCache()
+    with pytest.raises(ValueError):
+        cache.get_path("foo")
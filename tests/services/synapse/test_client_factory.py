@@ -0,0 +1,33 @@
+import pytest
+from synapseclient import Synapse
+from synapseclient.core.exceptions import SynapseAuthenticationError
+
+from orca.services.synapse import SynapseClientFactory
+
+
+def set_validation_policy(mocker, policy):
+    environ = {SynapseClientFactory.validation_policy_env_var: policy}
+    mocker.patch.dict("os.environ", environ)
+
+
+def test_that_clients_log_in_when_always_tested(config, mocker):
+    login = mocker.patch.object(Synapse, "login")
+    SynapseClientFactory(config).create_client()
+    login.assert_called_once_with(authToken="foo")
+
+
+def test_that_login_errors_are_left_to_the_client_test(config, mocker):
+    error = SynapseAuthenticationError("Invalid token")
+    mocker.patch.object(Synapse, "login", side_effect=error)
+    SynapseClientFactory(config).create_client()
+
+
+@pytest.mark.parametrize("policy", ["ttl", "lazy"])
+def test_that_clients_use_the_token_directly_when_not_always_tested(
+    config, mocker, policy
+):
+    set_validation_policy(mocker, policy)
+    login = mocker.patch.object(Synapse, "login")
+    client = SynapseClientFactory(config).create_client()
+    login.assert_not_called()
+    assert client.credentials.secret == "foo"
@@ -1,13 +1,16 @@
 """
 Tests for Synapse operations conducted by SynapseOps.
 """
+import json
+import tracemalloc
 from unittest.mock import MagicMock
 
 import pandas as pd
 import pytest
 from challengeutils import utils
+from synapseclient.core.exceptions import SynapseHTTPError
 
-from orca.errors import ConfigError
+from orca.errors import ClientRequestError, ConfigError
 from orca.services.synapse import SynapseOps
 
 
@@ -45,7 +48,7 @@ def test_monitor_evaluation_queue_returns_false_when_there_are_no_new_submission
         mocked_ops.client, "getSubmissionBundles", return_value=[]
     )
     result = mocked_ops.monitor_evaluation_queue("foo")
-    mock.assert_called_once_with("foo", status="RECEIVED")
+    mock.assert_called_once_with("foo", status="RECEIVED", limit=1)
     assert not result
 
 
@@ -67,14 +70,59 @@ def test_monitor_evaluation_queue_returns_true_when_there_are_new_submissions(
         return_value=["submission_1", "submission_2"],
     )
     result = mocked_ops.monitor_evaluation_queue("foo")
-    mock.assert_called_once_with("foo", status="RECEIVED")
+    mock.assert_called_once_with("foo", status="RECEIVED", limit=1)
     assert result
 
 
+def test_monitor_evaluation_queue_stops_at_the_first_submission(
+    mocker: pytest.fixture, mocked_ops: MagicMock
+) -> None:
+    """
+    Tests that the monitor evaluation queue doesn't retrieve any
+    submissions after the first one.
+
+    Arguments:
+        mocker: A mocker object.
+        mocked_ops: A mocked instance of ``SynapseOps``.
+
+    """
+
+    def bundles(*args, **kwargs):
+        yield "submission_1"
+        raise AssertionError("Only the first submission should be retrieved.")
+
+    mocker.patch.object(mocked_ops.client, "getSubmissionBundles", new=bundles)
+    assert mocked_ops.monitor_evaluation_queue("foo")
+
+
+def test_count_received_submissions(
+    mocker: pytest.fixture, mocked_ops: MagicMock
+) -> None:
+    """
+    Tests that the ``count_received_submissions`` method in ``SynapseOps``
+    reads the total from a single page of submission statuses.
+
+    Arguments:
+        mocker: A mocker object.
+        mocked_ops: A mocked instance of ``SynapseOps``.
+
+    """
+    mock = mocker.patch.object(
+        mocked_ops.client,
+        "restGET",
+        return_value={"totalNumberOfResults": 42, "results": [{}]},
+    )
+    result = mocked_ops.count_received_submissions("foo")
+    mock.assert_called_once_with(
+        "/evaluation/foo/submission/status/all?status=RECEIVED&limit=1&offset=0"
+    )
+    assert result == 42
+
+
 def test_trigger_indexing(mocker: pytest.fixture, mocked_ops: MagicMock) -> None:
     """
     Tests that the ``trigger_indexing`` method in ``SynapseOps``
-    triggers indexing in a Synapse table view.
+    triggers indexing in a Synapse table view and waits until it's done.
 
     Arguments:
         mocker: A mocker object.
@@ -84,15 +132,135 @@ def test_trigger_indexing(mocker: pytest.fixture, mocked_ops: MagicMock) -> None
     # Assigning variable to a fake submission view string
     submission_view = "test_view"
 
-    # Using patch to mock the Synapse tableQuery method
-    with mocker.patch.object(mocked_ops.client, "tableQuery"):
-        # Calling the function
-        mocked_ops.trigger_indexing(submission_view)
+    # Mocking the table status checks before and during indexing
+    statuses = [
+        {"state": "AVAILABLE", "lastTableChangeEtag": "0000"},
+        {"state": "PROCESSING", "lastTableChangeEtag": "0000"},
+        {"state": "AVAILABLE", "lastTableChangeEtag": "1111"},
+    ]
+    mocker.patch.object(mocked_ops.client, "restGET", side_effect=statuses)
+    mocker.patch.object(mocked_ops.client, "tableQuery")
+    mock_sleep = mocker.patch("time.sleep")
+
+    # Calling the function
+    result = mocked_ops.trigger_indexing(submission_view, wait=True, wait_time=1)
+
+    # Assertions
+    mocked_ops.client.restGET.assert_called_with(
+        f"/entity/{submission_view}/table/status"
+    )
+    mocked_ops.client.tableQuery.assert_called_once_with(
+        f"select * from {submission_view} limit 1"
+    )
+    mock_sleep.assert_called_once()
+    assert mocked_ops.view_etags == {submission_view: "1111"}
+    assert result
+
+
+def test_trigger_indexing_is_skipped_for_unchanged_views(
+    mocker: pytest.fixture, mocked_ops: MagicMock
+) -> None:
+    """
+    Tests that the ``trigger_indexing`` method in ``SynapseOps``
+    doesn't query a view whose etag hasn't changed since the last call.
+
+    Arguments:
+        mocker: A mocker object.
+        mocked_ops: A mocked instance of ``SynapseOps``.
+
+    """
+    status = {"state": "AVAILABLE", "lastTableChangeEtag": "0000"}
+    mocker.patch.object(mocked_ops.client, "restGET", return_value=status)
+    mocker.patch.object(mocked_ops.client, "tableQuery")
+    mocked_ops.view_etags["test_view"] = "0000"
+
+    assert mocked_ops.trigger_indexing("test_view")
+    mocked_ops.client.tableQuery.assert_not_called()
+
+
+def test_trigger_indexing_times_out(mocker: pytest.fixture, mocked_ops: MagicMock):
+    """
+    Tests that the ``trigger_indexing`` method in ``SynapseOps``
+    stops waiting for indexing after the timeout.
+
+    Arguments:
+        mocker: A mocker object.
+        mocked_ops: A mocked instance of ``SynapseOps``.
+
+    """
+    status = {"state": "PROCESSING", "lastTableChangeEtag": "0000"}
+    mocker.patch.object(mocked_ops.client, "restGET", return_value=status)
+    mocker.patch.object(mocked_ops.client, "tableQuery")
 
-        # Assertions
-        mocked_ops.client.tableQuery.assert_called_once_with(
-            f"select * from {submission_view} limit 1"
-        )
+    assert not mocked_ops.trigger_indexing("test_view", wait=True, timeout=0)
+    assert mocked_ops.view_etags == {}
+
+
+def test_trigger_indexing_waits_by_default(
+    mocker: pytest.fixture, mocked_ops: MagicMock
+) -> None:
+    """
+    Tests that the ``trigger_indexing`` method in ``SynapseOps``
+    polls the table status until the view is current by default.
+
+    Arguments:
+        mocker: A mocker object.
+        mocked_ops: A mocked instance of ``SynapseOps``.
+
+    """
+    processing = {"state": "PROCESSING", "lastTableChangeEtag": "0000"}
+    available = {"state": "AVAILABLE", "lastTableChangeEtag": "0001"}
+    statuses = [processing, processing, available]
+    mocker.patch.object(mocked_ops.client, "restGET", side_effect=statuses)
+    mocker.patch.object(mocked_ops.client, "tableQuery")
+    mock_sleep = mocker.patch("time.sleep")
+
+    assert mocked_ops.trigger_indexing("test_view")
+    assert mocked_ops.client.restGET.call_count == 3
+    mock_sleep.assert_called_once()
+
+
+def test_trigger_indexing_does_not_wait_when_opted_out(
+    mocker: pytest.fixture, mocked_ops: MagicMock
+) -> None:
+    """
+    Tests that the ``trigger_indexing`` method in ``SynapseOps``
+    only checks the table status once after triggering indexing
+    when waiting is disabled.
+
+    Arguments:
+        mocker: A mocker object.
+        mocked_ops: A mocked instance of ``SynapseOps``.
+
+    """
+    status = {"state": "PROCESSING", "lastTableChangeEtag": "0000"}
+    mocker.patch.object(mocked_ops.client, "restGET", return_value=status)
+    mocker.patch.object(mocked_ops.client, "tableQuery")
+    mock_sleep = mocker.patch("time.sleep")
+
+    assert not mocked_ops.trigger_indexing("test_view", wait=False)
+    assert mocked_ops.client.restGET.call_count == 2
+    mock_sleep.assert_not_called()
+
+
+def test_for_an_error_when_indexing_fails(
+    mocker: pytest.fixture, mocked_ops: MagicMock
+) -> None:
+    """
+    Tests that the ``trigger_indexing`` method in ``SynapseOps``
+    raises an error if Synapse fails to index the view.
+
+    Arguments:
+        mocker: A mocker object.
+        mocked_ops: A mocked instance of ``SynapseOps``.
+
+    """
+    status = {"state": "PROCESSING_FAILED", "errorMessage": "foo"}
+    mocker.patch.object(mocked_ops.client, "restGET", return_value=status)
+    mocker.patch.object(mocked_ops.client, "tableQuery")
+
+    with pytest.raises(ClientRequestError, match="foo"):
+        mocked_ops.trigger_indexing("test_view")
 
 
 def test_get_submissions_with_status(
@@ -140,6 +308,143 @@ def test_get_submissions_with_status(
             assert result == input_dict["id"]
 
 
+def test_get_submissions_with_status_uses_the_query_cache(
+    mocker: pytest.fixture, mocked_ops: MagicMock
+) -> None:
+    """
+    Tests that the ``get_submissions_with_status`` method in ``SynapseOps``
+    only queries the view again once its etag has changed.
+
+    Arguments:
+        mocker: A mocker object.
+        mocked_ops: A mocked instance of ``SynapseOps``.
+
+    """
+    etags = iter(["0000", "0000", "1111"])
+
+    def trigger_indexing(synapse_view, wait, timeout):
+        mocked_ops.view_etags[synapse_view] = next(etags)
+        return True
+
+    mocker.patch.object(mocked_ops, "trigger_indexing", new=trigger_indexing)
+    table_mock = MagicMock()
+    table_mock.asDataFrame.return_value = pd.DataFrame({"id": ["submission_1"]})
+    query = mocker.patch.object(
+        mocked_ops.client, "tableQuery", return_value=table_mock
+    )
+
+    results = [mocked_ops.get_submissions_with_status("syn111") for _ in range(3)]
+
+    assert results == [["submission_1"]] * 3
+    assert query.call_count == 2
+
+
+def test_get_submissions_with_status_does_not_cache_stale_results(
+    mocker: pytest.fixture, mocked_ops: MagicMock
+) -> None:
+    """
+    Tests that the ``get_submissions_with_status`` method in ``SynapseOps``
+    passes through the waiting options to ``trigger_indexing`` and
+    doesn't cache the results while the view is still being indexed.
+
+    Arguments:
+        mocker: A mocker object.
+        mocked_ops: A mocked instance of ``SynapseOps``.
+
+    """
+    mocked_ops.view_etags["syn111"] = "0000"
+    trigger_indexing = mocker.patch.object(
+        mocked_ops, "trigger_indexing", return_value=False
+    )
+    table_mock = MagicMock()
+    table_mock.asDataFrame.return_value = pd.DataFrame({"id": ["submission_1"]})
+    query = mocker.patch.object(
+        mocked_ops.client, "tableQuery", return_value=table_mock
+    )
+
+    for _ in range(2):
+        mocked_ops.get_submissions_with_status("syn111", wait=False, timeout=30)
+
+    trigger_indexing.assert_called_with("syn111", False, 30)
+    assert query.call_count == 2
+
+
+def test_iter_submissions_with_status(
+    mocker: pytest.fixture, mocked_ops: MagicMock
+) -> None:
+    """
+    Tests that the ``iter_submissions_with_status`` method in ``SynapseOps``
+    waits for indexing by default and lazily yields submission IDs from
+    a row set query.
+
+    Arguments:
+        mocker: A mocker object.
+        mocked_ops: A mocked instance of ``SynapseOps``.
+
+    """
+    submission_view = "syn111"
+    rows = iter([{"values": ["submission_1"]}, {"values": ["submission_2"]}])
+    trigger_indexing = mocker.patch.object(
+        mocked_ops, "trigger_indexing", return_value=True
+    )
+    query = mocker.patch.object(mocked_ops.client, "tableQuery", return_value=rows)
+
+    submission_ids = mocked_ops.iter_submissions_with_status(submission_view)
+    query.assert_not_called()
+
+    assert next(submission_ids) == "submission_1"
+    trigger_indexing.assert_called_once_with(submission_view, True, 600)
+    assert list(rows) == [{"values": ["submission_2"]}]
+    query.assert_called_once_with(
+        f"select id from {submission_view} where status = 'RECEIVED'",
+        resultsAs="rowset",
+    )
+
+
+def test_that_streaming_submissions_uses_less_memory(
+    mocker: pytest.fixture, mocked_ops: MagicMock
+) -> None:
+    """
+    Tests that the ``iter_submissions_with_status`` method in ``SynapseOps``
+    uses a fraction of the memory needed by ``get_submissions_with_status``
+    for a large submission view.
+
+    Arguments:
+        mocker: A mocker object.
+        mocked_ops: A mocked instance of ``SynapseOps``.
+
+    """
+    num_rows = 100_000
+    mocker.patch.object(mocked_ops, "trigger_indexing", return_value=None)
+    query = mocker.patch.object(mocked_ops.client, "tableQuery")
+
+    def make_rows(*args, **kwargs):
+        return ({"values": [str(i)]} for i in range(num_rows))
+
+    def as_data_frame():
+        values = [row["values"] for row in make_rows()]
+        return pd.DataFrame(values, columns=["id"])
+
+    def measure_peak_memory(function):
+        tracemalloc.start()
+        try:
+            function()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    query.return_value.asDataFrame.side_effect = as_data_frame
+    data_frame_peak = measure_peak_memory(
+        lambda: mocked_ops.get_submissions_with_status("syn111")
+    )
+    query.side_effect = make_rows
+    streaming_peak = measure_peak_memory(
+        lambda: sum(1 for _ in mocked_ops.iter_submissions_with_status("syn111"))
+    )
+
+    assert streaming_peak * 10 < data_frame_peak
+
+
 def test_update_submission_status(
     mocker: pytest.fixture, mocked_ops: MagicMock
 ) -> None:
@@ -187,3 +492,156 @@ def test_update_submission_status_with_wrong_data_type(submission_id) -> None:
     with pytest.raises(TypeError, match="``submission_id`` must be a string or int."):
         # Calling the function to be tested
         SynapseOps().update_submission_status(submission_id, "SCORED")
+
+
+@pytest.fixture
+def mock_rest_get(mocker: pytest.fixture, mocked_ops: MagicMock) -> MagicMock:
+    """
+    Mocks the paged retrieval of the current statuses of five submissions
+    in an evaluation queue.
+
+    Arguments:
+        mocker: A mocker object.
+        mocked_ops: A mocked instance of ``SynapseOps``.
+
+    """
+    statuses = [
+        {"id": str(submission_id), "etag": "0000", "status": "RECEIVED"}
+        for submission_id in range(1, 6)
+    ]
+
+    def rest_get(uri):
+        if uri.startswith("/evaluation/submission/"):
+            submission_id = uri.split("/")[3]
+            return dict(statuses[int(submission_id) - 1], etag="0001")
+        query = dict(param.split("=") for param in uri.split("?")[1].split("&"))
+        offset, limit = int(query["offset"]), int(query["limit"])
+        results = statuses[offset : offset + limit]
+        return {"results": results, "totalNumberOfResults": len(statuses)}
+
+    yield mocker.patch.object(mocked_ops.client, "restGET", side_effect=rest_get)
+
+
+def get_batch(call) -> dict:
+    """Parse the body of a mocked batch update call."""
+    return json.loads(call.kwargs["body"])
+
+
+def test_update_submission_statuses(
+    mocker: pytest.fixture, mocked_ops: MagicMock, mock_rest_get: MagicMock
+) -> None:
+    """
+    Tests that the ``update_submission_statuses`` method in ``SynapseOps``
+    updates the status of many submissions in batches.
+
+    Arguments:
+        mocker: A mocker object.
+        mocked_ops: A mocked instance of ``SynapseOps``.
+        mock_rest_get: A mocked ``restGET`` method.
+    """
+    mocked_ops.batch_size = 2
+    mock_put = mocker.patch.object(mocked_ops.client, "restPUT")
+
+    mocked_ops.update_submission_statuses(
+        {"1": "SCORED", 2: "INVALID", "3": "SCORED"}, evaluation_id="9614112"
+    )
+
+    mock_rest_get.assert_called_once_with(
+        "/evaluation/9614112/submission/status/all?limit=100&offset=0"
+    )
+    assert mock_put.call_count == 2
+    for call in mock_put.call_args_list:
+        assert call.args == ("/evaluation/9614112/statusBatch",)
+    batches = [get_batch(call) for call in mock_put.call_args_list]
+    statuses = [status for batch in batches for status in batch["statuses"]]
+    assert sorted((s["id"], s["status"]) for s in statuses) == [
+        ("1", "SCORED"),
+        ("2", "INVALID"),
+        ("3", "SCORED"),
+    ]
+    assert all(batch["isFirstBatch"] and batch["isLastBatch"] for batch in batches)
+
+
+def test_get_submission_statuses_stops_paging_once_all_are_found(
+    mocked_ops: MagicMock, mock_rest_get: MagicMock
+) -> None:
+    """
+    Tests that the ``get_submission_statuses`` method in ``SynapseOps``
+    only pages through the statuses until the requested ones are found.
+
+    Arguments:
+        mocked_ops: A mocked instance of ``SynapseOps``.
+        mock_rest_get: A mocked ``restGET`` method.
+    """
+    mocked_ops.status_page_size = 2
+
+    statuses = mocked_ops.get_submission_statuses("123", [3])
+
+    assert list(statuses) == ["3"]
+    assert mock_rest_get.call_count == 2
+
+
+def test_for_an_error_when_submission_statuses_are_missing(
+    mocked_ops: MagicMock, mock_rest_get: MagicMock
+) -> None:
+    """
+    Tests that the ``get_submission_statuses`` method in ``SynapseOps``
+    raises an error for submissions that aren't in the evaluation queue.
+
+    Arguments:
+        mocked_ops: A mocked instance of ``SynapseOps``.
+        mock_rest_get: A mocked ``restGET`` method.
+    """
+    with pytest.raises(ValueError, match="'6'"):
+        mocked_ops.get_submission_statuses("123", ["1", "6"])
+
+
+def test_update_submission_statuses_retries_conflicting_batches(
+    mocker: pytest.fixture, mocked_ops: MagicMock, mock_rest_get: MagicMock
+) -> None:
+    """
+    Tests that the ``update_submission_statuses`` method in ``SynapseOps``
+    only retrieves the statuses of a conflicting batch again before
+    retrying after a randomized delay.
+
+    Arguments:
+        mocker: A mocker object.
+        mocked_ops: A mocked instance of ``SynapseOps``.
+        mock_rest_get: A mocked ``restGET`` method.
+    """
+    conflict = SynapseHTTPError("Conflict", response=MagicMock(status_code=412))
+    mock_put = mocker.patch.object(
+        mocked_ops.client, "restPUT", side_effect=[conflict, None]
+    )
+    mock_sleep = mocker.patch("time.sleep")
+
+    mocked_ops.update_submission_statuses({"1": "SCORED"}, evaluation_id="123")
+
+    assert mock_put.call_count == 2
+    assert mock_rest_get.call_count == 2
+    mock_rest_get.assert_called_with("/evaluation/submission/1/status")
+    retried_status = get_batch(mock_put.call_args)["statuses"][0]
+    assert retried_status["status"] == "SCORED"
+    assert retried_status["etag"] == "0001"
+    mock_sleep.assert_called_once()
+    assert 0 <= mock_sleep.call_args.args[0] <= mocked_ops.backoff_factor
+
+
+def test_update_submission_statuses_raises_other_errors(
+    mocker: pytest.fixture, mocked_ops: MagicMock, mock_rest_get: MagicMock
+) -> None:
+    """
+    Tests that the ``update_submission_statuses`` method in ``SynapseOps``
+    doesn't retry batches that failed for reasons other than conflicts.
+
+    Arguments:
+        mocker: A mocker object.
+        mocked_ops: A mocked instance of ``SynapseOps``.
+        mock_rest_get: A mocked ``restGET`` method.
+    """
+    error = SynapseHTTPError("Forbidden", response=MagicMock(status_code=403))
+    mock_put = mocker.patch.object(mocked_ops.client, "restPUT", side_effect=error)
+
+    with pytest.raises(SynapseHTTPError):
+        mocked_ops.update_submission_statuses({"1": "SCORED"}, evaluation_id="123")
+    mock_put.assert_called_once()
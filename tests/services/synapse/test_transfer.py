@@ -0,0 +1,187 @@
+"""
+Tests for bulk transfers between local directories and Synapse.
+"""
+import hashlib
+import os
+
+import pytest
+from fs.memoryfs import MemoryFS
+
+from orca.services.base.transfer import TransferOutcome, TransferResult
+from orca.services.synapse import transfer
+
+T = TransferOutcome.TRANSFERRED
+S = TransferOutcome.SKIPPED
+
+
+def outcomes(results: dict[str, TransferResult]) -> dict[str, TransferOutcome]:
+    """Retrieve the outcome for each file."""
+    return {rel_path: result.outcome for rel_path, result in results.items()}
+
+
+@pytest.fixture
+def remote_fs() -> MemoryFS:
+    """A file system standing in for ``SynapseFS``."""
+    remote_fs = MemoryFS()
+    remote_fs.makedirs("syn123/inputs/nested")
+    remote_fs.writebytes("syn123/inputs/a.txt", b"foo")
+    remote_fs.writebytes("syn123/inputs/nested/b.txt", b"bar" * 1000)
+    yield remote_fs
+
+
+@pytest.fixture
+def remote_md5s(mocker, remote_fs) -> dict:
+    """Expose the MD5 checksums of remote files like ``SynapseFS``."""
+    md5s = dict()
+    get_remote_info = transfer.get_remote_info
+
+    def get_remote_info_with_md5(fs, path):
+        info = get_remote_info(fs, path)
+        if info is not None:
+            default_md5 = hashlib.md5(fs.readbytes(path)).hexdigest()
+            info.md5 = md5s.get(path, default_md5)
+        return info
+
+    mocker.patch.object(transfer, "get_remote_info", new=get_remote_info_with_md5)
+    yield md5s
+
+
+@pytest.fixture
+def ops(ops, remote_fs):
+    """A ``SynapseOps`` instance using the stand-in file system."""
+    ops.fs = remote_fs
+    yield ops
+
+
+def test_that_a_directory_is_downloaded_recursively(ops, tmp_path) -> None:
+    """Test that remote files are downloaded with their relative paths."""
+    results = ops.download_directory("syn123/inputs", str(tmp_path))
+    assert outcomes(results) == {"a.txt": T, "nested/b.txt": T}
+    assert results["nested/b.txt"].name == "nested/b.txt"
+    assert (tmp_path / "nested" / "b.txt").read_bytes() == b"bar" * 1000
+
+
+def test_that_identical_local_files_are_not_downloaded_again(
+    ops, remote_md5s, tmp_path
+) -> None:
+    """Test that files with the same size and checksum are skipped."""
+    ops.download_directory("syn123/inputs", str(tmp_path))
+    (tmp_path / "a.txt").write_bytes(b"baz")
+    results = ops.download_directory("syn123/inputs", str(tmp_path))
+    assert outcomes(results) == {"a.txt": T, "nested/b.txt": S}
+    assert (tmp_path / "a.txt").read_bytes() == b"foo"
+
+
+def test_that_files_without_checksums_are_downloaded_again(ops, tmp_path) -> None:
+    """Test that files can't be skipped based on their size alone."""
+    ops.download_directory("syn123/inputs", str(tmp_path))
+    (tmp_path / "a.txt").write_bytes(b"baz")
+    results = ops.download_directory("syn123/inputs", str(tmp_path))
+    assert outcomes(results) == {"a.txt": T, "nested/b.txt": T}
+    assert (tmp_path / "a.txt").read_bytes() == b"foo"
+
+
+def test_that_downloads_are_reused_from_the_cache(ops, remote_md5s, tmp_path) -> None:
+    """Test that cached content isn't downloaded again in another run."""
+    cache_dir = str(tmp_path / "cache")
+    ops.download_directory("syn123/inputs", str(tmp_path / "run1"), cache_dir)
+    results = ops.download_directory("syn123/inputs", str(tmp_path / "run2"), cache_dir)
+    assert {r.outcome for r in results.values()} == {TransferOutcome.CACHED}
+    assert (tmp_path / "run2" / "a.txt").read_bytes() == b"foo"
+
+
+def test_that_edited_downloads_do_not_affect_the_cache(
+    ops, remote_md5s, tmp_path
+) -> None:
+    """Test that downloaded files aren't linked into the cache."""
+    cache_dir = str(tmp_path / "cache")
+    ops.download_directory("syn123/inputs", str(tmp_path / "run1"), cache_dir)
+    with open(tmp_path / "run1" / "a.txt", "r+b") as file:
+        file.write(b"baz")
+    results = ops.download_directory("syn123/inputs", str(tmp_path / "run2"), cache_dir)
+    assert results["a.txt"].outcome == TransferOutcome.CACHED
+    assert (tmp_path / "run2" / "a.txt").read_bytes() == b"foo"
+
+
+def test_that_corrupted_cache_entries_are_downloaded_again(
+    ops, remote_md5s, tmp_path
+) -> None:
+    """Test that cached content is verified before it's used."""
+    cache_dir = str(tmp_path / "cache")
+    ops.download_directory("syn123/inputs", str(tmp_path / "run1"), cache_dir)
+    cache = transfer.ContentCache(cache_dir)
+    md5 = hashlib.md5(b"foo").hexdigest()
+    with open(cache.get_path(md5), "wb") as file:
+        file.write(b"baz")
+    results = ops.download_directory("syn123/inputs", str(tmp_path / "run2"), cache_dir)
+    assert outcomes(results) == {"a.txt": T, "nested/b.txt": TransferOutcome.CACHED}
+    assert (tmp_path / "run2" / "a.txt").read_bytes() == b"foo"
+    with open(cache.get_path(md5), "rb") as file:
+        assert file.read() == b"foo"
+
+
+def test_for_an_error_when_a_download_is_corrupted(ops, remote_md5s, tmp_path) -> None:
+    """Test that downloads with the wrong checksum are discarded."""
+    remote_md5s["syn123/inputs/a.txt"] = "0" * 32
+    results = ops.download_directory("syn123/inputs", str(tmp_path))
+    assert results["a.txt"].outcome == TransferOutcome.FAILED
+    assert "Checksum mismatch" in results["a.txt"].error
+    assert results["nested/b.txt"].outcome == T
+    assert not os.path.exists(tmp_path / "a.txt")
+    assert not os.path.exists(tmp_path / "a.txt.part")
+
+
+def test_that_a_directory_is_uploaded_recursively(ops, remote_fs, tmp_path) -> None:
+    """Test that local files are uploaded with their relative paths."""
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "a.txt").write_bytes(b"foo")
+    (tmp_path / "nested" / "b.txt").write_bytes(b"bar")
+    results = ops.upload_directory(str(tmp_path), "syn123/outputs")
+    assert outcomes(results) == {"a.txt": T, "nested/b.txt": T}
+    assert remote_fs.readbytes("syn123/outputs/nested/b.txt") == b"bar"
+
+
+def test_that_identical_remote_files_are_not_uploaded_again(
+    ops, remote_fs, remote_md5s, tmp_path, mocker
+) -> None:
+    """Test that files with the same size and checksum are skipped."""
+    (tmp_path / "a.txt").write_bytes(b"foo")
+    (tmp_path / "c.txt").write_bytes(b"baz")
+    openbin = mocker.spy(remote_fs, "openbin")
+    results = ops.upload_directory(str(tmp_path), "syn123/inputs")
+    assert outcomes(results) == {"a.txt": S, "c.txt": T}
+    writes = [call.args for call in openbin.call_args_list if "w" in call.args]
+    assert writes == [("syn123/inputs/c.txt", "w")]
+
+
+def test_that_remote_files_are_inspected_once(
+    ops, remote_fs, remote_md5s, tmp_path, mocker
+) -> None:
+    """Test that each remote file is only inspected with one request."""
+    ops.download_directory("syn123/inputs", str(tmp_path))
+    getinfo = mocker.spy(remote_fs, "getinfo")
+    results = ops.download_directory("syn123/inputs", str(tmp_path))
+    assert outcomes(results) == {"a.txt": S, "nested/b.txt": S}
+    assert getinfo.call_count == 2
+
+
+def test_that_failed_uploads_do_not_interrupt_the_others(
+    ops, remote_fs, tmp_path, mocker
+) -> None:
+    """Test that each failed upload is reported with its error."""
+    (tmp_path / "a.txt").write_bytes(b"foo")
+    (tmp_path / "c.txt").write_bytes(b"baz")
+    upload_file = transfer.upload_file
+
+    def flaky_upload_file(local_path, fs, path):
+        if path.endswith("a.txt"):
+            raise ConnectionError("foo")
+        return upload_file(local_path, fs, path)
+
+    mocker.patch.object(transfer, "upload_file", new=flaky_upload_file)
+    results = ops.upload_directory(str(tmp_path), "syn123/outputs")
+    assert results["a.txt"] == TransferResult(
+        "a.txt", TransferOutcome.FAILED, "ConnectionError: foo"
+    )
+    assert results["c.txt"].outcome == T
+    assert remote_fs.readbytes("syn123/outputs/c.txt") == b"baz"
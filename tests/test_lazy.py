@@ -0,0 +1,44 @@
+import subprocess
+import sys
+
+import pytest
+
+from orca.services import nextflowtower
+
+TOWER_OPS_IMPORT = "import orca.services.nextflowtower.ops"
+
+HEAVY_MODULES = ["airflow", "challengeutils", "sevenbridges", "synapseclient"]
+
+
+def measure_import(statement):
+    args = [sys.executable, "-X", "importtime", "-c", statement]
+    result = subprocess.run(args, capture_output=True, check=True, text=True)
+    modules = dict()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_time, _, name = line.removeprefix("import time:").split("|")
+        modules[name.strip()] = int(self_time) / 1e6
+    return modules
+
+
+def test_that_attributes_are_loaded_on_first_access():
+    assert nextflowtower.NextflowTowerOps.__name__ == "NextflowTowerOps"
+    assert "NextflowTowerOps" in vars(nextflowtower)
+
+
+def test_that_lazy_attributes_are_listed():
+    assert set(nextflowtower.__all__) <= set(dir(nextflowtower))
+
+
+def test_for_an_error_when_accessing_an_unknown_attribute():
+    with pytest.raises(AttributeError):
+        nextflowtower.Foo
+
+
+def test_that_importing_tower_ops_skips_heavy_modules():
+    # The submodule is imported explicitly because `importtime` doesn't
+    # report modules imported with `importlib.import_module()`
+    modules = measure_import(TOWER_OPS_IMPORT)
+    assert "orca.services.nextflowtower.ops" in modules
+    assert not [name for name in modules if name.split(".")[0] in HEAVY_MODULES]
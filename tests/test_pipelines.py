@@ -0,0 +1,148 @@
+import asyncio
+
+import pytest
+
+from orca.pipelines import SubmissionPipeline
+from orca.services.nextflowtower import (
+    LaunchInfo,
+    NextflowTowerClient,
+    NextflowTowerConfig,
+    NextflowTowerOps,
+)
+from orca.services.nextflowtower.fake import FakeTower, FakeTowerTransport
+from orca.services.nextflowtower.models import WorkflowState
+from orca.services.synapse import SynapseOps
+
+
+@pytest.fixture
+def tower():
+    yield FakeTower(polls_per_state=2)
+
+
+@pytest.fixture
+def tower_ops(tower, patch_os_environ):
+    client = NextflowTowerClient("foo", "http://fake/api")
+    client.transport = FakeTowerTransport(tower)
+    config = NextflowTowerConfig(
+        api_endpoint="http://fake/api",
+        auth_token="foo",
+        workspace=tower.workspace_name,
+    )
+    ops = NextflowTowerOps(config)
+    ops.client = client
+    yield ops
+
+
+@pytest.fixture
+def view():
+    """Submission statuses in a fake submission view."""
+    yield {str(i): "RECEIVED" for i in range(5)}
+
+
+@pytest.fixture
+def synapse_ops(mocker, view):
+    def iter_submissions_with_status(submission_view):
+        # Paged like Synapse, so rows leaving the filter shift later pages
+        offset = 0
+        while True:
+            received = [id for id, status in view.items() if status == "RECEIVED"]
+            page = received[offset : offset + 2]
+            if not page:
+                return
+            yield from page
+            offset += len(page)
+
+    def update_submission_statuses(mapping, evaluation_id):
+        view.update(mapping)
+
+    ops = mocker.MagicMock(SynapseOps)
+    ops.iter_submissions_with_status.side_effect = iter_submissions_with_status
+    ops.update_submission_statuses.side_effect = update_submission_statuses
+    yield ops
+
+
+@pytest.fixture
+def pipeline(synapse_ops, tower_ops):
+    def make_launch_info(submission_id):
+        return LaunchInfo(pipeline="nf-core/demo", run_name=f"sub{submission_id}")
+
+    yield SubmissionPipeline(
+        synapse_ops, tower_ops, make_launch_info, max_in_flight=2, wait_time=0
+    )
+
+
+def get_updates(synapse_ops):
+    calls = synapse_ops.update_submission_statuses.call_args_list
+    return [call.args[0] for call in calls]
+
+
+def test_that_all_submissions_are_processed(pipeline, synapse_ops):
+    statuses = asyncio.run(pipeline.run("syn123", evaluation_id="9614112"))
+    assert statuses == {str(i): "ACCEPTED" for i in range(5)}
+    synapse_ops.iter_submissions_with_status.assert_called_with("syn123")
+    for call in synapse_ops.update_submission_statuses.call_args_list:
+        assert call.args[1] == "9614112"
+    final_updates = dict()
+    for updates in get_updates(synapse_ops):
+        final_updates.update(updates)
+    assert final_updates == statuses
+
+
+def test_that_in_flight_runs_are_bounded(pipeline, tower, mocker):
+    get_statuses = mocker.spy(pipeline.tower, "get_workflow_statuses")
+    asyncio.run(pipeline.run("syn123", evaluation_id="9614112"))
+    assert max(len(call.args[0]) for call in get_statuses.call_args_list) == 2
+    assert len(tower.runs) == 5
+
+
+def test_that_status_updates_are_written_in_batches(pipeline, synapse_ops):
+    pipeline.batch_size = 3
+    pipeline.max_in_flight = 5
+    asyncio.run(pipeline.run("syn123", evaluation_id="9614112"))
+    batch_sizes = [len(updates) for updates in get_updates(synapse_ops)]
+    assert batch_sizes[0] == 3
+    assert max(batch_sizes) == 3
+    assert sum(batch_sizes) == 10
+
+
+def test_that_failed_runs_and_launches_are_marked_as_invalid(pipeline, tower):
+    make_launch_info = pipeline.make_launch_info
+
+    def make_launch_info_or_fail(submission_id):
+        if submission_id == "0":
+            raise ValueError("Invalid submission")
+        return make_launch_info(submission_id)
+
+    pipeline.make_launch_info = make_launch_info_or_fail
+    launch = tower.launch
+
+    def launch_and_fail(payload):
+        response = launch(payload)
+        if payload["launch"]["runName"] == "sub1":
+            run = list(tower.runs.values())[-1]
+            run.final_state = WorkflowState.FAILED
+        return response
+
+    tower.launch = launch_and_fail
+    statuses = asyncio.run(pipeline.run("syn123", evaluation_id="9614112"))
+    assert statuses["0"] == statuses["1"] == "INVALID"
+    assert statuses["2"] == "ACCEPTED"
+
+
+def test_that_no_submissions_are_skipped_when_their_status_changes(
+    pipeline, synapse_ops, view
+):
+    pipeline.batch_size = 1
+    statuses = asyncio.run(pipeline.run("syn123", evaluation_id="9614112"))
+    assert statuses == {str(i): "ACCEPTED" for i in range(5)}
+    assert set(view.values()) == {"ACCEPTED"}
+
+
+def test_that_buffered_updates_are_written_after_a_failure(
+    pipeline, synapse_ops, view, mocker
+):
+    error = ConnectionError("foo")
+    mocker.patch.object(pipeline.tower, "get_workflow_statuses", side_effect=error)
+    with pytest.raises(ConnectionError):
+        asyncio.run(pipeline.run("syn123", evaluation_id="9614112"))
+    assert view["0"] == view["1"] == "EVALUATION_IN_PROGRESS"
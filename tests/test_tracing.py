@@ -0,0 +1,151 @@
+import asyncio
+import json
+
+import pytest
+
+from orca import tracing
+from orca.services.nextflowtower import NextflowTowerOps
+
+
+@pytest.fixture
+def tracer():
+    tracer = tracing.RecordingTracer()
+    tracing.set_tracer(tracer)
+    yield tracer
+    tracing.set_tracer(None)
+
+
+@tracing.traced
+def outer():
+    return inner()
+
+
+@tracing.traced
+def inner():
+    return "foo"
+
+
+@tracing.traced
+async def async_outer():
+    return inner()
+
+
+@tracing.traced
+def generator():
+    yield inner()
+    yield inner()
+
+
+@tracing.traced
+def failing():
+    raise ValueError("bar")
+
+
+def test_that_tracing_is_disabled_by_default():
+    assert isinstance(tracing.get_tracer(), tracing.NoopTracer)
+    assert not tracing.get_tracer().enabled
+    assert outer() == "foo"
+
+
+def test_that_traced_functions_aren_t_wrapped_twice():
+    assert tracing.traced(outer) is outer
+
+
+def test_that_spans_are_nested(tracer):
+    assert outer() == "foo"
+    inner_span, outer_span = tracer.spans
+    assert outer_span.name == "outer"
+    assert inner_span.parent_id == outer_span.span_id
+    assert inner_span.trace_id == outer_span.trace_id
+    assert outer_span.parent_id is None
+
+
+@pytest.mark.asyncio
+async def test_that_coroutine_functions_are_traced(tracer):
+    assert await async_outer() == "foo"
+    inner_span, outer_span = tracer.spans
+    assert outer_span.name == "async_outer"
+    assert inner_span.parent_id == outer_span.span_id
+
+
+def test_that_each_generator_step_is_traced(tracer):
+    items = generator()
+    assert tracer.spans == []
+    assert list(items) == ["foo", "foo"]
+    generator_spans = [span for span in tracer.spans if span.name == "generator"]
+    assert [span.attributes["step"] for span in generator_spans] == [0, 1, 2]
+    inner_spans = [span for span in tracer.spans if span.name == "inner"]
+    parent_ids = [span.parent_id for span in inner_spans]
+    assert parent_ids == [span.span_id for span in generator_spans[:2]]
+
+
+def test_that_generator_spans_are_not_current_between_steps(tracer):
+    items = generator()
+    next(items)
+    assert outer() == "foo"
+    outer_span = tracer.spans[-1]
+    assert outer_span.name == "outer"
+    assert outer_span.parent_id is None
+
+
+@pytest.mark.asyncio
+async def test_that_generators_can_be_resumed_from_threads(tracer):
+    items = generator()
+    assert await asyncio.to_thread(next, items) == "foo"
+    assert await asyncio.to_thread(next, items) == "foo"
+    assert await asyncio.to_thread(next, items, None) is None
+
+
+def test_that_errors_are_recorded_in_spans(tracer):
+    with pytest.raises(ValueError):
+        failing()
+    assert tracer.spans[0].error == "ValueError: bar"
+
+
+def test_that_spans_can_be_exported_as_otlp(tracer, tmp_path):
+    outer()
+    path = tmp_path / "trace.json"
+    tracer.export(str(path))
+    content = json.loads(path.read_text())
+    spans = content["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert [span["name"] for span in spans] == ["inner", "outer"]
+    assert spans[0]["parentSpanId"] == spans[1]["spanId"]
+
+
+def test_that_spans_can_be_exported_as_chrome_trace(tracer, tmp_path):
+    outer()
+    path = tmp_path / "trace.json"
+    tracer.export(str(path), format="chrome")
+    content = json.loads(path.read_text())
+    assert [event["name"] for event in content["traceEvents"]] == ["outer", "inner"]
+
+
+def test_for_an_error_when_exporting_in_an_unknown_format(tracer, tmp_path):
+    with pytest.raises(ValueError):
+        tracer.export(str(tmp_path / "trace.json"), format="foo")
+
+
+def test_that_ops_methods_are_traced(tracer, mocker):
+    mock = mocker.patch.object(NextflowTowerOps, "client")
+    mock.get_workflow.return_value = "foo"
+    mocker.patch.object(NextflowTowerOps, "workspace_id", 98765)
+    ops = NextflowTowerOps()
+    assert ops.get_workflow("123") == "foo"
+    assert [span.name for span in tracer.spans] == ["NextflowTowerOps.get_workflow"]
+
+
+def test_that_client_calls_and_http_attempts_are_traced(
+    tracer, mocker, patch_os_environ
+):
+    from orca.services.nextflowtower import NextflowTowerClient
+
+    response = mocker.Mock(status_code=200, headers={})
+    response.json.return_value = {"user": {"id": 1, "userName": "a", "email": "b"}}
+    mocker.patch("requests.request", return_value=response)
+    NextflowTowerClient("foo", "bar").get_user_info()
+    http_span, client_span = tracer.spans
+    assert client_span.name == "NextflowTowerClient.get_user_info"
+    assert http_span.name == "HTTP GET"
+    assert http_span.parent_id == client_span.span_id
+    assert http_span.attributes["http.route"] == "/user-info"
+    assert http_span.attributes["http.status_code"] == 200